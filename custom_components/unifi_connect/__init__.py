@@ -1,8 +1,20 @@
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, PLATFORMS
+from .const import DOMAIN
 from .hub import UnifiConnectHub
+from .services import async_setup_services
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up UniFi Connect services."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -13,16 +25,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = hub
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    with hub.startup.phase("platforms"):
+        await hub.async_forward_platforms()
+    hub.async_start_background()
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
     return True
 
 
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so load balancing and tracing options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_config_entry_device(
+    hass: HomeAssistant, entry: ConfigEntry, device_entry: DeviceEntry
+) -> bool:
+    """Allow deleting a device the console no longer reports."""
+    hub: UnifiConnectHub | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if hub is None:
+        return True
+    # The fleet rollup and console devices are keyed by the entry ID
+    hub_devices = {entry.entry_id, hub.console_device_id}
+    return not any(
+        domain == DOMAIN
+        and (device_id in hub.coordinator.devices or device_id in hub_devices)
+        for domain, device_id in device_entry.identifiers
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     hub: UnifiConnectHub = hass.data[DOMAIN].get(entry.entry_id)
     if hub:
         await hub.async_shutdown()
 
-    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+    platforms = hub.loaded_platforms if hub else set()
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, platforms):
         hass.data[DOMAIN].pop(entry.entry_id, None)
     return unload_ok
@@ -3,10 +3,13 @@
 Firmware updates can change action UUIDs. This module resolves action IDs
 at runtime from the device's type.category.supportedActions or
 type.supportedActions data, falling back to hardcoded constants.
+
+``ActionTable`` precomputes the lookup once per device and firmware so
+entities can resolve actions cheaply at press time.
 """
 
 import logging
-from typing import Optional
+from typing import Any, Optional
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,58 +40,8 @@ def get_supported_actions(device: dict) -> dict[str, dict]:
     return actions
 
 
-def resolve_action_id(
-    device: dict, action_name: str, fallback_id: Optional[str] = None
-) -> str:
-    """Resolve the current action UUID for a given action name.
-
-    Args:
-        device: Full device dict from coordinator data.
-        action_name: The action name (e.g., "set_max_output_amp").
-        fallback_id: Hardcoded UUID to use if dynamic lookup fails.
-
-    Returns:
-        The action UUID string.
-    """
-    actions = get_supported_actions(device)
-    action = actions.get(action_name)
-    if action and "id" in action:
-        resolved_id = action["id"]
-        if fallback_id and resolved_id != fallback_id:
-            _LOGGER.debug(
-                "Action '%s' UUID resolved dynamically: %s (hardcoded was %s)",
-                action_name,
-                resolved_id,
-                fallback_id,
-            )
-        return resolved_id
-
-    if fallback_id:
-        _LOGGER.warning(
-            "Could not resolve action '%s' from device data, using fallback UUID %s",
-            action_name,
-            fallback_id,
-        )
-        return fallback_id
-
-    _LOGGER.error("No action ID found for '%s' and no fallback provided", action_name)
-    return ""
-
-
-def get_action_arg_key(device: dict, action_name: str) -> Optional[str]:
-    """Get the expected argument key name for an action from its JSON schema.
-
-    For example, firmware 1.6.4 expects {"maxOutput": N} for set_max_output_amp,
-    while older firmware used {"value": N}.
-
-    Returns the first required property name, or None if the action has no args.
-    """
-    actions = get_supported_actions(device)
-    action = actions.get(action_name)
-    if not action or "args" not in action:
-        return None
-
-    args_schema = action["args"]
+def _arg_key_from_schema(args_schema: Any) -> Optional[str]:
+    """Return the first required (or first declared) property of an args schema."""
     if not isinstance(args_schema, dict):
         return None
 
@@ -102,3 +55,97 @@ def get_action_arg_key(device: dict, action_name: str) -> Optional[str]:
         return next(iter(properties))
 
     return None
+
+
+def _action_sources(device: dict) -> tuple:
+    """Return the raw fields an action table is built from."""
+    type_data = device.get("type", {})
+    if not isinstance(type_data, dict):
+        type_data = {}
+    category = type_data.get("category", {})
+    if not isinstance(category, dict):
+        category = {}
+    return (
+        device.get("firmwareVersion"),
+        device.get("supportedActions"),
+        type_data.get("supportedActions"),
+        category.get("supportedActions"),
+    )
+
+
+class ActionTable:
+    """Action name -> (id, arg key) lookup for one device.
+
+    Built once from the device's supported actions and reused until the
+    firmware version or any supported-action list changes (see
+    ``matches``). Misses fall back to the caller's hardcoded values and
+    are only logged once per action.
+    """
+
+    __slots__ = ("device_id", "_sources", "_ids", "_arg_keys", "_missed")
+
+    def __init__(self, device: dict) -> None:
+        self.device_id = device.get("id")
+        self._sources = _action_sources(device)
+        self._ids: dict[str, str] = {}
+        self._arg_keys: dict[str, Optional[str]] = {}
+        self._missed: set[str] = set()
+
+        # Top-level supportedActions, overridden by the type-level sources
+        actions = {
+            action["name"]: action
+            for action in device.get("supportedActions") or []
+            if isinstance(action, dict) and "name" in action
+        }
+        actions.update(get_supported_actions(device))
+        for name, action in actions.items():
+            if "id" in action:
+                self._ids[name] = action["id"]
+            self._arg_keys[name] = _arg_key_from_schema(action.get("args"))
+
+        _LOGGER.debug(
+            "Action table for %s (firmware %s): %s",
+            self.device_id,
+            self.firmware,
+            {name: (self._ids.get(name), key) for name, key in self._arg_keys.items()},
+        )
+
+    @property
+    def firmware(self) -> Optional[str]:
+        """Firmware version the table was built for."""
+        return self._sources[0]
+
+    def matches(self, device: dict) -> bool:
+        """Return True if the table is still valid for this device snapshot."""
+        return _action_sources(device) == self._sources
+
+    def action_id(self, action_name: str, fallback_id: Optional[str] = None) -> str:
+        """Return the action UUID, falling back to *fallback_id* on a miss."""
+        resolved_id = self._ids.get(action_name)
+        if resolved_id:
+            return resolved_id
+
+        if action_name not in self._missed:
+            self._missed.add(action_name)
+            if fallback_id:
+                _LOGGER.warning(
+                    "Could not resolve action '%s' for %s, using fallback UUID %s",
+                    action_name,
+                    self.device_id,
+                    fallback_id,
+                )
+            else:
+                _LOGGER.error(
+                    "No action ID found for '%s' on %s and no fallback provided",
+                    action_name,
+                    self.device_id,
+                )
+        return fallback_id or ""
+
+    def has_action(self, action_name: str) -> bool:
+        """Return True if the device advertises this action."""
+        return action_name in self._ids
+
+    def arg_key(self, action_name: str, fallback_key: Optional[str] = None) -> Optional[str]:
+        """Return the argument key from the action's schema, or *fallback_key*."""
+        return self._arg_keys.get(action_name) or fallback_key
@@ -2,18 +2,52 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
+from collections import Counter, deque
 from typing import Any
 
 import aiohttp
 
-from .const import DEFAULT_PORT, CONTROLLER_UDMP
+from .breaker import CircuitBreaker
+from .const import DEFAULT_PORT, CONTROLLER_UDMP, MAX_CONCURRENT_REQUESTS
+from .metrics import EndpointMetrics
+from .scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_CONTROL,
+    PRIORITY_POLL,
+    RequestScheduler,
+)
+from .tracing import Tracer
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds a request may take once it has a scheduler slot
+REQUEST_TIMEOUT = 10
+
+ENDPOINT_LOGIN = "POST login"
+# Page counts kept from recent charge history syncs
+HISTORY_SYNCS_KEPT = 32
+
+
+def _endpoint(method: str, path: str) -> str:
+    """Return the metrics name of a request, without query or device ID."""
+    parts = path.split("?", 1)[0].removeprefix("api/v2/").split("/")
+    if len(parts) > 1 and parts[0] == "devices":
+        parts[1] = "{id}"
+    return f"{method} {'/'.join(parts)}"
+
 
 class UnifiConnectAPIError(Exception):
     """Error communicating with the UniFi Connect API."""
 
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class UnifiConnectTimeoutError(UnifiConnectAPIError):
+    """A request got no response within its timeout."""
+
 
 class UnifiConnectAPI:
     def __init__(
@@ -31,8 +65,17 @@ class UnifiConnectAPI:
         self._port = port
         self._controller_type = controller_type
         self._session = session
-        self._cookies: aiohttp.CookieJar | None = None
         self._csrf: str | None = None
+        self.scheduler = RequestScheduler(MAX_CONCURRENT_REQUESTS)
+        self.breaker = CircuitBreaker()
+        # Per-endpoint latency, response size and errors
+        self.metrics = EndpointMetrics()
+        # requests, logins, login_failures, session_expired
+        self.counters: Counter[str] = Counter()
+        # Pages fetched by each recent charge history sync, oldest first
+        self.history_pages: deque[int] = deque(maxlen=HISTORY_SYNCS_KEPT)
+        # Spans for requests and the refresh cycles they belong to
+        self.tracer = Tracer()
 
     async def login(self) -> bool:
         """Login and store CSRF token."""
@@ -43,33 +86,81 @@ class UnifiConnectAPI:
             "remember": True,
         }
 
+        started = time.monotonic()
+        with self.tracer.span("login") as span:
+            try:
+                async with asyncio.timeout(10):
+                    async with self._session.post(url, json=payload) as resp:
+                        if span:
+                            span.attributes["status"] = resp.status
+                        body = await resp.read()
+                        self.metrics.record(
+                            ENDPOINT_LOGIN, time.monotonic() - started, len(body)
+                        )
+                        if resp.status != 200:
+                            _LOGGER.error("Login failed with status %s", resp.status)
+                            self.metrics.record_error(ENDPOINT_LOGIN, str(resp.status))
+                            self.counters["login_failures"] += 1
+                            return False
+                        self._csrf = resp.headers.get("x-csrf-token")
+                        self.counters["logins"] += 1
+                        _LOGGER.debug("Login successful")
+                        return True
+            except Exception as err:
+                _LOGGER.exception("Login error: %s", err)
+                if span:
+                    span.error = f"{type(err).__name__}: {err}"
+                self.metrics.record_error(
+                    ENDPOINT_LOGIN,
+                    "timeout" if isinstance(err, asyncio.TimeoutError) else "connection",
+                )
+                self.counters["login_failures"] += 1
+                return False
+
+    async def async_warm_up(self) -> None:
+        """Open a pooled connection to the console while login is in flight.
+
+        Any response (even 401) leaves a keep-alive connection with TLS
+        already negotiated for the requests that follow.  Errors are
+        ignored.
+        """
         try:
-            async with asyncio.timeout(10):
-                async with self._session.post(url, json=payload, ssl=False) as resp:
-                    if resp.status != 200:
-                        _LOGGER.error("Login failed with status %s", resp.status)
-                        return False
-                    self._cookies = resp.cookies
-                    self._csrf = resp.headers.get("x-csrf-token")
-                    _LOGGER.debug("Login successful")
-                    return True
+            async with asyncio.timeout(5):
+                async with self._session.head(self._get_api_url("api/v2/devices")) as resp:
+                    await resp.read()
         except Exception as err:
-            _LOGGER.exception("Login error: %s", err)
-            return False
+            _LOGGER.debug("Connection warm-up failed: %s", err)
 
     async def get_devices(self) -> list[dict[str, Any]]:
         """Fetch list of devices. Raises UnifiConnectAPIError on failure."""
         result = await self._request("GET", "api/v2/devices?shadow=true")
         return result if isinstance(result, list) else []
 
+    async def get_device(self, device_id: str) -> dict[str, Any] | None:
+        """Fetch a single device with its shadow.
+
+        Used to confirm a control action without re-polling the fleet.
+        Raises UnifiConnectAPIError on failure.
+        """
+        result = await self._request(
+            "GET", f"api/v2/devices/{device_id}?shadow=true", priority=PRIORITY_CONTROL
+        )
+        return result if isinstance(result, dict) else None
+
     async def perform_action(
         self,
         device_id: str,
         action_id: str,
         action_name: str,
         args: dict | None = None,
+        timeout: float | None = None,
     ) -> bool:
-        """Perform an action on a device."""
+        """Perform an action on a device.
+
+        *timeout* bounds the request once it has a scheduler slot; when
+        given, a timeout is raised as ``UnifiConnectTimeoutError`` so the
+        caller can report it, since the action may still have applied.
+        """
         path = f"api/v2/devices/{device_id}/status"
         payload: dict[str, Any] = {"id": action_id, "name": action_name}
         if args:
@@ -81,8 +172,16 @@ class UnifiConnectAPI:
         }
 
         try:
-            await self._request("PATCH", path, json=payload, extra_headers=extra_headers)
+            await self._request(
+                "PATCH", path, json=payload, extra_headers=extra_headers,
+                priority=PRIORITY_CONTROL, timeout=timeout or REQUEST_TIMEOUT,
+            )
             return True
+        except UnifiConnectTimeoutError:
+            if timeout is not None:
+                raise
+            _LOGGER.warning("%s on %s timed out", action_name, device_id)
+            return False
         except UnifiConnectAPIError as err:
             _LOGGER.warning(
                 "Failed to perform %s on %s: %s (payload: %s)",
@@ -94,6 +193,53 @@ class UnifiConnectAPI:
             return False
 
     async def _request(
+        self,
+        method: str,
+        path: str,
+        json: dict | None = None,
+        extra_headers: dict | None = None,
+        raw_response: bool = False,
+        priority: int = PRIORITY_POLL,
+        timeout: float = REQUEST_TIMEOUT,
+    ) -> Any:
+        """Make a request once the scheduler grants a slot for *priority*.
+
+        *timeout* starts once the slot is granted, so queueing behind
+        other requests doesn't count against it.  Fails fast while the
+        circuit breaker is open.  Timeouts,
+        connection errors and 5xx responses count as breaker failures;
+        other error statuses mean the console is responding.
+
+        Raises UnifiConnectAPIError on failure.
+        """
+        endpoint = _endpoint(method, path)
+        if not self.breaker.allow_request():
+            self.metrics.record_error(endpoint, "breaker_open")
+            raise UnifiConnectAPIError(
+                f"{method} {path} skipped: console unavailable, retrying in "
+                f"{self.breaker.retry_after():.0f}s"
+            )
+        with self.tracer.span("request", endpoint=endpoint) as span:
+            queued = time.monotonic()
+            async with self.scheduler.slot(priority):
+                started = time.monotonic()
+                if span:
+                    span.attributes["queued_ms"] = round((started - queued) * 1000, 2)
+                try:
+                    result = await self._send_request(
+                        method, path, json=json, extra_headers=extra_headers,
+                        raw_response=raw_response, timeout=timeout,
+                    )
+                except UnifiConnectAPIError as err:
+                    if err.status is None or err.status >= 500:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success(time.monotonic() - started)
+                    raise
+                self.breaker.record_success(time.monotonic() - started)
+                return result
+
+    async def _send_request(
         self,
         method: str,
         path: str,
@@ -101,6 +247,7 @@ class UnifiConnectAPI:
         extra_headers: dict | None = None,
         _retry: bool = True,
         raw_response: bool = False,
+        timeout: float = REQUEST_TIMEOUT,
     ) -> Any:
         """Make an authenticated request with automatic 401 retry.
 
@@ -111,29 +258,42 @@ class UnifiConnectAPI:
         Raises UnifiConnectAPIError on failure.
         """
         url = self._get_api_url(path)
+        endpoint = _endpoint(method, path)
         headers: dict[str, str] = {}
         if self._csrf:
             headers["x-csrf-token"] = self._csrf
         if extra_headers:
             headers.update(extra_headers)
 
+        self.counters["requests"] += 1
+        started = time.monotonic()
         try:
-            async with asyncio.timeout(10):
+            async with asyncio.timeout(timeout):
                 async with self._session.request(
-                    method, url, json=json, headers=headers,
-                    cookies=self._cookies, ssl=False,
+                    method, url, json=json, headers=headers
                 ) as resp:
+                    body = await resp.read()
+                    self.metrics.record(endpoint, time.monotonic() - started, len(body))
+                    if resp.status != 200:
+                        self.metrics.record_error(endpoint, str(resp.status))
                     if resp.status == 401 and _retry:
                         _LOGGER.warning("Session expired, attempting re-login")
+                        self.counters["session_expired"] += 1
                         if await self.login():
-                            return await self._request(
+                            return await self._send_request(
                                 method, path, json=json,
                                 extra_headers=extra_headers, _retry=False,
-                                raw_response=raw_response,
+                                raw_response=raw_response, timeout=timeout,
                             )
                         raise UnifiConnectAPIError("Re-authentication failed")
                     if resp.status == 200:
-                        data = await resp.json()
+                        try:
+                            data = await resp.json()
+                        except (aiohttp.ContentTypeError, ValueError) as err:
+                            self.metrics.record_error(endpoint, "parse")
+                            raise UnifiConnectAPIError(
+                                f"{method} {path} returned invalid JSON: {err}"
+                            ) from err
                         if raw_response:
                             return data
                         return data.get("data", data) if isinstance(data, dict) else data
@@ -144,17 +304,21 @@ class UnifiConnectAPI:
                     except Exception:
                         error_body = "<unreadable>"
                     raise UnifiConnectAPIError(
-                        f"{method} {path} returned status {resp.status}: {error_body}"
+                        f"{method} {path} returned status {resp.status}: {error_body}",
+                        status=resp.status,
                     )
         except UnifiConnectAPIError:
             raise
         except asyncio.TimeoutError as err:
-            raise UnifiConnectAPIError(f"{method} {path} timed out") from err
+            self.metrics.record_error(endpoint, "timeout")
+            raise UnifiConnectTimeoutError(f"{method} {path} timed out") from err
         except aiohttp.ClientError as err:
+            self.metrics.record_error(endpoint, "connection")
             raise UnifiConnectAPIError(
                 f"{method} {path} connection error: {err}"
             ) from err
         except Exception as err:
+            self.metrics.record_error(endpoint, "unexpected")
             raise UnifiConnectAPIError(
                 f"{method} {path} unexpected error: {err}"
             ) from err
@@ -179,49 +343,59 @@ class UnifiConnectAPI:
         all_sessions: list[dict[str, Any]] = []
         offset = 0
         max_pages = 50  # safety limit
+        pages = 0
         self._charge_history_meta: dict[str, Any] = {}
 
-        for page_num in range(max_pages):
-            path = (
-                f"api/v2/stats/evs/chargingHistory"
-                f"?offset={offset}&limit={page_size}&sort=&order="
-            )
-            try:
-                raw = await self._request("GET", path, raw_response=True)
-            except UnifiConnectAPIError as err:
-                _LOGGER.warning(
-                    "Charge history request failed at offset %d: %s",
-                    offset, err,
-                )
-                break
-
-            if not isinstance(raw, dict):
-                break
-
-            # Store envelope metadata on first page
-            if page_num == 0:
-                self._charge_history_meta = {
-                    k: v for k, v in raw.items()
-                    if k != "data" and not isinstance(v, list)
-                }
-                _LOGGER.info(
-                    "stats/evs/chargingHistory envelope: %s",
-                    self._charge_history_meta,
+        with self.tracer.span("charge_history", device_id=device_id) as span:
+            for page_num in range(max_pages):
+                path = (
+                    f"api/v2/stats/evs/chargingHistory"
+                    f"?offset={offset}&limit={page_size}&sort=&order="
                 )
+                try:
+                    raw = await self._request(
+                        "GET", path, raw_response=True, priority=PRIORITY_BACKGROUND
+                    )
+                except UnifiConnectAPIError as err:
+                    _LOGGER.warning(
+                        "Charge history request failed at offset %d: %s",
+                        offset, err,
+                    )
+                    break
+
+                pages += 1
+                if not isinstance(raw, dict):
+                    break
+
+                # Store envelope metadata on first page
+                if page_num == 0:
+                    self._charge_history_meta = {
+                        k: v for k, v in raw.items()
+                        if k != "data" and not isinstance(v, list)
+                    }
+                    _LOGGER.info(
+                        "stats/evs/chargingHistory envelope: %s",
+                        self._charge_history_meta,
+                    )
+
+                page = raw.get("data", [])
+                if not isinstance(page, list) or not page:
+                    break
+                all_sessions.extend(page)
 
-            page = raw.get("data", [])
-            if not isinstance(page, list) or not page:
-                break
-            all_sessions.extend(page)
+                total = raw.get("total")
+                if total is not None and len(all_sessions) >= int(total):
+                    break
+                if len(page) < page_size:
+                    break
 
-            total = raw.get("total")
-            if total is not None and len(all_sessions) >= int(total):
-                break
-            if len(page) < page_size:
-                break
+                offset += len(page)
 
-            offset += len(page)
+            if span:
+                span.attributes["pages"] = pages
+                span.attributes["sessions"] = len(all_sessions)
 
+        self.history_pages.append(pages)
         # Filter to only this device's sessions (by MAC) if we have
         # multiple EV stations, and reverse to oldest-first.
         _LOGGER.info(
@@ -245,17 +419,21 @@ class UnifiConnectAPI:
             "origin": f"https://{self._host}",
         }
 
-        try:
-            result = await self._request(
-                "PATCH", path, json=payload, extra_headers=extra_headers
-            )
-            _LOGGER.debug("power_stats_single response for %s: %s", device_id, result)
-            return result if isinstance(result, dict) else None
-        except UnifiConnectAPIError as err:
-            _LOGGER.warning(
-                "Failed to request power_stats for %s: %s", device_id, err
-            )
-            return None
+        with self.tracer.span("power_stats", device_id=device_id) as span:
+            try:
+                result = await self._request(
+                    "PATCH", path, json=payload, extra_headers=extra_headers,
+                    priority=PRIORITY_BACKGROUND,
+                )
+                _LOGGER.debug("power_stats_single response for %s: %s", device_id, result)
+                return result if isinstance(result, dict) else None
+            except UnifiConnectAPIError as err:
+                _LOGGER.warning(
+                    "Failed to request power_stats for %s: %s", device_id, err
+                )
+                if span:
+                    span.error = str(err)
+                return None
 
     def _get_login_url(self) -> str:
         if self._controller_type == CONTROLLER_UDMP:
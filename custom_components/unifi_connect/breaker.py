@@ -0,0 +1,121 @@
+"""Circuit breaker for requests to the UniFi Connect console.
+
+After enough consecutive failures (timeouts, connection errors, 5xx) or
+very slow responses the breaker opens and requests fail fast instead of
+each waiting out its timeout.  Once the cooldown passes it goes
+half-open and lets a single probe request through: success closes it,
+failure re-opens it with a doubled cooldown.  Failures of requests that
+were already in flight when it opened don't count as failed probes.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from .const import (
+    BREAKER_COOLDOWN,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_COOLDOWN,
+    BREAKER_SLOW_REQUEST,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# A probe that never reported back is abandoned after this many seconds
+PROBE_TIMEOUT = 30
+
+
+class CircuitBreaker:
+    """Tracks console health and decides whether requests may be sent."""
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        slow_request: float = BREAKER_SLOW_REQUEST,
+        cooldown: float = BREAKER_COOLDOWN,
+        max_cooldown: float = BREAKER_MAX_COOLDOWN,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._slow_request = slow_request
+        self._base_cooldown = cooldown
+        self._max_cooldown = max_cooldown
+        self._cooldown = cooldown
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once cooled down."""
+        if self._state == STATE_OPEN and self.retry_after() == 0:
+            self._state = STATE_HALF_OPEN
+            self._probe_started = None
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until requests may be attempted again (0 if allowed)."""
+        if self._state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._cooldown - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now.
+
+        While half-open only one probe is allowed in flight.
+        """
+        state = self.state
+        if state == STATE_CLOSED:
+            return True
+        if state == STATE_OPEN:
+            return False
+        now = time.monotonic()
+        if self._probe_started is None or now - self._probe_started > PROBE_TIMEOUT:
+            self._probe_started = now
+            return True
+        return False
+
+    def record_success(self, latency: float) -> None:
+        """Record a response; very slow ones count against the console."""
+        if latency >= self._slow_request:
+            self._record_bad(f"slow response ({latency:.1f}s)")
+            return
+        self._failures = 0
+        self._probe_started = None
+        if self._state != STATE_CLOSED:
+            _LOGGER.info("UniFi Connect console recovered, closing circuit breaker")
+            self._state = STATE_CLOSED
+            self._cooldown = self._base_cooldown
+
+    def record_failure(self) -> None:
+        """Record a timeout, connection error or server error."""
+        self._record_bad("request failed")
+
+    def _record_bad(self, reason: str) -> None:
+        state = self.state
+        if state == STATE_CLOSED:
+            self._failures += 1
+            if self._failures < self._failure_threshold:
+                return
+        elif state == STATE_HALF_OPEN and self._probe_started is not None:
+            # Failed probe: back off further
+            self._probe_started = None
+            self._cooldown = min(self._cooldown * 2, self._max_cooldown)
+        else:
+            # A request sent before the breaker opened; no probe has failed
+            return
+        self._state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        self._failures = 0
+        self.times_opened += 1
+        _LOGGER.warning(
+            "UniFi Connect console unhealthy (%s), pausing requests for %.0fs",
+            reason,
+            self._cooldown,
+        )
@@ -5,10 +5,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, DEVICE_PLATFORM_SE21, ACTION_REFRESH_WEBSITE, EV_ACTION_REBOOT
-from .coordinator import _is_ev_device
-from .entity import UnifiConnectEntity
+from .const import DOMAIN, ACTION_REFRESH_WEBSITE, EV_ACTION_REBOOT
+from .entity import UnifiConnectEntity, async_setup_device_entities
 from .hub import UnifiConnectHub
+from .model import UnifiDevice
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,44 +18,44 @@ async def async_setup_entry(
 ) -> None:
     """Set up UniFi Connect button entities from config entry."""
     hub: UnifiConnectHub = hass.data[DOMAIN][entry.entry_id]
-    entities: list[ButtonEntity] = []
+    async_setup_device_entities(hub, async_add_entities, _device_entities)
+
 
-    for device in hub.coordinator.data or []:
-        platform = device.get("type", {}).get("platform")
+def _device_entities(hub: UnifiConnectHub, device: UnifiDevice) -> list[ButtonEntity]:
+    """Build the button entities for one device."""
+    entities: list[ButtonEntity] = []
 
-        # SE21 Display buttons
-        if platform == DEVICE_PLATFORM_SE21:
-            entities.append(ReloadWebButton(hub, device))
+    # SE21 Display buttons
+    if device.is_display:
+        entities.append(ReloadWebButton(hub, device))
 
-        # EV Station buttons
-        if _is_ev_device(device):
-            entities.append(EVRebootButton(hub, device))
+    # EV Station buttons
+    if device.is_ev:
+        entities.append(EVRebootButton(hub, device))
 
-    async_add_entities(entities)
+    return entities
 
 
 class ReloadWebButton(UnifiConnectEntity, ButtonEntity):
     """Reload Web Page button for SE 21."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Reload Web Page", "reload_web")
+        self._watch()
 
     async def async_press(self):
-        await self._hub.api.perform_action(
-            self._device_id, ACTION_REFRESH_WEBSITE, "refresh_website"
-        )
-        await self.coordinator.async_request_refresh()
+        await self._async_perform_action(ACTION_REFRESH_WEBSITE, "refresh_website")
 
 
 class EVRebootButton(UnifiConnectEntity, ButtonEntity):
     """Reboot button for EV Station."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Reboot", "reboot")
+        self._watch()
         self._attr_icon = "mdi:restart"
 
     async def async_press(self):
-        await self._hub.api.perform_action(
-            self._device_id, EV_ACTION_REBOOT, "reboot"
+        await self._async_perform_action(
+            self._actions().action_id("reboot", EV_ACTION_REBOOT), "reboot"
         )
-        await self.coordinator.async_request_refresh()
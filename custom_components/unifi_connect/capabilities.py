@@ -0,0 +1,81 @@
+"""Device classification, done once per device.
+
+Each device is classified into a ``DeviceCapabilities`` record when it
+first appears, and again when its firmware or actions change.  Platforms read the record instead of re-inspecting the
+raw device dict, and setup only forwards the platforms that the
+discovered device mix actually needs.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from homeassistant.const import Platform
+
+from .const import DEVICE_PLATFORM_SE21, EV_DEVICE_PLATFORMS, PLATFORMS
+
+# Platforms with entities for each device kind
+DISPLAY_PLATFORMS = frozenset(
+    {Platform.SWITCH, Platform.SELECT, Platform.NUMBER, Platform.TEXT, Platform.BUTTON}
+)
+EV_PLATFORMS = frozenset(PLATFORMS)
+
+
+def _section(device: dict, key: str) -> dict:
+    """Return a nested dict of the raw device ({} if missing or null)."""
+    value = device.get(key)
+    return value if isinstance(value, dict) else {}
+
+
+def _is_ev_device(device: dict) -> bool:
+    """Check if a device is an EV Station (by platform or supported actions)."""
+    platform = _section(device, "type").get("platform", "")
+    if platform in EV_DEVICE_PLATFORMS:
+        return True
+    # Also detect by shadow keys unique to EV devices
+    shadow = _section(device, "shadow")
+    if "chargingStatus" in shadow or "evStationMode" in shadow:
+        return True
+    # Also detect by supported actions for unknown platform IDs
+    actions = device.get("supportedActions")
+    if not isinstance(actions, list):
+        return False
+    action_names = [a.get("name", "") if isinstance(a, dict) else "" for a in actions]
+    return "power_stats_single" in action_names
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceCapabilities:
+    """What kind of device this is and which platforms it needs."""
+
+    device_id: str
+    is_display: bool
+    is_ev: bool
+
+    @property
+    def platforms(self) -> frozenset[Platform]:
+        """Platforms that create entities for this device."""
+        platforms: frozenset[Platform] = frozenset()
+        if self.is_display:
+            platforms |= DISPLAY_PLATFORMS
+        if self.is_ev:
+            platforms |= EV_PLATFORMS
+        return platforms
+
+
+def classify_device(device: dict) -> DeviceCapabilities:
+    """Classify a raw device dict."""
+    return DeviceCapabilities(
+        device_id=device["id"],
+        is_display=_section(device, "type").get("platform") == DEVICE_PLATFORM_SE21,
+        is_ev=_is_ev_device(device),
+    )
+
+
+def required_platforms(capabilities: Iterable[DeviceCapabilities]) -> list[Platform]:
+    """Return the platforms needed by a set of devices, in ``PLATFORMS`` order."""
+    needed: set[Platform] = set()
+    for caps in capabilities:
+        needed |= caps.platforms
+    return [platform for platform in PLATFORMS if platform in needed]
@@ -3,10 +3,11 @@ from __future__ import annotations
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api import UnifiConnectAPI
+from .transport import ConsoleTransport
 from .const import (
     DOMAIN,
     CONF_HOST,
@@ -14,6 +15,12 @@ from .const import (
     CONF_PASSWORD,
     CONF_PORT,
     CONF_CONTROLLER_TYPE,
+    CONF_FEEDER_CURRENT,
+    CONF_LOAD_BALANCING,
+    CONF_MIN_CURRENT,
+    CONF_TRACE,
+    DEFAULT_FEEDER_CURRENT,
+    DEFAULT_MIN_CURRENT,
     DEFAULT_PORT,
     CONTROLLER_UDMP,
     CONTROLLER_OTHER,
@@ -37,21 +44,33 @@ class UnifiConnectConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> UnifiConnectOptionsFlow:
+        """Return the options flow."""
+        return UnifiConnectOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input: dict | None = None) -> FlowResult:
         """Handle the initial step."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            session = async_create_clientsession(self.hass, verify_ssl=False)
+            transport = ConsoleTransport()
             api = UnifiConnectAPI(
                 host=user_input[CONF_HOST],
                 username=user_input[CONF_USERNAME],
                 password=user_input[CONF_PASSWORD],
                 port=user_input.get(CONF_PORT, DEFAULT_PORT),
                 controller_type=user_input.get(CONF_CONTROLLER_TYPE, CONTROLLER_UDMP),
-                session=session,
+                session=transport.session,
             )
-            if await api.login():
+            try:
+                logged_in = await api.login()
+            finally:
+                await transport.async_close()
+            if logged_in:
                 return self.async_create_entry(
                     title=user_input[CONF_HOST], data=user_input
                 )
@@ -62,3 +81,59 @@ class UnifiConnectConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=DATA_SCHEMA,
             errors=errors,
         )
+
+
+class UnifiConnectOptionsFlow(config_entries.OptionsFlow):
+    """Handle UniFi Connect options (EV load balancing, tracing)."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input: dict | None = None) -> FlowResult:
+        """Manage the load balancing and tracing options."""
+        errors: dict[str, str] = {}
+
+        # EV stations known to the running hub, if it is loaded
+        hub = self.hass.data.get(DOMAIN, {}).get(self._entry.entry_id)
+        stations = (
+            sum(device.is_ev for device in hub.coordinator.devices.values())
+            if hub
+            else 0
+        )
+
+        if user_input is not None:
+            if user_input[CONF_FEEDER_CURRENT] < user_input[CONF_MIN_CURRENT]:
+                errors["base"] = "budget_below_minimum"
+            elif (
+                user_input[CONF_LOAD_BALANCING]
+                and user_input[CONF_FEEDER_CURRENT]
+                < user_input[CONF_MIN_CURRENT] * stations
+            ):
+                errors["base"] = "budget_below_station_minimums"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_LOAD_BALANCING,
+                    default=options.get(CONF_LOAD_BALANCING, False),
+                ): bool,
+                vol.Required(
+                    CONF_FEEDER_CURRENT,
+                    default=options.get(CONF_FEEDER_CURRENT, DEFAULT_FEEDER_CURRENT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=6, max=2000)),
+                vol.Required(
+                    CONF_MIN_CURRENT,
+                    default=options.get(CONF_MIN_CURRENT, DEFAULT_MIN_CURRENT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=6, max=80)),
+                vol.Required(CONF_TRACE, default=options.get(CONF_TRACE, False)): bool,
+            }
+        )
+        return self.async_show_form(
+            step_id="init",
+            data_schema=schema,
+            errors=errors,
+            description_placeholders={"stations": str(stations)},
+        )
@@ -7,6 +7,13 @@ CONF_PASSWORD = "password"
 CONF_PORT = "port"
 CONF_CONTROLLER_TYPE = "controller_type"
 
+# Options: dynamic load balancing across stations sharing a feeder
+CONF_LOAD_BALANCING = "load_balancing"
+CONF_FEEDER_CURRENT = "feeder_current"
+CONF_MIN_CURRENT = "min_current"
+# Option: write refresh trace spans to a JSON-lines file in the config dir
+CONF_TRACE = "trace"
+
 CONTROLLER_UDMP = "udmp"
 CONTROLLER_OTHER = "other"
 
@@ -21,6 +28,82 @@ EV_DEVICE_PLATFORMS = ["EVS-Lite", "EVS", "EVS-Pro"]
 
 DEFAULT_REFRESH_INTERVAL = 30
 
+# Concurrent REST requests allowed to the console (see scheduler.py)
+MAX_CONCURRENT_REQUESTS = 4
+
+# Circuit breaker (see breaker.py): consecutive failures or slow responses
+# (seconds) before opening, and the initial / maximum cooldown (seconds)
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_SLOW_REQUEST = 5
+BREAKER_COOLDOWN = 15
+BREAKER_MAX_COOLDOWN = 300
+
+# Poll interval backoff: doubled while the console is unhealthy (up to the
+# maximum), shortened by the step per healthy poll.  A device list fetch
+# slower than the latency threshold (seconds) counts as unhealthy.
+POLL_MAX_INTERVAL = 300
+POLL_BACKOFF_STEP = 5
+POLL_SLOW_LATENCY = 3
+
+# Entities keep showing last-known state for this long (seconds) after
+# the last successful poll before going unavailable
+STALE_DATA_TIMEOUT = 600
+
+# A device missing from this many consecutive polls is treated as removed
+# from the console and its entities are deleted
+DEVICE_REMOVE_AFTER = 3
+
+# Control confirmation: after an action, wait up to each delay (seconds)
+# for a DEVICE_UPDATED push, then re-fetch just that device and check it
+CONFIRM_DELAYS = (2, 5)
+
+# Slider writes: quiet time (seconds) before the newest value is sent
+WRITE_DEBOUNCE = 0.5
+
+# Load balancing: per-station floor (A), write hysteresis (A), minimum
+# seconds between raises, telemetry age (s) before falling back to fixed
+# shares, and the quiet time (s) used to batch pushes into one decision
+DEFAULT_FEEDER_CURRENT = 80
+DEFAULT_MIN_CURRENT = 6
+LOAD_BALANCE_HYSTERESIS = 2
+LOAD_BALANCE_RAISE_INTERVAL = 10
+LOAD_BALANCE_STALE_AFTER = 90
+LOAD_BALANCE_SETTLE = 1
+
+# Charge history: sessions kept in the Charge History sensor attributes,
+# and paging limits for the get_charge_history service / WS command
+HISTORY_ATTR_SESSIONS = 10
+HISTORY_QUERY_DEFAULT_LIMIT = 50
+HISTORY_QUERY_MAX_LIMIT = 500
+
+# Change-subscription keys: entities watch (device_id, key) pairs where key
+# is a top-level device field, "shadow.<key>", or one of these pseudo-keys
+SHADOW_KEY_PREFIX = "shadow."
+WATCH_CHARGE_HISTORY = "chargeHistory"
+WATCH_POWER = "power"
+
+SERVICE_GET_CHARGE_HISTORY = "get_charge_history"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_TOU_PERIOD = "tou_period"
+ATTR_OFFSET = "offset"
+ATTR_LIMIT = "limit"
+
+SERVICE_BULK_ACTION = "bulk_action"
+ATTR_ACTION = "action"
+ATTR_ARGS = "args"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_TIMEOUT = "timeout"
+BULK_DEFAULT_CONCURRENCY = 5
+BULK_MAX_CONCURRENCY = 20
+BULK_DEFAULT_TIMEOUT = 10
+
+SERVICE_PROFILE = "profile"
+ATTR_REFRESHES = "refreshes"
+ATTR_WEBSOCKET_SECONDS = "websocket_seconds"
+PROFILE_MAX_REFRESHES = 10
+PROFILE_MAX_WEBSOCKET_SECONDS = 600
+
 # SE21 Display Action IDs
 ACTION_REFRESH_WEBSITE = "416cef71-50b4-4983-91cc-e6d8dcb82505"
 ACTION_BRIGHTNESS = "521c3110-8f8e-400a-a06f-a529093c7a1c"
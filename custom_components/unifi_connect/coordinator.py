@@ -1,44 +1,68 @@
+import asyncio
 import logging
+import time
+from contextlib import nullcontext, suppress
 from datetime import timedelta
+from typing import Any, Callable, Iterable
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .actions import ActionTable
 from .api import UnifiConnectAPI, UnifiConnectAPIError
+from .breaker import STATE_CLOSED
 from .const import (
+    CONFIRM_DELAYS,
+    DEVICE_REMOVE_AFTER,
     DOMAIN,
     DEFAULT_REFRESH_INTERVAL,
-    EV_DEVICE_PLATFORMS,
+    POLL_BACKOFF_STEP,
+    POLL_MAX_INTERVAL,
+    POLL_SLOW_LATENCY,
+    SHADOW_KEY_PREFIX,
+    STALE_DATA_TIMEOUT,
+    WATCH_CHARGE_HISTORY,
 )
+from .history import ChargeHistoryIndex, ChargeSession
+from .metrics import LatencyRecorder, PhaseTimer
+from .model import UnifiDevice, parse_devices
+from .profiling import ProfileCapture
+from .rollup import EnergyRollup
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _is_ev_device(device: dict) -> bool:
-    """Check if a device is an EV Station (by platform or supported actions)."""
-    platform = device.get("type", {}).get("platform", "")
-    if platform in EV_DEVICE_PLATFORMS:
-        return True
-    # Also detect by shadow keys unique to EV devices
-    shadow = device.get("shadow", {})
-    if "chargingStatus" in shadow or "evStationMode" in shadow:
-        return True
-    # Also detect by supported actions for unknown platform IDs
-    actions = device.get("supportedActions", [])
-    action_names = [a.get("name", "") if isinstance(a, dict) else "" for a in actions]
-    return "power_stats_single" in action_names
+def _diff_device(device_id: str, old: dict, new: dict) -> set[tuple[str, str]]:
+    """Return the (device_id, key) pairs that differ between two snapshots.
 
-
-def _get_action_id(device: dict, action_name: str) -> str | None:
-    """Find the action ID for a named action from the device's supportedActions."""
-    for action in device.get("supportedActions", []):
-        if isinstance(action, dict) and action.get("name") == action_name:
-            return action.get("id")
-    return None
+    Top-level fields are reported by name; shadow fields are reported
+    both as ``shadow`` and as ``shadow.<key>``.
+    """
+    changed: set[tuple[str, str]] = set()
+    for key in old.keys() | new.keys():
+        old_value = old.get(key)
+        new_value = new.get(key)
+        if old_value == new_value:
+            continue
+        changed.add((device_id, key))
+        if key == "shadow":
+            old_shadow = old_value if isinstance(old_value, dict) else {}
+            new_shadow = new_value if isinstance(new_value, dict) else {}
+            for shadow_key in old_shadow.keys() | new_shadow.keys():
+                if old_shadow.get(shadow_key) != new_shadow.get(shadow_key):
+                    changed.add((device_id, SHADOW_KEY_PREFIX + shadow_key))
+    return changed
 
 
 class UnifiConnectCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching UniFi Connect data."""
+    """Class to manage fetching UniFi Connect data.
+
+    Listeners registered with a ``frozenset`` of ``(device_id, key)``
+    pairs as their context are only called when one of those keys
+    changed between refreshes (or was pushed via ``async_notify_keys``).
+    Listeners without such a context, and every listener when the
+    device set or availability changes, are always called.
+    """
 
     def __init__(
         self,
@@ -48,18 +72,407 @@ class UnifiConnectCoordinator(DataUpdateCoordinator):
     ):
         self.api = api
         self.charge_history: dict[str, list] = {}
+        self.history_index = ChargeHistoryIndex()
+        # Parsed devices by ID, rebuilt each refresh (unchanged ones reused)
+        self.devices: dict[str, UnifiDevice] = {}
         self._first_run = True
+        self._history_deferred = True
+        self._history_syncing = False
+        self._history_listeners: list[Callable[[list[UnifiDevice]], None]] = []
+        # Devices missing from the latest polls -> consecutive misses
+        self._absent: dict[str, int] = {}
+        self._removal_listeners: list[Callable[[str], None]] = []
+        # (device_id, key) -> {remove_listener: update_callback}
+        self._key_listeners: dict[tuple[str, str], dict[CALLBACK_TYPE, CALLBACK_TYPE]] = {}
+        self._unkeyed_listeners: dict[CALLBACK_TYPE, CALLBACK_TYPE] = {}
+        self._changed_keys: set[tuple[str, str]] | None = None
+        self._notified_available = True
+        # Adaptive polling: back off while the console is unhealthy
+        self._base_interval = update_interval
+        self._last_success_at: float | None = None
+        # Single-device confirmation: waiters woken by DEVICE_UPDATED pushes
+        self._device_waiters: dict[str, set[asyncio.Event]] = {}
+        self._device_updated_at: dict[str, float] = {}
+        self._single_device_fetch = True
+        # Phases of the latest refresh (devices, parse, ev_data, diff,
+        # notify), the requests it made, and refresh / history_sync times
+        self.last_cycle: PhaseTimer | None = None
+        self.last_cycle_requests = 0
+        self.cycle_metrics = LatencyRecorder()
+        self._notify_cycle: PhaseTimer | None = None
+        # Set by the profile service while this coordinator is profiled
+        self.profile: ProfileCapture | None = None
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=update_interval),
         )
+        self.rollup = EnergyRollup(hass)
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Register a listener, indexing it by its (device_id, key) context."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        keys = context if isinstance(context, frozenset) else None
+        if keys is None:
+            self._unkeyed_listeners[remove_listener] = update_callback
+        for key in keys or ():
+            self._key_listeners.setdefault(key, {})[remove_listener] = update_callback
+
+        @callback
+        def remove() -> None:
+            self._unkeyed_listeners.pop(remove_listener, None)
+            for key in keys or ():
+                listeners = self._key_listeners.get(key)
+                if listeners is not None:
+                    listeners.pop(remove_listener, None)
+                    if not listeners:
+                        del self._key_listeners[key]
+            remove_listener()
+
+        return remove
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose keys changed in the last refresh."""
+        changed = self._changed_keys
+        self._changed_keys = None
+        available = self.data_available
+        cycle, self._notify_cycle = self._notify_cycle, None
+        with cycle.phase("notify") if cycle else nullcontext():
+            if changed is None or available != self._notified_available:
+                self._notified_available = available
+                with self.api.tracer.span(
+                    "fan_out", start_trace=False, listeners=len(self._listeners)
+                ):
+                    super().async_update_listeners()
+                return
+            self._call_listeners(changed, dict(self._unkeyed_listeners))
+
+    @callback
+    def async_notify_keys(self, keys: set[tuple[str, str]]) -> None:
+        """Call the listeners bound to any of *keys* for pushed data."""
+        self._call_listeners(keys, {})
+
+    def _call_listeners(
+        self,
+        keys: set[tuple[str, str]],
+        targets: dict[CALLBACK_TYPE, CALLBACK_TYPE],
+    ) -> None:
+        for key in keys:
+            listeners = self._key_listeners.get(key)
+            if listeners:
+                targets.update(listeners)
+        with self.api.tracer.span("fan_out", start_trace=False, listeners=len(targets)):
+            for update_callback in targets.values():
+                update_callback()
+
+    @callback
+    def async_device_updated(self, device_id: str) -> None:
+        """Record a DEVICE_UPDATED push and wake confirmations for it."""
+        self._device_updated_at[device_id] = time.monotonic()
+        for waiter in self._device_waiters.get(device_id, ()):
+            waiter.set()
+
+    async def async_refresh_device(self, device_id: str) -> UnifiDevice | None:
+        """Re-fetch one device and notify only the listeners of changed keys.
+
+        Falls back to the device list (still without power-stats or
+        history requests) if the controller has no single-device endpoint.
+        """
+        raw = None
+        if self._single_device_fetch:
+            try:
+                raw = await self.api.get_device(device_id)
+            except UnifiConnectAPIError as err:
+                _LOGGER.debug("Single-device refresh failed for %s: %s", device_id, err)
+                if err.status in (404, 405):
+                    self._single_device_fetch = False
+        if raw is None:
+            try:
+                raws = await self.api.get_devices()
+            except UnifiConnectAPIError as err:
+                _LOGGER.debug("Device refresh failed for %s: %s", device_id, err)
+                return None
+            raw = next((d for d in raws if d.get("id") == device_id), None)
+        old = self.devices.get(device_id)
+        if not raw or raw.get("id") != device_id or old is None:
+            return None
+        if old.raw == raw:
+            return old
+
+        device = UnifiDevice(raw, old)
+        self.devices = {**self.devices, device_id: device}
+        data = [raw if d.get("id") == device_id else d for d in self.data or []]
+        self._changed_keys = _diff_device(device_id, old.raw, raw)
+        self.async_set_updated_data(data)
+        return device
+
+    async def async_confirm_device(
+        self, device_id: str, check: Callable[[], bool], since: float
+    ) -> bool:
+        """Confirm an action on one device without a full refresh.
+
+        For each delay in ``CONFIRM_DELAYS``, wait up to that long for a
+        DEVICE_UPDATED push (skipped if one arrived after *since*, a
+        ``time.monotonic()`` value), re-fetch the device and evaluate
+        *check*.  Returns False if the change never showed up.
+        """
+        waiter = asyncio.Event()
+        if self._device_updated_at.get(device_id, 0) >= since:
+            waiter.set()
+        self._device_waiters.setdefault(device_id, set()).add(waiter)
+        try:
+            for delay in CONFIRM_DELAYS:
+                with suppress(TimeoutError):
+                    async with asyncio.timeout(delay):
+                        await waiter.wait()
+                waiter.clear()
+                await self.async_refresh_device(device_id)
+                if check():
+                    return True
+            return False
+        finally:
+            waiters = self._device_waiters.get(device_id)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._device_waiters[device_id]
+
+    @callback
+    def async_add_history_listener(
+        self, update_callback: Callable[[list[UnifiDevice]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for cycles that indexed new charge sessions.
+
+        The callback receives the device list of that cycle.
+        """
+        self._history_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._history_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_add_removal_listener(
+        self, remove_callback: Callable[[str], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for devices that the console stopped reporting.
+
+        The callback receives the removed device ID.
+        """
+        self._removal_listeners.append(remove_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._removal_listeners.remove(remove_callback)
+
+        return remove_listener
+
+    def action_table(self, device_id: str) -> ActionTable:
+        """Return the action table for a device (empty if it is unknown)."""
+        device = self.devices.get(device_id)
+        return device.actions if device is not None else ActionTable({"id": device_id})
+
+    @callback
+    def async_restore(
+        self,
+        devices: list[dict[str, Any]],
+        sessions: dict[str, list[ChargeSession]],
+        saved_at: float,
+    ) -> None:
+        """Seed data from a cached snapshot so entities start on last-known state.
+
+        Only parsed sessions are cached, so the rollups and history
+        queries start on them while sensors that need the raw history
+        wait for the first history sync.  The first network refresh
+        still notifies every listener, but entities only write state
+        for values that actually changed.
+        """
+        self.devices = parse_devices(devices, {})
+        for device_id, station_sessions in sessions.items():
+            if device_id not in self.devices:
+                continue
+            self.history_index.restore_device(device_id, station_sessions)
+            self.rollup.async_add_sessions(station_sessions)
+        # Count the snapshot's age against the stale-data timeout
+        self._last_success_at = time.monotonic() - max(0.0, time.time() - saved_at)
+        self.data = devices
+
+    @property
+    def data_available(self) -> bool:
+        """Return True while entities should show the last-known data.
+
+        Short console outages keep entities available on their previous
+        state; they only go unavailable once the data is too old.
+        """
+        if self.last_update_success:
+            return True
+        return (
+            self._last_success_at is not None
+            and time.monotonic() - self._last_success_at < STALE_DATA_TIMEOUT
+        )
+
+    def _adapt_interval(self, healthy: bool) -> None:
+        """Shorten the poll interval additively when healthy, double it otherwise."""
+        current = self.update_interval.total_seconds()
+        if healthy:
+            interval = max(self._base_interval, current - POLL_BACKOFF_STEP)
+        else:
+            interval = min(POLL_MAX_INTERVAL, current * 2)
+        if interval != current:
+            _LOGGER.debug("Poll interval %ss -> %ss", current, interval)
+            self.update_interval = timedelta(seconds=interval)
+
+    def _track_absent(self, devices: dict[str, UnifiDevice]) -> None:
+        """Remove devices that were missing from several polls in a row.
+
+        A single missing poll is tolerated so a console glitch doesn't
+        delete entities (and their registry customisations).  Until then
+        the last-known device is carried forward into *devices*.
+        """
+        for device_id in self.devices.keys() - devices.keys():
+            self._absent.setdefault(device_id, 0)
+        for device_id in list(self._absent):
+            if device_id in devices:
+                del self._absent[device_id]
+                continue
+            self._absent[device_id] += 1
+            if self._absent[device_id] < DEVICE_REMOVE_AFTER:
+                if (previous := self.devices.get(device_id)) is not None:
+                    devices[device_id] = previous
+                continue
+            del self._absent[device_id]
+            _LOGGER.info("Device %s is no longer reported, removing it", device_id)
+            self.charge_history.pop(device_id, None)
+            self.history_index.remove_device(device_id)
+            self._device_updated_at.pop(device_id, None)
+            for remove_callback in list(self._removal_listeners):
+                remove_callback(device_id)
+
+    async def _async_fetch_ev_data(
+        self, devices: Iterable[UnifiDevice], verbose: bool = False
+    ) -> set[str]:
+        """Nudge power stats and sync charge history for every EV device.
+
+        Skipped while the console is still recovering.  Returns the IDs
+        of stations whose indexed history changed.
+        """
+        history_changed: set[str] = set()
+        if self.api.breaker.state != STATE_CLOSED:
+            return history_changed
+        for device in devices:
+            if not device.is_ev:
+                continue
+            device_id = device.id
+
+            # Log shadow values on the first pass
+            if verbose:
+                _LOGGER.info(
+                    "EV device %s shadow values: %s",
+                    device.name,
+                    dict(device.shadow),
+                )
+
+            # Trigger power_stats_single if available
+            actions = device.actions
+            if actions.has_action("power_stats_single"):
+                await self.api.request_power_stats(
+                    device_id, actions.action_id("power_stats_single")
+                )
+
+            # Fetch charge history from stats endpoint (all devices)
+            history_version = self.history_index.version(device_id)
+            try:
+                all_history = await self.api.get_charge_history(device_id)
+                # Filter sessions for this device by MAC address
+                if device.mac:
+                    history = [
+                        s for s in all_history
+                        if s.get("mac", "").upper() == device.mac
+                    ]
+                else:
+                    history = all_history
+                # The first raw history since startup completes what the
+                # snapshot restored, even if no session is new
+                first = device_id not in self.charge_history
+                self.charge_history[device_id] = history
+                added = self.history_index.update_device(device_id, history)
+                if added:
+                    self.rollup.async_add_sessions(added)
+                if first or self.history_index.version(device_id) != history_version:
+                    history_changed.add(device_id)
+                if verbose:
+                    _LOGGER.info(
+                        "EV device %s charge history: %d sessions "
+                        "(from %d total across all devices)",
+                        device.name,
+                        len(history),
+                        len(all_history),
+                    )
+            except Exception as err:
+                if verbose:
+                    _LOGGER.info(
+                        "Could not fetch charge history for %s: %s",
+                        device.name,
+                        err,
+                    )
+        return history_changed
+
+    async def async_sync_history(self) -> None:
+        """Run the deferred first power-stats and history pass.
+
+        Called once entities are registered; later refreshes include
+        this work again.
+        """
+        if self._history_syncing:
+            return
+        self._history_syncing = True
+        started = time.monotonic()
+        try:
+            with self.api.tracer.span("history_sync"):
+                history_changed = await self._async_fetch_ev_data(
+                    list(self.devices.values()), verbose=True
+                )
+        finally:
+            self._history_syncing = False
+            self._history_deferred = False
+            self.cycle_metrics.record("history_sync", time.monotonic() - started)
+        if history_changed:
+            for update_callback in list(self._history_listeners):
+                update_callback(list(self.devices.values()))
+            self._changed_keys = {
+                (device_id, WATCH_CHARGE_HISTORY) for device_id in history_changed
+            }
+            self.async_update_listeners()
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh as one trace, under the profiler if a capture is running."""
+        profile = self.profile
+        with self.api.tracer.span("refresh"):
+            if profile is None:
+                await super()._async_refresh(*args, **kwargs)
+                return
+            with profile.capture():
+                await super()._async_refresh(*args, **kwargs)
+        if profile.refresh_done(self) and self.profile is profile:
+            self.profile = None
 
     async def _async_update_data(self):
         """Fetch data from UniFi Connect API."""
+        self._changed_keys = None
+        cycle = PhaseTimer(self.api.tracer)
+        requests = self.api.counters["requests"]
+        cycle_started = time.monotonic()
         try:
-            devices = await self.api.get_devices()
+            with cycle.phase("devices"):
+                devices = await self.api.get_devices()
+            latency = time.monotonic() - cycle_started
 
             # Log device info on first run for debugging
             if self._first_run:
@@ -80,59 +493,53 @@ class UnifiConnectCoordinator(DataUpdateCoordinator):
                     ],
                 )
 
-            # For EV devices, fetch charge history and optionally trigger power stats
-            for device in devices or []:
-                if not _is_ev_device(device):
-                    continue
-
-                device_id = device.get("id")
-                if not device_id:
-                    continue
+            with cycle.phase("parse"):
+                devices_by_id = parse_devices(devices or [], self.devices)
 
-                # Log shadow values on first run
-                if self._first_run:
-                    shadow = device.get("shadow", {})
-                    _LOGGER.info(
-                        "EV device %s shadow values: %s",
-                        device.get("name"),
-                        shadow,
+            # Power stats nudges and history sync for EV devices; the first
+            # pass is deferred to async_sync_history so setup isn't blocked
+            history_changed: set[str] = set()
+            if not self._history_deferred and not self._history_syncing:
+                with cycle.phase("ev_data"):
+                    history_changed = await self._async_fetch_ev_data(
+                        devices_by_id.values()
                     )
+                self.cycle_metrics.record("history_sync", cycle.duration("ev_data"))
+
+            diff_started = time.monotonic()
+            self._track_absent(devices_by_id)
+            if self._first_run or devices_by_id.keys() != self.devices.keys():
+                # Device set changed: every listener gets notified
+                self._changed_keys = None
+            else:
+                changed: set[tuple[str, str]] = set()
+                for device_id, device in devices_by_id.items():
+                    old = self.devices[device_id]
+                    if old is not device:
+                        changed |= _diff_device(device_id, old.raw, device.raw)
+                changed.update(
+                    (device_id, WATCH_CHARGE_HISTORY) for device_id in history_changed
+                )
+                self._changed_keys = changed
+            self.devices = devices_by_id
+            cycle.mark("diff", diff_started, time.monotonic())
+            # Listener notification follows as the cycle's last phase
+            self._notify_cycle = cycle
 
-                # Trigger power_stats_single if available
-                action_id = _get_action_id(device, "power_stats_single")
-                if action_id:
-                    await self.api.request_power_stats(device_id, action_id)
-
-                # Fetch charge history from stats endpoint (all devices)
-                try:
-                    all_history = await self.api.get_charge_history(device_id)
-                    # Filter sessions for this device by MAC address
-                    device_mac = device.get("mac", "").upper()
-                    if device_mac:
-                        history = [
-                            s for s in all_history
-                            if s.get("mac", "").upper() == device_mac
-                        ]
-                    else:
-                        history = all_history
-                    self.charge_history[device_id] = history
-                    if self._first_run:
-                        _LOGGER.info(
-                            "EV device %s charge history: %d sessions "
-                            "(from %d total across all devices)",
-                            device.get("name"),
-                            len(history),
-                            len(all_history),
-                        )
-                except Exception as err:
-                    if self._first_run:
-                        _LOGGER.info(
-                            "Could not fetch charge history for %s: %s",
-                            device.get("name"),
-                            err,
-                        )
+            if history_changed:
+                for update_callback in list(self._history_listeners):
+                    update_callback(list(devices_by_id.values()))
 
             self._first_run = False
+            self._last_success_at = time.monotonic()
+            self._adapt_interval(
+                latency < POLL_SLOW_LATENCY and self.api.breaker.state == STATE_CLOSED
+            )
             return devices
         except UnifiConnectAPIError as err:
+            self._adapt_interval(False)
             raise UpdateFailed(f"Error fetching UniFi Connect data: {err}") from err
+        finally:
+            self.last_cycle = cycle
+            self.last_cycle_requests = self.api.counters["requests"] - requests
+            self.cycle_metrics.record("refresh", time.monotonic() - cycle_started)
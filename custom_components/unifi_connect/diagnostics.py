@@ -0,0 +1,102 @@
+"""Diagnostics for UniFi Connect: request, WebSocket and refresh timings."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, DOMAIN
+from .hub import UnifiConnectHub
+
+TO_REDACT = {
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    "unique_id",
+    "title",
+    "cookies",
+    "csrf",
+}
+
+
+def _api_diagnostics(hub: UnifiConnectHub) -> dict[str, Any]:
+    api = hub.api
+    pages = list(api.history_pages)
+    return {
+        "counters": dict(api.counters),
+        "endpoints": api.metrics.as_dict(),
+        "history_pages": {
+            "last": pages[-1] if pages else None,
+            "mean": round(sum(pages) / len(pages), 1) if pages else None,
+            "max": max(pages, default=None),
+            "recent": pages,
+        },
+        "scheduler": {
+            "active": api.scheduler.active,
+            "queued": api.scheduler.queued,
+            "classes": api.scheduler.metrics.as_dict(),
+        },
+        "breaker": {
+            "state": api.breaker.state,
+            "retry_after_s": round(api.breaker.retry_after(), 1),
+            "times_opened": api.breaker.times_opened,
+        },
+    }
+
+
+def _websocket_diagnostics(hub: UnifiConnectHub) -> dict[str, Any]:
+    websocket = hub.websocket
+    messages_per_s, bytes_per_s = websocket.rate.rates()
+    return {
+        "connected": websocket.connected,
+        "counters": dict(websocket.counters),
+        "messages_per_s": round(messages_per_s, 2),
+        "bytes_per_s": round(bytes_per_s, 1),
+        "last_power_age_s": (
+            round(time.monotonic() - websocket.last_power_at, 1)
+            if websocket.last_power_at is not None
+            else None
+        ),
+        "devices_streaming": len(websocket.power_data),
+    }
+
+
+def _coordinator_diagnostics(hub: UnifiConnectHub) -> dict[str, Any]:
+    coordinator = hub.coordinator
+    return {
+        "last_update_success": coordinator.last_update_success,
+        "update_interval_s": coordinator.update_interval.total_seconds(),
+        "devices": len(coordinator.devices),
+        "history_sessions": sum(len(h) for h in coordinator.charge_history.values()),
+        "last_cycle": (
+            coordinator.last_cycle.as_dict() if coordinator.last_cycle else None
+        ),
+        "last_cycle_requests": coordinator.last_cycle_requests,
+        "cycles": coordinator.cycle_metrics.as_dict(),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    diagnostics: dict[str, Any] = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+    }
+    hub: UnifiConnectHub | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if hub is None:
+        return diagnostics
+    diagnostics.update(
+        {
+            "startup": hub.startup.as_dict(),
+            "api": _api_diagnostics(hub),
+            "transport": hub.transport.as_dict(),
+            "websocket": _websocket_diagnostics(hub),
+            "coordinator": _coordinator_diagnostics(hub),
+        }
+    )
+    return async_redact_data(diagnostics, TO_REDACT)
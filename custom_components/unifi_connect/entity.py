@@ -1,44 +1,263 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Mapping
 from typing import Any
 
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .actions import ActionTable
+from .capabilities import DeviceCapabilities
 from .const import DOMAIN
+from .model import UnifiDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_setup_device_entities(
+    hub,
+    async_add_entities: AddEntitiesCallback,
+    device_entities: Callable[[Any, UnifiDevice], list[Entity]],
+) -> None:
+    """Add a platform's entities for current devices and for later arrivals.
+
+    Devices that show up on a later poll get their entities without a
+    reload, as do devices that are reclassified (e.g. recognised as an
+    EV Station once their actions are reported); removed devices are
+    forgotten so they are re-added if they come back.  Entity removal
+    itself goes through the device registry.
+    """
+    known: dict[str, DeviceCapabilities] = {}
+    # device_id -> unique IDs of the entities added for it
+    added: dict[str, set[str | None]] = {}
+
+    @callback
+    def _async_add_new_devices() -> None:
+        entities: list[Entity] = []
+        for device_id, device in hub.coordinator.devices.items():
+            if known.get(device_id) == device.capabilities:
+                continue
+            known[device_id] = device.capabilities
+            unique_ids = added.setdefault(device_id, set())
+            for entity in device_entities(hub, device):
+                if entity.unique_id not in unique_ids:
+                    unique_ids.add(entity.unique_id)
+                    entities.append(entity)
+        if entities:
+            async_add_entities(entities)
+
+    @callback
+    def _async_forget_device(device_id: str) -> None:
+        known.pop(device_id, None)
+        added.pop(device_id, None)
+
+    _async_add_new_devices()
+    hub.entry.async_on_unload(
+        hub.coordinator.async_add_listener(_async_add_new_devices)
+    )
+    hub.entry.async_on_unload(
+        hub.coordinator.async_add_removal_listener(_async_forget_device)
+    )
 
 
 class UnifiConnectEntity(CoordinatorEntity):
-    """Base entity for UniFi Connect devices."""
+    """Base entity for UniFi Connect devices.
+
+    State is computed once per coordinator update in ``_update_state``,
+    which sets the ``_attr_*`` values HA reads.  The state is only
+    written when one of those values (or availability) changed.
+    """
 
-    def __init__(self, hub, device, name_suffix="", unique_suffix=""):
+    def __init__(self, hub, device: UnifiDevice, name_suffix="", unique_suffix=""):
         super().__init__(hub.coordinator)
         self._hub = hub
-        self._device_id = device["id"]
-        device_name = device.get("name", f"UniFi Device {device['id']}")
+        self._device_id = device.id
+        self._written_snapshot: tuple[bool, dict[str, Any]] | None = None
+        # _attr_* values shown until a pending action is confirmed
+        self._optimistic: dict[str, Any] | None = None
+        # Confirms the latest optimistic state; replaced by each new action
+        self._confirm_task: asyncio.Task | None = None
+        device_name = device.name
         self._attr_name = f"{device_name} {name_suffix}" if name_suffix else device_name
         self._attr_unique_id = (
-            f"{device['id']}_{unique_suffix}" if unique_suffix else device["id"]
+            f"{device.id}_{unique_suffix}" if unique_suffix else device.id
         )
         self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, device["id"])},
+            identifiers={(DOMAIN, device.id)},
             name=device_name,
             manufacturer="Ubiquiti",
-            model=device.get("type", {}).get("fullName", "Unknown"),
+            model=device.model,
         )
 
-    def _get_device(self) -> dict | None:
-        """Get the full device dict from coordinator data."""
-        for d in self.coordinator.data or []:
-            if d["id"] == self._device_id:
-                return d
-        return None
+    @property
+    def available(self) -> bool:
+        """Keep showing last-known state through short console outages."""
+        return self.coordinator.data_available
 
-    def _get_shadow(self) -> dict:
+    def _get_device(self) -> UnifiDevice | None:
+        """Get the parsed device from coordinator data."""
+        return self.coordinator.devices.get(self._device_id)
+
+    def _get_shadow(self) -> Mapping[str, Any]:
         """Get the current shadow state for this device from coordinator data."""
         device = self._get_device()
-        return device.get("shadow", {}) if device else {}
+        return device.shadow if device else {}
 
     def _get_power_data(self) -> dict[str, Any]:
         """Get real-time power data from the WebSocket listener."""
         return self._hub.websocket.power_data.get(self._device_id, {})
+
+    def _watch(self, *keys: str) -> None:
+        """Only update on refreshes that change one of this device's *keys*.
+
+        Keys are top-level device fields, ``shadow.<key>`` or the
+        ``WATCH_*`` pseudo-keys.  Calling it with no keys limits updates
+        to availability and device-set changes.
+        """
+        self.coordinator_context = frozenset((self._device_id, key) for key in keys)
+
+    def _update_state(self) -> None:
+        """Recompute the cached ``_attr_*`` state from current data."""
+
+    def _state_snapshot(self) -> tuple[bool, dict[str, Any]]:
+        # _update_state always assigns fresh values, so a shallow copy of
+        # the _attr_ fields is enough to detect a change.  HA stores the
+        # ones backing cached properties as __attr_<name>.
+        return self.available, {
+            key: value
+            for key, value in vars(self).items()
+            if key.startswith(("_attr_", "__attr_"))
+        }
+
+    async def async_added_to_hass(self) -> None:
+        self._update_state()
+        # HA writes the initial state right after this returns
+        self._written_snapshot = self._state_snapshot()
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_cancel_confirm)
+
+    @callback
+    def _async_update_and_write(self) -> None:
+        """Recompute state and write it only if something changed."""
+        self._update_state()
+        if self._optimistic:
+            for attr, value in self._optimistic.items():
+                setattr(self, attr, value)
+        snapshot = self._state_snapshot()
+        if snapshot != self._written_snapshot:
+            self._written_snapshot = snapshot
+            self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._async_update_and_write()
+
+    def _actions(self) -> ActionTable:
+        """Return this device's action table (resolved at press time)."""
+        return self.coordinator.action_table(self._device_id)
+
+    async def _async_perform_action(
+        self,
+        action_id: str,
+        action_name: str,
+        args: dict | None = None,
+        optimistic: dict[str, Any] | None = None,
+    ) -> None:
+        """Perform an action, show its result optimistically, then confirm it.
+
+        *optimistic* maps ``_attr_*`` names to the values the action is
+        expected to produce.  They are written immediately; a background
+        task then confirms them against this one device and rolls back
+        if the controller does not report them.
+        """
+        since = time.monotonic()
+        if not await self._hub.api.perform_action(
+            self._device_id, action_id, action_name, args
+        ):
+            raise HomeAssistantError(f"{action_name} failed for {self.name}")
+        if not optimistic:
+            return
+
+        self._optimistic = optimistic
+        self._async_update_and_write()
+        self._async_start_confirm(optimistic, since)
+
+    @callback
+    def _async_write_coalesced(
+        self,
+        action_id: str,
+        action_name: str,
+        args: dict | None,
+        optimistic: dict[str, Any],
+    ) -> None:
+        """Show a value optimistically and hand the write to the pipeline.
+
+        Bursts (slider drags) collapse into one request for the newest
+        value, and only that final value is confirmed.
+        """
+        self._optimistic = optimistic
+        self._async_update_and_write()
+        self._hub.write_pipeline(self._device_id, action_name).submit(
+            action_id,
+            args,
+            lambda success, since: self._async_write_settled(optimistic, success, since),
+        )
+
+    @callback
+    def _async_write_settled(
+        self, optimistic: dict[str, Any], success: bool, since: float
+    ) -> None:
+        """Confirm the final coalesced write, or revert if it failed."""
+        if success:
+            self._async_start_confirm(optimistic, since)
+            return
+        if self._optimistic is optimistic:
+            self._optimistic = None
+        _LOGGER.warning("%s failed to write %s; reverting", self.entity_id, optimistic)
+        self._async_update_and_write()
+
+    @callback
+    def _async_start_confirm(self, optimistic: dict[str, Any], since: float) -> None:
+        """Confirm *optimistic* in the background, replacing an older check."""
+        self._async_cancel_confirm()
+        self._confirm_task = self.hass.async_create_background_task(
+            self._async_confirm(optimistic, since),
+            f"{DOMAIN} confirm {self.entity_id}",
+        )
+
+    @callback
+    def _async_cancel_confirm(self) -> None:
+        if self._confirm_task is not None and not self._confirm_task.done():
+            self._confirm_task.cancel()
+        self._confirm_task = None
+
+    async def _async_confirm(self, optimistic: dict[str, Any], since: float) -> None:
+        """Confirm an optimistic state change, reverting it if it did not stick."""
+
+        def check() -> bool:
+            self._update_state()
+            return all(
+                getattr(self, attr, None) == value for attr, value in optimistic.items()
+            )
+
+        try:
+            confirmed = await self.coordinator.async_confirm_device(
+                self._device_id, check, since
+            )
+        finally:
+            if self._optimistic is optimistic:
+                self._optimistic = None
+        if not confirmed:
+            _LOGGER.warning(
+                "%s did not report %s after the action; reverting to device state",
+                self.entity_id,
+                optimistic,
+            )
+        self._async_update_and_write()
@@ -0,0 +1,446 @@
+"""Charge session parsing and an in-memory charge history index.
+
+Session helpers normalise the two history schemas the controller uses
+(``stats/evs/chargingHistory`` and the per-device ``chargeHistory``) and
+compute Ontario TOU cost estimates.  ``ChargeHistoryIndex`` keeps every
+parsed session sorted by start time per station so that paginated and
+filtered queries do not have to walk or re-parse the raw history.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+_LOGGER = logging.getLogger(__name__)
+
+# Ordered list of keys to try when extracting energy from a charge session.
+# The stats/evs/chargingHistory endpoint uses "powerUsage" (kWh).
+# The per-device chargeHistory endpoint uses "energy".
+_ENERGY_KEYS = ("powerUsage", "energyDelivered", "energy", "totalEnergy", "kwh", "wh")
+
+
+def _extract_energy(session: dict) -> float | None:
+    """Extract energy value from a charge session dict.
+
+    Uses explicit ``is not None`` checks so that a legitimate ``0``
+    value is returned instead of falling through to the next key
+    (plain ``or`` chains treat 0 as falsy).
+    """
+    for key in _ENERGY_KEYS:
+        value = session.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _extract_charge_start(session: dict) -> float:
+    """Extract the charge start timestamp (Unix seconds) from a session.
+
+    The stats endpoint uses ``date`` (Unix seconds).
+    The per-device endpoint uses ``chargeStart`` (Unix seconds or ISO).
+    """
+    # stats endpoint: "date" is unix seconds
+    ts = session.get("date")
+    if ts is not None:
+        try:
+            return float(ts)
+        except (ValueError, TypeError):
+            pass
+    # per-device endpoint
+    ts = session.get("chargeStart", 0)
+    if isinstance(ts, str):
+        try:
+            return datetime.fromisoformat(ts).timestamp()
+        except (ValueError, TypeError):
+            return 0
+    return float(ts) if ts else 0
+
+
+def _extract_charge_end(session: dict) -> float:
+    """Extract the charge end timestamp from a session."""
+    # stats endpoint: date + totalTime
+    start = session.get("date")
+    total_time = session.get("totalTime")
+    if start is not None and total_time is not None:
+        try:
+            return float(start) + float(total_time)
+        except (ValueError, TypeError):
+            pass
+    # per-device endpoint
+    return float(session.get("chargeEnd", 0) or 0)
+
+
+def _extract_source(session: dict) -> str:
+    """Extract the session source/mode."""
+    return session.get("usageMode", session.get("source", ""))
+
+
+def _parse_duration_seconds(value) -> float:
+    """Parse a duration value into total seconds.
+
+    Handles both:
+      - ISO datetime-from-epoch like "1970-01-01T02:06:37+00:00" → 7597s
+      - Numeric seconds directly
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            dt = datetime.fromisoformat(value)
+            # Duration encoded as datetime from epoch
+            epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+            return (dt - epoch).total_seconds()
+        except (ValueError, TypeError):
+            return 0.0
+    return 0.0
+
+
+def _format_duration(total_seconds: float) -> str:
+    """Format seconds into Xh Ym Zs string."""
+    total_seconds = int(total_seconds)
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours > 0:
+        return f"{hours}h {minutes}m {seconds}s"
+    if minutes > 0:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
+
+def _get_tou_period(timestamp: int | float, tz_name: str = "America/Toronto") -> str:
+    """Determine Ontario TOU period for a given Unix timestamp.
+
+    Ontario TOU schedule:
+    - Winter (Nov 1 - Apr 30):
+      Off-peak: 7pm-7am weekdays, all day weekends/holidays
+      Mid-peak: 11am-5pm weekdays
+      On-peak:  7am-11am and 5pm-7pm weekdays
+    - Summer (May 1 - Oct 31):
+      Off-peak: 7pm-7am weekdays, all day weekends/holidays
+      Mid-peak: 7am-11am and 5pm-7pm weekdays
+      On-peak:  11am-5pm weekdays
+    """
+    try:
+        import zoneinfo
+        tz = zoneinfo.ZoneInfo(tz_name)
+    except Exception:
+        tz = timezone.utc
+
+    dt = datetime.fromtimestamp(timestamp, tz=tz)
+
+    # Weekends are always off-peak
+    if dt.weekday() >= 5:
+        return "off_peak"
+
+    hour = dt.hour
+    month = dt.month
+
+    # Off-peak hours (all seasons): 7pm-7am
+    if hour < 7 or hour >= 19:
+        return "off_peak"
+
+    # Determine season
+    is_winter = month >= 11 or month <= 4
+
+    if is_winter:
+        # Winter: On-peak 7-11, Mid-peak 11-17, On-peak 17-19
+        if 7 <= hour < 11 or 17 <= hour < 19:
+            return "on_peak"
+        return "mid_peak"  # 11-17
+    else:
+        # Summer: Mid-peak 7-11, On-peak 11-17, Mid-peak 17-19
+        if 11 <= hour < 17:
+            return "on_peak"
+        return "mid_peak"  # 7-11, 17-19
+
+
+TOU_RATE_CENTS_HELPERS = {
+    "off_peak": "input_number.tou_rate_off_peak",
+    "mid_peak": "input_number.tou_rate_mid_peak",
+    "on_peak": "input_number.tou_rate_on_peak",
+}
+TOU_RATE_DOLLARS_HELPERS = {
+    "off_peak": "input_number.ev_rate_off_peak",
+    "mid_peak": "input_number.ev_rate_mid_peak",
+    "on_peak": "input_number.ev_rate_on_peak",
+}
+# Helpers whose changes invalidate computed costs
+TOU_RATE_ENTITY_IDS = [
+    *TOU_RATE_CENTS_HELPERS.values(),
+    *TOU_RATE_DOLLARS_HELPERS.values(),
+]
+
+
+def _get_tou_rate(period: str, hass=None) -> float:
+    """Get TOU rate in $/kWh for the given period.
+
+    Reads from input_number helpers if they exist, otherwise uses
+    Ontario TOU defaults (as of 2025).
+
+    Supports two helper naming conventions:
+      - input_number.tou_rate_off_peak  (in ¢/kWh, divided by 100)
+      - input_number.ev_rate_off_peak   (in $/kWh, used directly)
+    """
+    defaults = {
+        "off_peak": 0.087,
+        "mid_peak": 0.122,
+        "on_peak": 0.180,
+    }
+    if hass:
+        # Try ¢/kWh helpers first (existing house energy helpers)
+        entity_id = TOU_RATE_CENTS_HELPERS.get(period)
+        if entity_id:
+            state = hass.states.get(entity_id)
+            if state and state.state not in ("unknown", "unavailable"):
+                try:
+                    return float(state.state) / 100.0  # ¢ to $
+                except (ValueError, TypeError):
+                    pass
+
+        # Fall back to $/kWh helpers
+        entity_id = TOU_RATE_DOLLARS_HELPERS.get(period)
+        if entity_id:
+            state = hass.states.get(entity_id)
+            if state and state.state not in ("unknown", "unavailable"):
+                try:
+                    return float(state.state)
+                except (ValueError, TypeError):
+                    pass
+    return defaults.get(period, 0.087)
+
+
+def _compute_session_cost(session: dict, hass=None) -> dict:
+    """Compute cost for a single charge session.
+
+    Returns dict with tou_period, rate, energy, cost.
+    """
+    energy = _extract_energy(session)
+    if energy is None:
+        energy = 0.0
+    else:
+        try:
+            energy = float(energy)
+        except (ValueError, TypeError):
+            energy = 0.0
+
+    charge_start = _extract_charge_start(session)
+    period = _get_tou_period(charge_start)
+    rate = _get_tou_rate(period, hass)
+    cost = round(energy * rate, 2)
+
+    return {
+        "tou_period": period,
+        "rate": rate,
+        "energy_kwh": round(energy, 2),
+        "cost": cost,
+    }
+
+
+TOU_PERIODS = ("off_peak", "mid_peak", "on_peak")
+
+
+def _format_timestamp(timestamp: float) -> str:
+    """Format a Unix timestamp as an ISO string, falling back to str()."""
+    try:
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+    except (ValueError, OSError):
+        return str(timestamp)
+
+
+def _session_key(session: dict) -> str:
+    """Return a stable identity for a raw charge session."""
+    session_id = session.get("id")
+    if session_id:
+        return str(session_id)
+    return (
+        f"{session.get('mac', '')}|{_extract_charge_start(session)}"
+        f"|{_extract_charge_end(session)}"
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ChargeSession:
+    """A charge session parsed once from the raw API payload."""
+
+    key: str
+    device_id: str
+    start: float
+    end: float
+    energy_kwh: float
+    charge_seconds: float
+    source: str
+    tou_period: str
+
+    def as_dict(self, hass=None) -> dict[str, Any]:
+        """Render the session like the Charge History attribute entries."""
+        rate = _get_tou_rate(self.tou_period, hass)
+        return {
+            "station": self.device_id,
+            "date": _format_timestamp(self.start),
+            "end": _format_timestamp(self.end),
+            "energy_kwh": self.energy_kwh,
+            "charge_time": _format_duration(self.charge_seconds),
+            "tou_period": self.tou_period,
+            "rate": rate,
+            "cost": round(self.energy_kwh * rate, 2),
+            "source": self.source,
+        }
+
+
+def parse_session(device_id: str, session: dict, key: str | None = None) -> ChargeSession:
+    """Parse a raw charge session dict into a ChargeSession."""
+    energy = _extract_energy(session)
+    try:
+        energy_val = round(float(energy), 2) if energy is not None else 0.0
+    except (ValueError, TypeError):
+        energy_val = 0.0
+
+    charge_start = _extract_charge_start(session)
+    charge_time_raw = session.get("chargeTime")
+    return ChargeSession(
+        key=key or _session_key(session),
+        device_id=device_id,
+        start=charge_start,
+        end=_extract_charge_end(session),
+        energy_kwh=energy_val,
+        charge_seconds=_parse_duration_seconds(charge_time_raw) if charge_time_raw else 0.0,
+        source=_extract_source(session),
+        tou_period=_get_tou_period(charge_start),
+    )
+
+
+def _start_of(session: ChargeSession) -> float:
+    return session.start
+
+
+class ChargeHistoryIndex:
+    """In-memory index of parsed charge sessions, sorted by start per station.
+
+    Raw sessions are parsed only the first time their key is seen, so
+    re-indexing the full history on every poll costs one dict lookup per
+    session.  Queries bisect the per-station start times for date ranges
+    and lazily merge stations newest-first, so a page of results never
+    materialises more sessions than it returns.
+    """
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, list[ChargeSession]] = {}
+        self._starts: dict[str, list[float]] = {}
+        self._versions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return sum(len(sessions) for sessions in self._sessions.values())
+
+    def update_device(
+        self, device_id: str, history: Iterable[dict]
+    ) -> list[ChargeSession]:
+        """Replace a station's sessions and return the ones not seen before."""
+        known = {s.key: s for s in self._sessions.get(device_id, ())}
+        sessions: list[ChargeSession] = []
+        added: list[ChargeSession] = []
+        for raw in history:
+            if not isinstance(raw, dict):
+                continue
+            key = _session_key(raw)
+            session = known.get(key)
+            if session is None:
+                session = parse_session(device_id, raw, key)
+                known[key] = session
+                added.append(session)
+            sessions.append(session)
+
+        if added or len(sessions) != len(self._sessions.get(device_id, ())):
+            self._versions[device_id] = self._versions.get(device_id, 0) + 1
+        sessions.sort(key=_start_of)
+        self._sessions[device_id] = sessions
+        self._starts[device_id] = [s.start for s in sessions]
+        return added
+
+    def restore_device(self, device_id: str, sessions: list[ChargeSession]) -> None:
+        """Seed a station's sessions, e.g. from the startup snapshot.
+
+        Raw sessions fetched later with the same keys are not parsed or
+        reported as added again.
+        """
+        sessions = sorted(sessions, key=_start_of)
+        self._sessions[device_id] = sessions
+        self._starts[device_id] = [s.start for s in sessions]
+        self._versions[device_id] = self._versions.get(device_id, 0) + 1
+
+    def remove_device(self, device_id: str) -> None:
+        """Drop all sessions for a station."""
+        self._sessions.pop(device_id, None)
+        self._starts.pop(device_id, None)
+        self._versions[device_id] = self._versions.get(device_id, 0) + 1
+
+    def version(self, device_id: str) -> int:
+        """Return a counter that changes whenever a station's sessions change."""
+        return self._versions.get(device_id, 0)
+
+    def device_ids(self) -> list[str]:
+        """Return the stations that have indexed sessions."""
+        return list(self._sessions)
+
+    def sessions(self, device_id: str) -> list[ChargeSession]:
+        """Return a station's sessions, oldest first."""
+        return self._sessions.get(device_id, [])
+
+    def recent(self, device_id: str, count: int) -> list[ChargeSession]:
+        """Return up to *count* of a station's sessions, newest first."""
+        sessions = self._sessions.get(device_id, [])
+        return sessions[: -count - 1 : -1] if count > 0 else []
+
+    def query(
+        self,
+        device_ids: Iterable[str] | None = None,
+        start: float | None = None,
+        end: float | None = None,
+        tou_period: str | None = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> tuple[int, list[ChargeSession]]:
+        """Return (total matches, one page of sessions) newest first.
+
+        *start* is inclusive and *end* exclusive, both Unix seconds.
+        """
+        ids = self._sessions.keys() if device_ids is None else device_ids
+        streams = []
+        total = 0
+        for device_id in ids:
+            starts = self._starts.get(device_id)
+            if not starts:
+                continue
+            lo = bisect_left(starts, start) if start is not None else 0
+            hi = bisect_left(starts, end) if end is not None else len(starts)
+            if hi <= lo:
+                continue
+            total += hi - lo
+            # Bind this station's list now; the merge runs after the loop
+            streams.append(
+                map(self._sessions[device_id].__getitem__, range(hi - 1, lo - 1, -1))
+            )
+
+        merged = heapq.merge(*streams, key=_start_of, reverse=True)
+        if tou_period is None:
+            page = []
+            for position, session in enumerate(merged):
+                if position >= offset + limit:
+                    break
+                if position >= offset:
+                    page.append(session)
+            return total, page
+
+        total = 0
+        page = []
+        for session in merged:
+            if session.tou_period != tou_period:
+                continue
+            if offset <= total < offset + limit:
+                page.append(session)
+            total += 1
+        return total, page
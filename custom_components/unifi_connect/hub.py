@@ -1,11 +1,39 @@
+import asyncio
+import logging
+import time
+
+from homeassistant.const import Platform
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers import device_registry as dr
 
 from .api import UnifiConnectAPI
+from .capabilities import DeviceCapabilities, required_platforms
 from .coordinator import UnifiConnectCoordinator
-from .const import DEFAULT_PORT, CONTROLLER_UDMP
+from .loadbalance import LoadBalancer
+from .metrics import PhaseTimer
+from .model import UnifiDevice
+from .pipeline import ActionWritePipeline
+from .const import (
+    CONF_FEEDER_CURRENT,
+    CONF_LOAD_BALANCING,
+    CONF_MIN_CURRENT,
+    CONF_TRACE,
+    CONTROLLER_UDMP,
+    DEFAULT_FEEDER_CURRENT,
+    DEFAULT_MIN_CURRENT,
+    DEFAULT_PORT,
+    DOMAIN,
+    WATCH_POWER,
+)
+from .snapshot import DeviceSnapshotStore
+from .stats_import import ChargeStatisticsImporter
+from .tracing import JsonLinesExporter
+from .transport import ConsoleTransport
 from .websocket import UnifiConnectWebSocket
 
+_LOGGER = logging.getLogger(__name__)
+
 
 class UnifiConnectHub:
     """Manages connection and data coordination with UniFi Connect."""
@@ -13,8 +41,17 @@ class UnifiConnectHub:
     def __init__(self, hass, entry):
         self.hass = hass
         self.entry = entry
+        # Per-phase setup timings (login, devices, platforms, history, ...)
+        self.startup = PhaseTimer()
+        self._websocket_started_at: float | None = None
+        # Platforms forwarded so far; more are added as new device kinds appear
+        self.loaded_platforms: set[Platform] = set()
+        self._platforms_lock = asyncio.Lock()
+        self._unsub_platforms = lambda: None
 
-        session = async_create_clientsession(hass, verify_ssl=False)
+        # Pooled, keep-alive connections shared by REST and the WebSocket
+        self.transport = ConsoleTransport()
+        session = self.transport.session
         self.api = UnifiConnectAPI(
             host=entry.data["host"],
             username=entry.data["username"],
@@ -24,27 +61,228 @@ class UnifiConnectHub:
             session=session,
         )
 
+        if entry.options.get(CONF_TRACE):
+            trace_path = hass.config.path(f"{DOMAIN}_trace_{entry.entry_id}.jsonl")
+            self.api.tracer.start(hass, JsonLinesExporter(trace_path))
+
         self.coordinator = UnifiConnectCoordinator(hass=hass, api=self.api)
+        self._write_pipelines: dict[tuple[str, str], ActionWritePipeline] = {}
+
+        # Last-known devices and history, restored for instant startup
+        self.snapshot = DeviceSnapshotStore(hass, entry.entry_id, self.coordinator)
+        self._unsub_snapshot = lambda: None
+        self._connect_task: asyncio.Task | None = None
+
+        # Long-term statistics backfill, fed by newly indexed sessions
+        self.statistics = ChargeStatisticsImporter(
+            hass, entry.entry_id, self.coordinator.history_index
+        )
+        self._unsub_history = self.coordinator.async_add_history_listener(
+            self._handle_new_sessions
+        )
+        self._unsub_removal = self.coordinator.async_add_removal_listener(
+            self._handle_removed_device
+        )
+
+        # Optional dynamic load balancing, driven by WebSocket power pushes
+        self.load_balancer: LoadBalancer | None = None
+        if entry.options.get(CONF_LOAD_BALANCING):
+            self.load_balancer = LoadBalancer(
+                hass,
+                self,
+                budget=entry.options.get(CONF_FEEDER_CURRENT, DEFAULT_FEEDER_CURRENT),
+                min_current=entry.options.get(CONF_MIN_CURRENT, DEFAULT_MIN_CURRENT),
+            )
 
         # WebSocket for real-time EV power data
-        # Pass a cookie getter so the WS can authenticate even when the
-        # session cookie jar drops cookies for bare IP addresses.
         self.websocket = UnifiConnectWebSocket(
             host=entry.data["host"],
             session=session,
             controller_type=entry.data.get("controller_type", CONTROLLER_UDMP),
-            get_cookies=lambda: self.api._cookies,
+            on_power_stats=self._handle_power_stats,
+            on_device_updated=self.coordinator.async_device_updated,
+            breaker=self.api.breaker,
         )
 
     async def async_initialize(self):
-        """Log in, fetch initial data, and start the WebSocket listener."""
-        if not await self.api.login():
-            raise ConfigEntryNotReady("Unable to log in to UniFi Connect")
-        await self.coordinator.async_config_entry_first_refresh()
+        """Load enough state for platforms to be set up.
+
+        With a cached snapshot nothing touches the network here.
+        Otherwise login (overlapped with a connection warm-up) and the
+        device list are awaited, with the WebSocket connecting alongside
+        the device fetch.  Power stats and history always wait for
+        ``async_start_background``.  On failure the hub is shut down
+        before the error propagates.
+        """
+        try:
+            with self.startup.phase("restore"):
+                await self.statistics.async_load()
+                restored = await self.snapshot.async_restore()
+            if restored:
+                self._async_start_local()
+                return
+
+            if not await self._async_login():
+                raise ConfigEntryNotReady("Unable to log in to UniFi Connect")
+            await self._async_start_websocket()
+            with self.startup.phase("devices"):
+                await self.coordinator.async_config_entry_first_refresh()
+            self._async_start_local()
+        except BaseException:
+            # Setup is retried with a new hub; stop the WebSocket and tracer
+            await self.async_shutdown()
+            raise
+
+    @property
+    def console_device_id(self) -> str:
+        """Identifier of the pseudo device holding the hub's own sensors."""
+        return f"{self.entry.entry_id}_console"
+
+    def _device_capabilities(self) -> list[DeviceCapabilities]:
+        """Capabilities of the devices currently known to the coordinator."""
+        return [device.capabilities for device in self.coordinator.devices.values()]
+
+    def _required_platforms(self) -> list[Platform]:
+        """Platforms the current devices need, plus sensor for the hub's own."""
+        needed = required_platforms(self._device_capabilities())
+        if Platform.SENSOR not in needed:
+            needed.append(Platform.SENSOR)
+        return needed
+
+    async def async_forward_platforms(self) -> None:
+        """Forward the platforms the current devices need that aren't loaded yet."""
+        async with self._platforms_lock:
+            missing = [
+                platform
+                for platform in self._required_platforms()
+                if platform not in self.loaded_platforms
+            ]
+            if not missing:
+                return
+            _LOGGER.debug("Setting up platforms: %s", missing)
+            self.loaded_platforms.update(missing)
+            await self.hass.config_entries.async_forward_entry_setups(self.entry, missing)
 
-        # Start WebSocket for real-time power data
+    @callback
+    def _async_check_platforms(self) -> None:
+        """After a refresh, add platforms needed by newly discovered device kinds."""
+        needed = self._required_platforms()
+        if not self.loaded_platforms.issuperset(needed):
+            self.hass.async_create_background_task(
+                self.async_forward_platforms(), f"{DOMAIN} add platforms"
+            )
+
+    @callback
+    def async_start_background(self) -> None:
+        """Finish startup in the background once platforms are set up."""
+        self._unsub_platforms = self.coordinator.async_add_listener(
+            self._async_check_platforms
+        )
+        self._connect_task = self.hass.async_create_background_task(
+            self._async_finish_startup(), f"{DOMAIN} startup"
+        )
+
+    async def _async_login(self) -> bool:
+        """Log in while warming up a second pooled connection."""
+        with self.startup.phase("login"):
+            logged_in, _ = await asyncio.gather(
+                self.api.login(), self.api.async_warm_up()
+            )
+        return logged_in
+
+    async def _async_start_websocket(self) -> None:
+        """Start the WebSocket as soon as login cookies exist."""
+        self._websocket_started_at = time.monotonic()
         await self.websocket.start()
 
+    async def _async_finish_startup(self) -> None:
+        """Connect after a cached start, then sync history and start balancing."""
+        if self._websocket_started_at is None:
+            if not await self._async_login():
+                _LOGGER.warning(
+                    "Unable to log in to UniFi Connect, showing cached state until it recovers"
+                )
+            await self._async_start_websocket()
+            with self.startup.phase("devices"):
+                await self.coordinator.async_refresh()
+        with self.startup.phase("history"):
+            await self.coordinator.async_sync_history()
+        if self.load_balancer:
+            self.load_balancer.async_start()
+        if self.websocket.first_connected_at is not None:
+            self.startup.mark(
+                "websocket", self._websocket_started_at, self.websocket.first_connected_at
+            )
+        _LOGGER.info("Startup timings: %s", self.startup.as_dict())
+
+    def _async_start_local(self) -> None:
+        """Start the rollup schedule and snapshot saving once data is loaded."""
+        self.coordinator.rollup.async_start()
+        self._unsub_snapshot = self.coordinator.async_add_listener(
+            self.snapshot.async_schedule_save
+        )
+
     async def async_shutdown(self):
-        """Stop WebSocket listener on unload."""
-        await self.websocket.stop()
+        """Stop WebSocket listener, rollup schedule and statistics import on unload.
+
+        Also runs when ``async_initialize`` fails; the transport is closed
+        even if an earlier step raises.
+        """
+        try:
+            self._unsub_history()
+            self._unsub_removal()
+            self._unsub_snapshot()
+            self._unsub_platforms()
+            if self._connect_task and not self._connect_task.done():
+                self._connect_task.cancel()
+                try:
+                    await self._connect_task
+                except asyncio.CancelledError:
+                    pass
+            if self.load_balancer:
+                self.load_balancer.async_stop()
+            self.coordinator.rollup.async_stop()
+            await self.websocket.stop()
+            await self.statistics.async_shutdown()
+            await self.snapshot.async_flush()
+            for pipeline in self._write_pipelines.values():
+                await pipeline.async_cancel()
+            self.api.tracer.stop()
+        finally:
+            await self.transport.async_close()
+
+    def write_pipeline(self, device_id: str, action_name: str) -> ActionWritePipeline:
+        """Return the coalescing write pipeline for a (device, action) pair."""
+        key = (device_id, action_name)
+        pipeline = self._write_pipelines.get(key)
+        if pipeline is None:
+            pipeline = ActionWritePipeline(self.hass, self.api, device_id, action_name)
+            self._write_pipelines[key] = pipeline
+        return pipeline
+
+    def _handle_new_sessions(self, devices: list[UnifiDevice]) -> None:
+        """Queue a background statistics import for newly indexed sessions."""
+        self.statistics.async_schedule({d.id: d.name for d in devices})
+
+    def _handle_removed_device(self, device_id: str) -> None:
+        """Forget a device the console no longer reports and delete its entities."""
+        self.websocket.power_data.pop(device_id, None)
+        if self.load_balancer:
+            self.load_balancer.async_forget(device_id)
+        for key in [key for key in self._write_pipelines if key[0] == device_id]:
+            self.hass.async_create_task(self._write_pipelines.pop(key).async_cancel())
+
+        # Dropping the registry device removes its entities along with it
+        registry = dr.async_get(self.hass)
+        device = registry.async_get_device(identifiers={(DOMAIN, device_id)})
+        if device is not None:
+            registry.async_update_device(
+                device.id, remove_config_entry_id=self.entry.entry_id
+            )
+
+    def _handle_power_stats(self, device_id: str, power_data: dict) -> None:
+        """Push live power data to its sensors and the period rollups."""
+        self.coordinator.rollup.async_update_live(device_id, power_data)
+        if self.load_balancer:
+            self.load_balancer.async_update(device_id, power_data)
+        self.coordinator.async_notify_keys({(device_id, WATCH_POWER)})
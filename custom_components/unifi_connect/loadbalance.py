@@ -0,0 +1,417 @@
+"""Push-driven load balancing for EV stations sharing one feeder.
+
+Live ``instantA`` readings arrive over the WebSocket.  Each push (batched
+over a short settle time) re-runs the allocation below and writes
+``set_max_output_amp`` to the stations whose target moved:
+
+* Idle stations keep the per-station minimum reserved so a car can start.
+* Charging stations share the rest of the budget by water-filling; a car
+  drawing well below its limit only asks for its draw plus headroom, so
+  the surplus goes to the others.
+* Lowered limits are sent straight to the console and awaited before
+  anything is raised, so the committed limits never exceed the budget.
+  Raises need at least the hysteresis margin and are rate-limited per
+  station.  Only one round of writes is in flight at a time.
+* Each station's limit is re-read from its shadow, so failed writes and
+  manual changes to Maximum Output are picked up.
+* If the WebSocket drops or any station's telemetry goes stale, every
+  station falls back to a fixed share of the budget.
+* Stations are never offered less than their own minimum output.  If
+  the budget can't cover every station's minimum, charging stations are
+  served first and charging is paused on the rest (``disable_charging``)
+  until current frees up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import (
+    DEFAULT_REFRESH_INTERVAL,
+    DOMAIN,
+    EV_ACTION_DISABLE_CHARGING,
+    EV_ACTION_ENABLE_CHARGING,
+    EV_ACTION_SET_MAX_OUTPUT,
+    LOAD_BALANCE_HYSTERESIS,
+    LOAD_BALANCE_RAISE_INTERVAL,
+    LOAD_BALANCE_SETTLE,
+    LOAD_BALANCE_STALE_AFTER,
+)
+from .model import UnifiDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+ACTION_SET_MAX_OUTPUT = "set_max_output_amp"
+ACTION_ENABLE_CHARGING = "enable_charging"
+ACTION_DISABLE_CHARGING = "disable_charging"
+# Draw (A) above which a station counts as charging
+ACTIVE_CURRENT = 1.0
+# Extra current (A) offered above a self-limiting car's draw
+DRAW_HEADROOM = 2.0
+# Station range (A) when featureFlags.maxOutput has none
+DEFAULT_STATION_MIN = 6
+DEFAULT_STATION_MAX = 40
+# Seconds our own write is trusted over a shadow that may predate it
+SHADOW_SETTLE = DEFAULT_REFRESH_INTERVAL
+
+
+def _allocate(budget: float, bounds: dict[str, tuple[float, float]]) -> dict[str, int]:
+    """Water-fill *budget* across stations given {id: (low, high)} bounds.
+
+    Every station gets its low bound; the remainder is shared equally,
+    with stations that hit their high bound passing their share on.
+    The low bounds must fit in the budget.  Results are floored to whole
+    amps.
+    """
+    alloc = {device_id: low for device_id, (low, _high) in bounds.items()}
+    remaining = budget - sum(alloc.values())
+    room = {
+        device_id: high - low for device_id, (low, high) in bounds.items() if high > low
+    }
+    while room and remaining > 1e-6:
+        share = remaining / len(room)
+        for device_id, free in list(room.items()):
+            give = min(share, free)
+            alloc[device_id] += give
+            remaining -= give
+            if free - give <= 1e-6:
+                del room[device_id]
+            else:
+                room[device_id] = free - give
+    return {device_id: int(amps) for device_id, amps in alloc.items()}
+
+
+class LoadBalancer:
+    """Keeps the stations on one hub within a shared current budget."""
+
+    def __init__(
+        self, hass: HomeAssistant, hub: Any, budget: float, min_current: float
+    ) -> None:
+        self.hass = hass
+        self._hub = hub
+        self.budget = budget
+        self.min_current = min_current
+        self._telemetry_at: dict[str, float] = {}
+        # Limit per station, from the shadow or our last successful write
+        self._limits: dict[str, int] = {}
+        self._written_at: dict[str, float] = {}
+        self._raised_at: dict[str, float] = {}
+        self._started_at = 0.0
+        self._fallback = False
+        # Stations the budget can't cover, and those we paused charging on
+        self._unserved: set[str] = set()
+        self._paused: set[str] = set()
+        self._unsub_tick: CALLBACK_TYPE | None = None
+        self._unsub_settle: CALLBACK_TYPE | None = None
+        self._task: asyncio.Task | None = None
+        self._rerun = False
+
+    @callback
+    def async_start(self) -> None:
+        """Start the watchdog tick that catches stale telemetry."""
+        self._started_at = time.monotonic()
+        self._unsub_tick = async_track_time_interval(
+            self.hass,
+            self._async_tick,
+            timedelta(seconds=LOAD_BALANCE_STALE_AFTER / 3),
+        )
+        _LOGGER.info(
+            "Load balancing %d A across EV stations (minimum %d A each)",
+            self.budget,
+            self.min_current,
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the tick, any pending evaluation and writes in flight."""
+        for unsub in (self._unsub_tick, self._unsub_settle):
+            if unsub:
+                unsub()
+        self._unsub_tick = self._unsub_settle = None
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    @callback
+    def async_update(self, device_id: str, power_data: dict[str, Any]) -> None:
+        """Record a telemetry push and schedule a (batched) evaluation."""
+        self._telemetry_at[device_id] = time.monotonic()
+        if self._unsub_settle is None and self._unsub_tick is not None:
+            self._unsub_settle = async_call_later(
+                self.hass, LOAD_BALANCE_SETTLE, self._async_settled
+            )
+
+    @callback
+    def async_forget(self, device_id: str) -> None:
+        """Drop the state kept for a station that was removed."""
+        self._telemetry_at.pop(device_id, None)
+        self._limits.pop(device_id, None)
+        self._written_at.pop(device_id, None)
+        self._raised_at.pop(device_id, None)
+        self._unserved.discard(device_id)
+        self._paused.discard(device_id)
+
+    @callback
+    def _async_settled(self, _now: Any) -> None:
+        self._unsub_settle = None
+        self._async_evaluate()
+
+    @callback
+    def _async_tick(self, _now: Any) -> None:
+        self._async_evaluate()
+
+    def _stations(self) -> dict[str, UnifiDevice]:
+        return {
+            device_id: device
+            for device_id, device in self._hub.coordinator.devices.items()
+            if device.is_ev
+        }
+
+    def _is_stale(self, device_ids: list[str], now: float) -> bool:
+        """Return True if live telemetry can't be trusted for every station."""
+        if not self._hub.websocket.connected:
+            return True
+        if now - self._started_at < LOAD_BALANCE_STALE_AFTER:
+            # Give every station a chance to report after startup
+            return any(
+                now - self._telemetry_at[device_id] > LOAD_BALANCE_STALE_AFTER
+                for device_id in device_ids
+                if device_id in self._telemetry_at
+            )
+        return any(
+            now - self._telemetry_at.get(device_id, 0.0) > LOAD_BALANCE_STALE_AFTER
+            for device_id in device_ids
+        )
+
+    def _served(
+        self, lows: dict[str, float], charging: set[str]
+    ) -> set[str]:
+        """Return the stations the budget can give their minimum current.
+
+        When it can't cover all of them, charging stations come first and
+        charging is paused on the rest until enough current frees up.
+        """
+        ordered = sorted(
+            lows, key=lambda device_id: (device_id not in charging, device_id)
+        )
+        served: set[str] = set()
+        committed = 0.0
+        for device_id in ordered:
+            if committed + lows[device_id] > self.budget:
+                break
+            committed += lows[device_id]
+            served.add(device_id)
+        unserved = set(lows) - served
+        if unserved != self._unserved:
+            if unserved:
+                _LOGGER.warning(
+                    "%d A does not cover the minimum for all %d EV stations; "
+                    "pausing charging on %s",
+                    self.budget,
+                    len(lows),
+                    ", ".join(sorted(unserved)),
+                )
+            else:
+                _LOGGER.info("Every EV station fits in the budget again")
+            self._unserved = unserved
+        return served
+
+    @callback
+    def _async_evaluate(self) -> None:
+        """Run an evaluation, or queue one behind the writes in flight."""
+        if self._task is not None and not self._task.done():
+            self._rerun = True
+            return
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} load balancing"
+        )
+
+    async def _async_run(self) -> None:
+        self._rerun = True
+        while self._rerun:
+            self._rerun = False
+            now = time.monotonic()
+            if (evaluated := self._evaluate(now)) is not None:
+                targets, unserved, stale = evaluated
+                await self._async_apply(targets, unserved, force=stale, now=now)
+
+    def _evaluate(
+        self, now: float
+    ) -> tuple[dict[str, int], set[str], bool] | None:
+        """Return the served stations' limits, the unserved ones and staleness."""
+        stations = self._stations()
+        if not stations:
+            return None
+        power_data = self._hub.websocket.power_data
+
+        station_max: dict[str, int] = {}
+        lows: dict[str, float] = {}
+        for device_id, device in stations.items():
+            feature = device.feature_flags.get("maxOutput")
+            if not isinstance(feature, dict):
+                feature = {}
+            station_max[device_id] = feature.get("max", DEFAULT_STATION_MAX)
+            # Never offer less than the station accepts
+            lows[device_id] = min(
+                max(self.min_current, feature.get("min", DEFAULT_STATION_MIN)),
+                station_max[device_id],
+            )
+            current = device.shadow.get("maxOutput")
+            if isinstance(current, (int, float)):
+                if now - self._written_at.get(device_id, -SHADOW_SETTLE) >= SHADOW_SETTLE:
+                    self._limits[device_id] = int(current)
+            elif device_id not in self._limits:
+                self._limits[device_id] = station_max[device_id]
+
+        draws: dict[str, float] = {}
+        for device_id in stations:
+            draw = power_data.get(device_id, {}).get("instantA")
+            if isinstance(draw, (int, float)) and draw >= ACTIVE_CURRENT:
+                draws[device_id] = draw
+        served = self._served(lows, set(draws))
+
+        stale = self._is_stale(list(stations), now)
+        if stale != self._fallback:
+            self._fallback = stale
+            if stale:
+                _LOGGER.warning(
+                    "EV telemetry is stale; falling back to equal shares of %d A",
+                    self.budget,
+                )
+            else:
+                _LOGGER.info("EV telemetry recovered; resuming dynamic load balancing")
+
+        if stale:
+            targets = _allocate(
+                self.budget,
+                {device_id: (lows[device_id], station_max[device_id]) for device_id in served},
+            )
+        else:
+            bounds: dict[str, tuple[float, float]] = {}
+            for device_id in served:
+                high = station_max[device_id]
+                low = lows[device_id]
+                draw = draws.get(device_id)
+                if draw is None:
+                    bounds[device_id] = (low, low)
+                    continue
+                if draw < self._limits[device_id] - DRAW_HEADROOM:
+                    # Car is limiting itself below what we offered
+                    high = min(high, max(low, draw + DRAW_HEADROOM))
+                bounds[device_id] = (low, high)
+            targets = _allocate(self.budget, bounds)
+
+        return targets, set(stations) - served, stale
+
+    def _committed(self, device_id: str) -> int:
+        """Current a station may draw: its limit, or nothing while paused."""
+        return 0 if device_id in self._paused else self._limits[device_id]
+
+    async def _async_apply(
+        self, targets: dict[str, int], unserved: set[str], force: bool, now: float
+    ) -> None:
+        """Pause and lower first and wait for that, then resume and raise."""
+        pauses = unserved - self._paused
+        if pauses:
+            await asyncio.gather(
+                *(self._async_set_charging(device_id, False) for device_id in pauses)
+            )
+
+        stations = [*targets, *unserved]
+        over_budget = sum(map(self._committed, stations)) > self.budget
+        lowers = [
+            (device_id, target)
+            for device_id, target in targets.items()
+            if device_id not in self._paused
+            and target < self._limits[device_id]
+            and (
+                force
+                or over_budget
+                or self._limits[device_id] - target >= LOAD_BALANCE_HYSTERESIS
+            )
+        ]
+        if lowers:
+            await asyncio.gather(
+                *(self._async_write(device_id, amps) for device_id, amps in lowers)
+            )
+
+        # A failed pause or lower keeps its current and shrinks the headroom
+        headroom = self.budget - sum(map(self._committed, stations))
+        for device_id, target in targets.items():
+            if device_id not in self._paused or target > headroom:
+                continue
+            # Set the limit while still paused, then let the car draw it
+            if self._limits[device_id] != target:
+                await self._async_write(device_id, target)
+                if self._limits[device_id] != target:
+                    continue
+            if await self._async_set_charging(device_id, True):
+                headroom -= target
+
+        raises: list[tuple[str, int]] = []
+        for device_id, target in targets.items():
+            if device_id in self._paused:
+                continue
+            limit = self._limits[device_id]
+            if target - limit < (1 if force else LOAD_BALANCE_HYSTERESIS):
+                continue
+            raised_at = self._raised_at.get(device_id, 0.0)
+            if not force and now - raised_at < LOAD_BALANCE_RAISE_INTERVAL:
+                continue
+            raised = int(min(target, limit + headroom))
+            if raised <= limit:
+                continue
+            headroom -= raised - limit
+            self._raised_at[device_id] = now
+            raises.append((device_id, raised))
+        if raises:
+            await asyncio.gather(
+                *(self._async_write(device_id, amps) for device_id, amps in raises)
+            )
+
+    async def _async_write(self, device_id: str, amps: int) -> None:
+        """Send a limit and record it once the console has accepted it."""
+        _LOGGER.debug(
+            "Load balancer: %s max output %s -> %s A",
+            device_id,
+            self._limits[device_id],
+            amps,
+        )
+        actions = self._hub.coordinator.action_table(device_id)
+        if await self._hub.api.perform_action(
+            device_id,
+            actions.action_id(ACTION_SET_MAX_OUTPUT, EV_ACTION_SET_MAX_OUTPUT),
+            ACTION_SET_MAX_OUTPUT,
+            {actions.arg_key(ACTION_SET_MAX_OUTPUT, "maxOutput"): amps},
+        ):
+            self._limits[device_id] = amps
+            self._written_at[device_id] = time.monotonic()
+        else:
+            _LOGGER.warning(
+                "Load balancer failed to set %s max output to %s A", device_id, amps
+            )
+
+    async def _async_set_charging(self, device_id: str, enabled: bool) -> bool:
+        """Resume or pause charging and track the stations we paused."""
+        if enabled:
+            action_name, fallback = ACTION_ENABLE_CHARGING, EV_ACTION_ENABLE_CHARGING
+        else:
+            action_name, fallback = ACTION_DISABLE_CHARGING, EV_ACTION_DISABLE_CHARGING
+        actions = self._hub.coordinator.action_table(device_id)
+        if not await self._hub.api.perform_action(
+            device_id, actions.action_id(action_name, fallback), action_name
+        ):
+            _LOGGER.warning("Load balancer failed to %s on %s", action_name, device_id)
+            return False
+        if enabled:
+            self._paused.discard(device_id)
+        else:
+            self._paused.add(device_id)
+        return True
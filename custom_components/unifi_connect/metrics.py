@@ -0,0 +1,220 @@
+"""Lightweight in-memory latency metrics.
+
+Each named series keeps running totals plus a bounded window of recent
+samples, so percentiles stay cheap and memory stays flat no matter how
+long Home Assistant runs.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .tracing import Tracer
+
+# Recent samples kept per series for percentiles
+WINDOW_SIZE = 256
+
+
+class LatencySamples:
+    """Running count/total/max and a window of recent samples (seconds)."""
+
+    __slots__ = ("count", "total", "max", "last", "_recent")
+
+    def __init__(self, window: int = WINDOW_SIZE) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last: float | None = None
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        """Record one sample."""
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.last = seconds
+        self._recent.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the *pct* percentile (0-100) of the recent window."""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+        return ordered[index]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarise the series in milliseconds."""
+        if not self.count:
+            return {"count": 0}
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 1),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "max_ms": round(self.max * 1000, 1),
+        }
+
+
+class LatencyRecorder:
+    """A set of named ``LatencySamples`` series."""
+
+    def __init__(self, window: int = WINDOW_SIZE) -> None:
+        self._window = window
+        self._series: dict[str, LatencySamples] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add a sample to the named series, creating it on first use."""
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = LatencySamples(self._window)
+        series.add(seconds)
+
+    def get(self, name: str) -> LatencySamples | None:
+        """Return a series, or None if nothing was recorded under *name*."""
+        return self._series.get(name)
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Summarise every series."""
+        return {name: series.as_dict() for name, series in sorted(self._series.items())}
+
+
+class EndpointMetrics:
+    """Latency, response size and error counts per API endpoint."""
+
+    def __init__(self, window: int = WINDOW_SIZE) -> None:
+        self.latency = LatencyRecorder(window)
+        # Endpoint -> [responses, total bytes, max bytes]
+        self._sizes: dict[str, list[int]] = {}
+        self._errors: dict[str, Counter[str]] = {}
+
+    def record(self, endpoint: str, seconds: float, size: int) -> None:
+        """Record a response that came back in *seconds* with *size* bytes."""
+        self.latency.record(endpoint, seconds)
+        sizes = self._sizes.get(endpoint)
+        if sizes is None:
+            sizes = self._sizes[endpoint] = [0, 0, 0]
+        sizes[0] += 1
+        sizes[1] += size
+        if size > sizes[2]:
+            sizes[2] = size
+
+    def record_error(self, endpoint: str, kind: str) -> None:
+        """Count an error (a status code, ``timeout``, ``connection``, ...)."""
+        errors = self._errors.get(endpoint)
+        if errors is None:
+            errors = self._errors[endpoint] = Counter()
+        errors[kind] += 1
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Summarise every endpoint."""
+        summary: dict[str, dict[str, Any]] = {}
+        for endpoint in sorted(self._sizes.keys() | self._errors.keys()):
+            series = self.latency.get(endpoint)
+            item = series.as_dict() if series else {"count": 0}
+            if sizes := self._sizes.get(endpoint):
+                item["bytes_mean"] = round(sizes[1] / sizes[0])
+                item["bytes_max"] = sizes[2]
+                item["bytes_total"] = sizes[1]
+            item["errors"] = dict(self._errors.get(endpoint, {}))
+            summary[endpoint] = item
+        return summary
+
+
+class RateWindow:
+    """Events and bytes per second over the last *window* seconds.
+
+    Counts are kept in one-second buckets, so memory stays bounded at
+    any message rate.
+    """
+
+    def __init__(self, window: int = 60) -> None:
+        self._window = window
+        # [second, events, bytes], oldest first
+        self._buckets: deque[list[int]] = deque()
+
+    def add(self, size: int = 0, now: float | None = None) -> None:
+        """Count one event of *size* bytes."""
+        second = int(time.monotonic() if now is None else now)
+        if self._buckets and self._buckets[-1][0] == second:
+            bucket = self._buckets[-1]
+            bucket[1] += 1
+            bucket[2] += size
+        else:
+            self._buckets.append([second, 1, size])
+        self._prune(second)
+
+    def _prune(self, second: int) -> None:
+        while self._buckets and self._buckets[0][0] <= second - self._window:
+            self._buckets.popleft()
+
+    def rates(self, now: float | None = None) -> tuple[float, float]:
+        """Return (events per second, bytes per second)."""
+        self._prune(int(time.monotonic() if now is None else now))
+        events = sum(bucket[1] for bucket in self._buckets)
+        size = sum(bucket[2] for bucket in self._buckets)
+        return events / self._window, size / self._window
+
+
+class PhaseTimer:
+    """Start offset and duration of named phases, relative to creation.
+
+    With a *tracer*, each phase is also a span of the current trace.
+    """
+
+    def __init__(self, tracer: Tracer | None = None) -> None:
+        self._origin = time.monotonic()
+        self._phases: dict[str, tuple[float, float]] = {}
+        self._tracer = tracer
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the body of a ``with`` block as phase *name*."""
+        started = time.monotonic()
+        try:
+            if self._tracer is None:
+                yield
+            else:
+                with self._tracer.span(name, start_trace=False):
+                    yield
+        finally:
+            self.mark(name, started, time.monotonic())
+
+    def mark(self, name: str, started: float, ended: float) -> None:
+        """Record a phase from two ``time.monotonic()`` values."""
+        self._phases[name] = (started - self._origin, ended - started)
+
+    def duration(self, name: str) -> float | None:
+        """Seconds phase *name* took, or None if it didn't run."""
+        phase = self._phases.get(name)
+        return phase[1] if phase else None
+
+    @property
+    def total(self) -> float:
+        """Seconds from creation to the end of the last phase."""
+        return max(
+            (offset + duration for offset, duration in self._phases.values()), default=0.0
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Phases in start order, in milliseconds, plus the overall span."""
+        phases = sorted(self._phases.items(), key=lambda item: item[1][0])
+        total = self.total
+        return {
+            "phases": {
+                name: {
+                    "start_ms": round(offset * 1000),
+                    "duration_ms": round(duration * 1000),
+                }
+                for name, (offset, duration) in phases
+            },
+            "total_ms": round(total * 1000),
+        }
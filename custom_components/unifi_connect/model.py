@@ -0,0 +1,134 @@
+"""Parsed device model.
+
+Raw device dicts from the API are parsed once per refresh into slotted
+``UnifiDevice`` objects.  A device whose raw data did not change keeps
+its previous object, so change detection between refreshes is an
+identity check, and classification and the action table are carried
+over rather than recomputed.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+from typing import Any
+
+from .actions import ActionTable
+from .capabilities import DeviceCapabilities, classify_device
+
+_LOGGER = logging.getLogger(__name__)
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def _section(value: Any) -> Mapping[str, Any]:
+    """Read-only view of a nested dict section ({} if missing or malformed)."""
+    return MappingProxyType(value) if isinstance(value, dict) else _EMPTY
+
+
+class UnifiDevice:
+    """One device, parsed from its raw API dict.
+
+    Nested sections are exposed as read-only views of the raw data.
+    Equality compares the raw data (short-circuiting on identity); the
+    hash only covers fields that never differ between equal devices.
+    """
+
+    __slots__ = (
+        "raw",
+        "id",
+        "name",
+        "mac",
+        "platform",
+        "model",
+        "firmware",
+        "shadow",
+        "relay_shadow",
+        "extra_info",
+        "feature_flags",
+        "capabilities",
+        "actions",
+        "_hash",
+    )
+
+    def __init__(self, raw: dict[str, Any], previous: UnifiDevice | None = None) -> None:
+        type_data = raw.get("type")
+        if not isinstance(type_data, dict):
+            type_data = {}
+        self.raw = raw
+        self.id: str = raw["id"]
+        self.name: str = raw.get("name") or f"UniFi Device {self.id}"
+        self.mac: str = (raw.get("mac") or "").upper()
+        self.platform: str | None = type_data.get("platform")
+        self.model: str = type_data.get("fullName", "Unknown")
+        self.firmware: str | None = raw.get("firmwareVersion")
+        self.shadow = _section(raw.get("shadow"))
+        self.relay_shadow = _section(raw.get("relayShadow"))
+        self.extra_info = _section(raw.get("extraInfo"))
+        self.feature_flags = _section(raw.get("featureFlags"))
+
+        # The action table is kept until the firmware or supported-action
+        # lists change, and classification with it once the device has
+        # been recognised; an unrecognised device is classified again
+        if previous is not None and previous.actions.matches(raw):
+            self.actions: ActionTable = previous.actions
+            caps = previous.capabilities
+            self.capabilities: DeviceCapabilities = (
+                caps if caps.is_ev or caps.is_display else classify_device(raw)
+            )
+        else:
+            if previous is not None:
+                _LOGGER.info(
+                    "Actions for %s changed (firmware %s -> %s), rebuilding lookup",
+                    self.name,
+                    previous.firmware,
+                    self.firmware,
+                )
+            self.actions = ActionTable(raw)
+            self.capabilities = classify_device(raw)
+        self._hash = hash((self.id, self.platform, self.firmware))
+
+    @property
+    def is_ev(self) -> bool:
+        """True for EV Stations."""
+        return self.capabilities.is_ev
+
+    @property
+    def is_display(self) -> bool:
+        """True for Display SE 21 devices."""
+        return self.capabilities.is_display
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a top-level raw field."""
+        return self.raw.get(key, default)
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, UnifiDevice):
+            return NotImplemented
+        return self.raw == other.raw
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"UnifiDevice({self.id!r}, {self.name!r}, {self.platform!r})"
+
+
+def parse_devices(
+    raws: Iterable[dict[str, Any]], previous: Mapping[str, UnifiDevice]
+) -> dict[str, UnifiDevice]:
+    """Parse a device list, reusing the previous object for unchanged devices."""
+    devices: dict[str, UnifiDevice] = {}
+    for raw in raws:
+        device_id = raw.get("id") if isinstance(raw, dict) else None
+        if not device_id:
+            continue
+        old = previous.get(device_id)
+        if old is not None and old.raw == raw:
+            devices[device_id] = old
+        else:
+            devices[device_id] = UnifiDevice(raw, old)
+    return devices
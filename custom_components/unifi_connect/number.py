@@ -5,14 +5,13 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .actions import resolve_action_id, get_action_arg_key
 from .const import (
-    DOMAIN, DEVICE_PLATFORM_SE21, ACTION_BRIGHTNESS, ACTION_VOLUME,
+    DOMAIN, SHADOW_KEY_PREFIX, ACTION_BRIGHTNESS, ACTION_VOLUME,
     EV_ACTION_SET_MAX_OUTPUT, EV_ACTION_BRIGHTNESS,
 )
-from .coordinator import _is_ev_device
-from .entity import UnifiConnectEntity
+from .entity import UnifiConnectEntity, async_setup_device_entities
 from .hub import UnifiConnectHub
+from .model import UnifiDevice
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,7 +39,7 @@ NUMBER_ENTITIES = [
     },
 ]
 
-# EV Station number entities - action IDs resolved dynamically at init
+# EV Station number entities - action IDs resolved dynamically at write time
 EV_NUMBER_ENTITIES = [
     {
         "shadow_key": "maxOutput",
@@ -77,56 +76,57 @@ async def async_setup_entry(
 ) -> None:
     """Set up UniFi Connect number entities from config entry."""
     hub: UnifiConnectHub = hass.data[DOMAIN][entry.entry_id]
-    entities: list[NumberEntity] = []
+    async_setup_device_entities(hub, async_add_entities, _device_entities)
+
 
-    for device in hub.coordinator.data or []:
-        platform = device.get("type", {}).get("platform")
+def _device_entities(hub: UnifiConnectHub, device: UnifiDevice) -> list[NumberEntity]:
+    """Build the number entities for one device."""
+    entities: list[NumberEntity] = []
 
-        # SE21 Display entities
-        if platform == DEVICE_PLATFORM_SE21:
-            features = device.get("featureFlags", {})
-            for config in NUMBER_ENTITIES:
-                if config["feature_key"] in features:
-                    entities.append(DisplayNumberSlider(hub, device, config))
+    # SE21 Display entities
+    if device.is_display:
+        features = device.feature_flags
+        for config in NUMBER_ENTITIES:
+            if config["feature_key"] in features:
+                entities.append(DisplayNumberSlider(hub, device, config))
 
-        # EV Station entities
-        if _is_ev_device(device):
-            shadow = device.get("shadow", {})
-            features = device.get("featureFlags", {})
-            for config in EV_NUMBER_ENTITIES:
-                if config["shadow_key"] in shadow:
-                    entities.append(EVNumberSlider(hub, device, config, features))
+    # EV Station entities
+    if device.is_ev:
+        shadow = device.shadow
+        features = device.feature_flags
+        for config in EV_NUMBER_ENTITIES:
+            if config["shadow_key"] in shadow:
+                entities.append(EVNumberSlider(hub, device, config, features))
 
-    async_add_entities(entities)
+    return entities
 
 
 class DisplayNumberSlider(UnifiConnectEntity, NumberEntity):
     """Configurable number slider for SE 21 controls."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict, config: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice, config: dict):
         super().__init__(hub, device, config["name_suffix"], config["unique_suffix"])
         self._shadow_key = config["shadow_key"]
+        self._watch(SHADOW_KEY_PREFIX + self._shadow_key)
         self._action_id = config["action_id"]
         self._action_name = config["action_name"]
 
-        feature_range = device.get("featureFlags", {}).get(config["feature_key"], {})
+        feature_range = device.feature_flags.get(config["feature_key"], {})
         self._attr_native_min_value = feature_range.get("min", config["default_min"])
         self._attr_native_max_value = feature_range.get("max", config["default_max"])
         self._attr_native_step = 1
         self._attr_mode = "slider"
 
-    @property
-    def native_value(self):
-        return self._get_shadow().get(self._shadow_key, 0)
+    def _update_state(self) -> None:
+        self._attr_native_value = self._get_shadow().get(self._shadow_key, 0)
 
     async def async_set_native_value(self, value: float):
-        await self._hub.api.perform_action(
-            self._device_id,
+        self._async_write_coalesced(
             self._action_id,
             self._action_name,
             {"value": int(value)},
+            optimistic={"_attr_native_value": int(value)},
         )
-        await self.coordinator.async_request_refresh()
 
 
 class EVNumberSlider(UnifiConnectEntity, NumberEntity):
@@ -136,29 +136,18 @@ class EVNumberSlider(UnifiConnectEntity, NumberEntity):
     firmware updates that change UUIDs.
     """
 
-    def __init__(self, hub: UnifiConnectHub, device: dict, config: dict, features: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice, config: dict, features: dict):
         super().__init__(hub, device, config["name_suffix"], config["unique_suffix"])
         self._shadow_key = config["shadow_key"]
+        self._watch(SHADOW_KEY_PREFIX + self._shadow_key)
         self._action_name = config["action_name"]
         self._attr_icon = config.get("icon")
         if config.get("unit"):
             self._attr_native_unit_of_measurement = config["unit"]
 
-        # Dynamically resolve action ID from device data
-        self._action_id = resolve_action_id(
-            device, config["action_name"], config.get("fallback_action_id")
-        )
-
-        # Dynamically resolve the arg key name from the action's JSON schema
-        dynamic_arg_key = get_action_arg_key(device, config["action_name"])
-        self._arg_key = dynamic_arg_key or config.get("fallback_arg_key", "value")
-
-        _LOGGER.debug(
-            "EV number '%s': action_id=%s, arg_key='%s'",
-            config["action_name"],
-            self._action_id,
-            self._arg_key,
-        )
+        # Action ID and arg key are resolved from the action table on write
+        self._fallback_action_id = config.get("fallback_action_id")
+        self._fallback_arg_key = config.get("fallback_arg_key", "value")
 
         # Use featureFlags for min/max if available, otherwise use defaults
         feature_range = features.get(config.get("feature_key", ""), {})
@@ -172,15 +161,14 @@ class EVNumberSlider(UnifiConnectEntity, NumberEntity):
         self._attr_native_step = config.get("step", 1)
         self._attr_mode = "slider"
 
-    @property
-    def native_value(self):
-        return self._get_shadow().get(self._shadow_key, 0)
+    def _update_state(self) -> None:
+        self._attr_native_value = self._get_shadow().get(self._shadow_key, 0)
 
     async def async_set_native_value(self, value: float):
-        await self._hub.api.perform_action(
-            self._device_id,
-            self._action_id,
+        actions = self._actions()
+        self._async_write_coalesced(
+            actions.action_id(self._action_name, self._fallback_action_id),
             self._action_name,
-            {self._arg_key: int(value)},
+            {actions.arg_key(self._action_name, self._fallback_arg_key): int(value)},
+            optimistic={"_attr_native_value": int(value)},
         )
-        await self.coordinator.async_request_refresh()
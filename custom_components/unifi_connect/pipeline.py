@@ -0,0 +1,107 @@
+"""Coalescing write pipeline for high-frequency control writes.
+
+Dragging a slider produces a burst of set-value calls.  Each
+(device, action) pair gets one ``ActionWritePipeline`` that waits for
+the burst to go quiet, sends only the newest value, keeps at most one
+request in flight, and reports once when everything has been written.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import UnifiConnectAPI
+from .const import DOMAIN, WRITE_DEBOUNCE
+
+_LOGGER = logging.getLogger(__name__)
+
+# on_settled(success of the last write, time.monotonic() before it was sent)
+SettledCallback = Callable[[bool, float], None]
+
+
+class ActionWritePipeline:
+    """Debounced, latest-value-wins writer for one (device, action)."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: UnifiConnectAPI,
+        device_id: str,
+        action_name: str,
+        debounce: float = WRITE_DEBOUNCE,
+    ) -> None:
+        self.hass = hass
+        self._api = api
+        self._device_id = device_id
+        self._action_name = action_name
+        self._debounce = debounce
+        self._pending: tuple[str, dict[str, Any] | None, SettledCallback | None] | None = None
+        self._last_submit = 0.0
+        self._task: asyncio.Task | None = None
+        self.writes_submitted = 0
+        self.writes_sent = 0
+
+    @callback
+    def submit(
+        self,
+        action_id: str,
+        args: dict[str, Any] | None,
+        on_settled: SettledCallback | None = None,
+    ) -> None:
+        """Queue a write, replacing any write that has not been sent yet.
+
+        Only the newest *on_settled* is called, once the pipeline has
+        drained.  A write without one (e.g. from the load balancer) keeps
+        the callback of the write it replaces, so an entity waiting on
+        the pipeline still hears back.
+        """
+        if on_settled is None and self._pending is not None:
+            on_settled = self._pending[2]
+        self._pending = (action_id, args, on_settled)
+        self._last_submit = time.monotonic()
+        self.writes_submitted += 1
+        if self._task is None or self._task.done():
+            self._task = self.hass.async_create_background_task(
+                self._async_run(),
+                f"{DOMAIN} write {self._action_name} {self._device_id}",
+            )
+
+    async def async_cancel(self) -> None:
+        """Drop any pending write and cancel the in-flight one."""
+        self._pending = None
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _async_run(self) -> None:
+        success = True
+        since = time.monotonic()
+        on_settled: SettledCallback | None = None
+        while self._pending is not None:
+            # Debounce: wait until submits have been quiet for a while
+            while (wait := self._last_submit + self._debounce - time.monotonic()) > 0:
+                await asyncio.sleep(wait)
+            action_id, args, pending_settled = self._pending
+            self._pending = None
+            # Likewise for a write that was already sent when replaced
+            on_settled = pending_settled or on_settled
+            since = time.monotonic()
+            self.writes_sent += 1
+            success = await self._api.perform_action(
+                self._device_id, action_id, self._action_name, args
+            )
+        _LOGGER.debug(
+            "%s on %s settled (%d submitted, %d sent)",
+            self._action_name, self._device_id, self.writes_submitted, self.writes_sent,
+        )
+        if on_settled:
+            on_settled(success, since)
@@ -0,0 +1,133 @@
+"""On-demand cProfile capture of coordinator refreshes and WebSocket handling."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import pstats
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Functions listed per sort order in the stats file
+PROFILE_STATS_LINES = 80
+
+
+class ProfileCapture:
+    """One cProfile run over the next refreshes and/or WebSocket messages.
+
+    Coordinators and WebSocket listeners being profiled hold a reference
+    and check it once per refresh or message, so nothing is paid while
+    no capture is running.  Entering is reference counted: refreshes of
+    several hubs can overlap, and WebSocket messages arrive while a
+    refresh awaits the console.  A profiled refresh spans its awaits, so
+    other work the event loop runs meanwhile shows up in the stats too,
+    as does work in other threads on Python 3.12+.
+    """
+
+    def __init__(self, refreshes: int, websocket_seconds: float) -> None:
+        self.refreshes = refreshes
+        self.websocket_seconds = websocket_seconds
+        self.started_at = time.monotonic()
+        self.websocket_until = self.started_at + websocket_seconds
+        self.refreshes_profiled = 0
+        self.messages_profiled = 0
+        self.error: str | None = None
+        self._profile = cProfile.Profile()
+        self._depth = 0
+        self._stopped = False
+        # Coordinators that still have refreshes to profile -> refreshes left
+        self._refreshes_left: dict[Any, int] = {}
+        self._refreshes_done = asyncio.Event()
+
+    def add_coordinator(self, coordinator: Any) -> None:
+        """Profile the next ``refreshes`` refreshes of *coordinator*."""
+        if self.refreshes:
+            self._refreshes_left[coordinator] = self.refreshes
+
+    @property
+    def websocket_active(self) -> bool:
+        return not self._stopped and time.monotonic() < self.websocket_until
+
+    @contextmanager
+    def capture(self) -> Iterator[None]:
+        """Profile the enclosed code."""
+        if self._stopped:
+            yield
+            return
+        if self._depth == 0:
+            try:
+                self._profile.enable()
+            except ValueError as err:
+                # Another profiler (e.g. HA's profiler integration) is active
+                self.error = str(err)
+                self.stop()
+                yield
+                return
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0 and not self._stopped:
+                self._profile.disable()
+
+    def refresh_done(self, coordinator: Any) -> bool:
+        """Count a profiled refresh; return True once *coordinator* is done."""
+        self.refreshes_profiled += 1
+        left = self._refreshes_left.get(coordinator, 0) - 1
+        if left > 0:
+            self._refreshes_left[coordinator] = left
+            return False
+        self._refreshes_left.pop(coordinator, None)
+        if not self._refreshes_left:
+            self._refreshes_done.set()
+        return True
+
+    async def async_wait(self) -> None:
+        """Wait until the refreshes are profiled and the WebSocket window ends."""
+        if self._refreshes_left:
+            await self._refreshes_done.wait()
+        remaining = self.websocket_until - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    def stop(self) -> None:
+        """Stop profiling, including refreshes still in flight."""
+        if not self._stopped:
+            self._stopped = True
+            self._profile.disable()
+
+    def write(self, stats_path: str, profile_path: str) -> None:
+        """Write sorted stats as text and the raw profile for other viewers.
+
+        Does file I/O; run it in the executor.
+        """
+        self._profile.dump_stats(profile_path)
+        output = io.StringIO()
+        output.write(
+            f"UniFi Connect profile: {self.refreshes_profiled} refreshes, "
+            f"{self.messages_profiled} WebSocket messages in "
+            f"{time.monotonic() - self.started_at:.1f} s\n"
+        )
+        try:
+            stats = pstats.Stats(self._profile, stream=output)
+        except TypeError:
+            # Nothing was recorded
+            output.write("No calls were profiled.\n")
+        else:
+            stats.strip_dirs()
+            for sort_key in (pstats.SortKey.CUMULATIVE, pstats.SortKey.TIME):
+                output.write(f"\n=== Sorted by {sort_key.value} ===\n")
+                stats.sort_stats(sort_key).print_stats(PROFILE_STATS_LINES)
+        with open(stats_path, "w", encoding="utf-8") as file:
+            file.write(output.getvalue())
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "refreshes_profiled": self.refreshes_profiled,
+            "websocket_messages_profiled": self.messages_profiled,
+            "elapsed_s": round(time.monotonic() - self.started_at, 1),
+        }
@@ -0,0 +1,256 @@
+"""Incrementally maintained energy and cost rollups per charging period.
+
+Completed sessions are folded into running accumulators once, the
+first time the history index reports them.  In-progress sessions from the WebSocket
+are kept separately and added on read.  Period rollovers are scheduled
+at local midnight and only shift or zero the accumulators, so steady
+state never rescans the charge history.  Energy is accumulated per TOU
+period and priced on read, so costs follow changes to the rate helpers.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_state_change_event,
+)
+from homeassistant.util import dt as dt_util
+
+from .history import (
+    ChargeSession,
+    _get_tou_period,
+    _get_tou_rate,
+    TOU_PERIODS,
+    TOU_RATE_ENTITY_IDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+PERIOD_TODAY = "today"
+PERIOD_THIS_WEEK = "this_week"
+PERIOD_THIS_MONTH = "this_month"
+PERIOD_LAST_MONTH = "last_month"
+ROLLUP_PERIODS = (PERIOD_TODAY, PERIOD_THIS_WEEK, PERIOD_THIS_MONTH, PERIOD_LAST_MONTH)
+
+ROLLUP_ENERGY = "energy"
+ROLLUP_COST = "cost"
+
+# Key used for fleet-wide totals alongside per-station device IDs
+FLEET = None
+
+
+def _period_bounds(now: datetime) -> dict[str, tuple[float, float]]:
+    """Return {period: (start, end)} in Unix seconds for HA local time."""
+    today = dt_util.start_of_local_day(now)
+    tomorrow = dt_util.start_of_local_day(today.date() + timedelta(days=1))
+    week = dt_util.start_of_local_day(today.date() - timedelta(days=today.weekday()))
+    month = dt_util.start_of_local_day(today.date().replace(day=1))
+    last_month = dt_util.start_of_local_day(
+        (today.date().replace(day=1) - timedelta(days=1)).replace(day=1)
+    )
+    return {
+        PERIOD_TODAY: (today.timestamp(), tomorrow.timestamp()),
+        PERIOD_THIS_WEEK: (week.timestamp(), tomorrow.timestamp()),
+        PERIOD_THIS_MONTH: (month.timestamp(), tomorrow.timestamp()),
+        PERIOD_LAST_MONTH: (last_month.timestamp(), month.timestamp()),
+    }
+
+
+def _new_period() -> dict[str, float]:
+    """Return kWh per TOU period for one rollup period."""
+    return dict.fromkeys(TOU_PERIODS, 0.0)
+
+
+def _new_totals() -> dict[str, dict[str, float]]:
+    return {period: _new_period() for period in ROLLUP_PERIODS}
+
+
+class EnergyRollup:
+    """Running energy (kWh) and cost ($) totals per station and fleet-wide."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._bounds = _period_bounds(dt_util.now())
+        self._totals: dict[str | None, dict[str, dict[str, float]]] = {
+            FLEET: _new_totals()
+        }
+        # (device_id, session key) -> start of every session folded in;
+        # the index reports sessions again after a partial history fetch
+        self._folded: dict[tuple[str, str], float] = {}
+        # device_id -> (session start, kWh so far, still streaming)
+        self._live: dict[str, tuple[float, float, bool]] = {}
+        self._listeners: list[Callable[[set[str | None]], None]] = []
+        self._unsub_rollover: CALLBACK_TYPE | None = None
+        self._unsub_rates: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Schedule the midnight rollover and watch the TOU rate helpers."""
+        self._schedule_rollover()
+        self._unsub_rates = async_track_state_change_event(
+            self.hass, TOU_RATE_ENTITY_IDS, self._async_rate_changed
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the scheduled rollover and the rate subscription."""
+        if self._unsub_rollover:
+            self._unsub_rollover()
+            self._unsub_rollover = None
+        if self._unsub_rates:
+            self._unsub_rates()
+            self._unsub_rates = None
+
+    @callback
+    def async_add_listener(
+        self, update_callback: Callable[[set[str | None]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for changes; the callback receives the changed station keys."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def value(self, device_id: str | None, period: str, kind: str) -> float:
+        """Return the rollup for a station (or FLEET) including live sessions."""
+        totals = self._totals.get(device_id)
+        value = 0.0
+        if totals:
+            for tou_period, energy in totals[period].items():
+                if kind == ROLLUP_ENERGY:
+                    value += energy
+                else:
+                    value += energy * _get_tou_rate(tou_period, self.hass)
+        start, end = self._bounds[period]
+        for live_id, (started, energy, _) in self._live.items():
+            if device_id is not FLEET and live_id != device_id:
+                continue
+            if start <= started < end:
+                if kind == ROLLUP_ENERGY:
+                    value += energy
+                else:
+                    value += energy * _get_tou_rate(_get_tou_period(started), self.hass)
+        return round(value, 2)
+
+    def period_start(self, period: str) -> datetime:
+        """Return when the current instance of *period* started."""
+        return dt_util.utc_from_timestamp(self._bounds[period][0])
+
+    @callback
+    def async_add_sessions(self, sessions: Iterable[ChargeSession]) -> None:
+        """Fold newly indexed, completed sessions into the accumulators."""
+        changed: set[str | None] = set()
+        earliest = self._bounds[PERIOD_LAST_MONTH][0]
+        for session in sessions:
+            changed.add(session.device_id)
+            # A completed session supersedes the live value we were showing
+            live = self._live.get(session.device_id)
+            if live is not None and not live[2]:
+                del self._live[session.device_id]
+            if session.start < earliest:
+                continue
+            key = (session.device_id, session.key)
+            if key in self._folded:
+                continue
+            self._folded[key] = session.start
+            station = self._totals.setdefault(session.device_id, _new_totals())
+            for period, (start, end) in self._bounds.items():
+                if start <= session.start < end:
+                    for totals in (station, self._totals[FLEET]):
+                        by_tou = totals[period]
+                        by_tou[session.tou_period] = (
+                            by_tou.get(session.tou_period, 0.0) + session.energy_kwh
+                        )
+        if changed:
+            changed.add(FLEET)
+            self._notify(changed)
+
+    @callback
+    def async_update_live(self, device_id: str, power_data: dict[str, Any]) -> None:
+        """Track the energy of an in-progress session from WebSocket data.
+
+        When streaming stops, the last meter reading is kept until the
+        completed session shows up in the charge history.
+        """
+        streaming = bool(power_data.get("streaming"))
+        current = self._live.get(device_id)
+        meter = power_data.get("meter")
+        if not streaming:
+            if current is None or not current[2]:
+                return
+            self._live[device_id] = (current[0], current[1], False)
+            return
+        try:
+            energy = float(meter) if meter is not None else 0.0
+        except (ValueError, TypeError):
+            energy = 0.0
+        started = power_data.get("startedAt")
+        try:
+            started_ts = float(started)
+            if started_ts > 1e12:
+                started_ts /= 1000
+        except (ValueError, TypeError):
+            started_ts = current[0] if current else time.time()
+        if current == (started_ts, energy, True):
+            return
+        self._live[device_id] = (started_ts, energy, True)
+        self._notify({device_id, FLEET})
+
+    def _schedule_rollover(self) -> None:
+        next_midnight = dt_util.start_of_local_day(
+            dt_util.now().date() + timedelta(days=1)
+        )
+        self._unsub_rollover = async_track_point_in_time(
+            self.hass, self._async_rollover, next_midnight
+        )
+
+    @callback
+    def _async_rollover(self, now: datetime) -> None:
+        """Reset or shift the accumulators whose period just ended."""
+        old = self._bounds
+        self._bounds = _period_bounds(now)
+        month_changed = (
+            self._bounds[PERIOD_THIS_MONTH][0] != old[PERIOD_THIS_MONTH][0]
+        )
+        week_changed = self._bounds[PERIOD_THIS_WEEK][0] != old[PERIOD_THIS_WEEK][0]
+        for totals in self._totals.values():
+            totals[PERIOD_TODAY] = _new_period()
+            if week_changed:
+                totals[PERIOD_THIS_WEEK] = _new_period()
+            if month_changed:
+                totals[PERIOD_LAST_MONTH] = totals[PERIOD_THIS_MONTH]
+                totals[PERIOD_THIS_MONTH] = _new_period()
+        if month_changed:
+            earliest = self._bounds[PERIOD_LAST_MONTH][0]
+            self._folded = {
+                key: start for key, start in self._folded.items() if start >= earliest
+            }
+        _LOGGER.debug(
+            "Energy rollup rollover (week=%s, month=%s)", week_changed, month_changed
+        )
+        self._schedule_rollover()
+        self._notify(set(self._totals))
+
+    @callback
+    def _async_rate_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Re-price every rollup; live sessions may belong to new stations."""
+        self._notify(set(self._totals) | set(self._live))
+
+    def _notify(self, changed: set[str | None]) -> None:
+        for update_callback in list(self._listeners):
+            update_callback(changed)
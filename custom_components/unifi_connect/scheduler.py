@@ -0,0 +1,121 @@
+"""Priority scheduling for requests to the UniFi Connect console.
+
+All REST calls share a small number of concurrent slots.  When the slots
+are busy, waiting requests are admitted in priority order:
+
+* ``PRIORITY_CONTROL`` - user actions and their confirmation fetches
+* ``PRIORITY_POLL`` - the periodic device state poll
+* ``PRIORITY_BACKGROUND`` - charge history paging and power stats nudges
+
+Background requests may never take the last free slot, so a control
+action waits for at most one in-flight request, never a whole history walk.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from .metrics import LatencyRecorder
+
+PRIORITY_CONTROL = 0
+PRIORITY_POLL = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_CONTROL: "control",
+    PRIORITY_POLL: "poll",
+    PRIORITY_BACKGROUND: "background",
+}
+
+
+class RequestScheduler:
+    """Caps concurrent requests and admits waiters by priority class.
+
+    Per-class queue wait and total latency (wait + request) are recorded
+    in ``metrics`` as ``<class>.wait`` and ``<class>.latency``.
+    """
+
+    def __init__(self, max_concurrent: int) -> None:
+        self._max = max(1, max_concurrent)
+        self._active = 0
+        self._active_background = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+        self.metrics = LatencyRecorder()
+
+    @property
+    def active(self) -> int:
+        """Number of requests currently holding a slot."""
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for a slot."""
+        return sum(1 for *_, waiter in self._waiters if not waiter.done())
+
+    def _can_start(self, priority: int) -> bool:
+        if self._active >= self._max:
+            return False
+        # Keep one slot free for control and poll requests
+        return not (
+            priority == PRIORITY_BACKGROUND
+            and self._max > 1
+            and self._active_background >= self._max - 1
+        )
+
+    def _acquire(self, priority: int) -> None:
+        self._active += 1
+        if priority == PRIORITY_BACKGROUND:
+            self._active_background += 1
+
+    def _release(self, priority: int) -> None:
+        self._active -= 1
+        if priority == PRIORITY_BACKGROUND:
+            self._active_background -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Admit queued requests, most important first, while slots allow."""
+        while self._waiters:
+            waiter_priority, _, waiter = self._waiters[0]
+            if waiter.done():
+                # Cancelled while queued
+                heapq.heappop(self._waiters)
+                continue
+            if not self._can_start(waiter_priority):
+                break
+            heapq.heappop(self._waiters)
+            self._acquire(waiter_priority)
+            waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Hold a request slot for the duration of the ``async with`` block."""
+        queued_at = time.monotonic()
+        ahead = self._waiters and self._waiters[0][0] <= priority
+        if not ahead and self._can_start(priority):
+            self._acquire(priority)
+        else:
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._order), waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Slot was granted just as we were cancelled
+                    self._release(priority)
+                raise
+
+        started_at = time.monotonic()
+        name = PRIORITY_NAMES[priority]
+        self.metrics.record(f"{name}.wait", started_at - queued_at)
+        try:
+            yield
+        finally:
+            self.metrics.record(f"{name}.latency", time.monotonic() - queued_at)
+            self._release(priority)
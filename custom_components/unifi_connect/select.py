@@ -5,18 +5,18 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .actions import resolve_action_id, get_action_arg_key
 from .const import (
-    DOMAIN, DEVICE_PLATFORM_SE21, ACTION_MODE_SWITCH, ACTION_LAUNCH_APP,
+    DOMAIN, SHADOW_KEY_PREFIX,
+    ACTION_MODE_SWITCH, ACTION_LAUNCH_APP,
     EV_ACTION_SWITCH_MODE, EV_ACTION_SET_FALLBACK_SECURITY, EV_ACTION_SET_BREAKER,
 )
-from .coordinator import _is_ev_device
-from .entity import UnifiConnectEntity
+from .entity import UnifiConnectEntity, async_setup_device_entities
 from .hub import UnifiConnectHub
+from .model import UnifiDevice
 
 _LOGGER = logging.getLogger(__name__)
 
-# EV Station select entities - action IDs resolved dynamically at init
+# EV Station select entities - action IDs resolved dynamically at select time
 EV_SELECT_ENTITIES = [
     {
         "shadow_key": "evStationMode",
@@ -47,76 +47,76 @@ async def async_setup_entry(
 ) -> None:
     """Set up UniFi Connect select entities from config entry."""
     hub: UnifiConnectHub = hass.data[DOMAIN][entry.entry_id]
+    async_setup_device_entities(hub, async_add_entities, _device_entities)
+
+
+def _device_entities(hub: UnifiConnectHub, device: UnifiDevice) -> list[SelectEntity]:
+    """Build the select entities for one device."""
     entities: list[SelectEntity] = []
 
-    for device in hub.coordinator.data or []:
-        platform = device.get("type", {}).get("platform")
-
-        # SE21 Display entities
-        if platform == DEVICE_PLATFORM_SE21:
-            shadow = device.get("shadow", {})
-            if shadow.get("mode") is not None:
-                entities.append(DisplayModeSelect(hub, device))
-            apps = device.get("featureFlags", {}).get("app", {}).get("enum", [])
-            if apps:
-                entities.append(DisplayAppSelect(hub, device, apps))
-
-        # EV Station entities
-        if _is_ev_device(device):
-            shadow = device.get("shadow", {})
-            features = device.get("featureFlags", {})
-            for config in EV_SELECT_ENTITIES:
-                if config["shadow_key"] in shadow:
-                    entities.append(EVSelect(hub, device, config, features))
-            # Breaker Amperage select (options from breakerLoadLimits)
-            breaker_limits = features.get("breakerLoadLimits", [])
-            if breaker_limits:
-                entities.append(EVBreakerSelect(hub, device, breaker_limits))
-
-    async_add_entities(entities)
+    # SE21 Display entities
+    if device.is_display:
+        shadow = device.shadow
+        if shadow.get("mode") is not None:
+            entities.append(DisplayModeSelect(hub, device))
+        apps = device.feature_flags.get("app", {}).get("enum", [])
+        if apps:
+            entities.append(DisplayAppSelect(hub, device, apps))
+
+    # EV Station entities
+    if device.is_ev:
+        shadow = device.shadow
+        features = device.feature_flags
+        for config in EV_SELECT_ENTITIES:
+            if config["shadow_key"] in shadow:
+                entities.append(EVSelect(hub, device, config, features))
+        # Breaker Amperage select (options from breakerLoadLimits)
+        breaker_limits = features.get("breakerLoadLimits", [])
+        if breaker_limits:
+            entities.append(EVBreakerSelect(hub, device, breaker_limits))
+
+    return entities
 
 
 class DisplayModeSelect(UnifiConnectEntity, SelectEntity):
     """Mode selector for SE 21 (Web/App)."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Mode", "mode")
-        mode_enum = device.get("featureFlags", {}).get("mode", {}).get("enum", [])
+        self._watch(SHADOW_KEY_PREFIX + "mode")
+        mode_enum = device.feature_flags.get("mode", {}).get("enum", [])
         self._attr_options = mode_enum if mode_enum else ["Web", "App"]
 
-    @property
-    def current_option(self):
-        return self._get_shadow().get("mode", "")
+    def _update_state(self) -> None:
+        self._attr_current_option = self._get_shadow().get("mode", "")
 
     async def async_select_option(self, option: str):
-        await self._hub.api.perform_action(
-            self._device_id,
+        await self._async_perform_action(
             ACTION_MODE_SWITCH,
             "mode_switch",
             {"value": option},
+            optimistic={"_attr_current_option": option},
         )
-        await self.coordinator.async_request_refresh()
 
 
 class DisplayAppSelect(UnifiConnectEntity, SelectEntity):
     """App selector for SE 21."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict, apps: list):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice, apps: list):
         super().__init__(hub, device, "App Selector", "app_selector")
+        self._watch(SHADOW_KEY_PREFIX + "selectedApp")
         self._attr_options = apps
 
-    @property
-    def current_option(self):
-        return self._get_shadow().get("selectedApp", "")
+    def _update_state(self) -> None:
+        self._attr_current_option = self._get_shadow().get("selectedApp", "")
 
     async def async_select_option(self, option: str):
-        await self._hub.api.perform_action(
-            self._device_id,
+        await self._async_perform_action(
             ACTION_LAUNCH_APP,
             "launch_app",
             {"value": option},
+            optimistic={"_attr_current_option": option},
         )
-        await self.coordinator.async_request_refresh()
 
 
 class EVSelect(UnifiConnectEntity, SelectEntity):
@@ -126,25 +126,16 @@ class EVSelect(UnifiConnectEntity, SelectEntity):
     firmware updates that change UUIDs.
     """
 
-    def __init__(self, hub: UnifiConnectHub, device: dict, config: dict, features: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice, config: dict, features: dict):
         super().__init__(hub, device, config["name_suffix"], config["unique_suffix"])
         self._shadow_key = config["shadow_key"]
+        self._watch(SHADOW_KEY_PREFIX + self._shadow_key)
         self._action_name = config["action_name"]
         self._attr_icon = config.get("icon")
 
-        # Dynamically resolve action ID and arg key
-        self._action_id = resolve_action_id(
-            device, config["action_name"], config.get("fallback_action_id")
-        )
-        dynamic_arg_key = get_action_arg_key(device, config["action_name"])
-        self._arg_key = dynamic_arg_key or config.get("fallback_arg_key", "value")
-
-        _LOGGER.debug(
-            "EV select '%s': action_id=%s, arg_key='%s'",
-            config["action_name"],
-            self._action_id,
-            self._arg_key,
-        )
+        # Action ID and arg key are resolved from the action table on select
+        self._fallback_action_id = config.get("fallback_action_id")
+        self._fallback_arg_key = config.get("fallback_arg_key", "value")
 
         # Get options from featureFlags enum if available
         feature_def = features.get(config.get("feature_key", ""), {})
@@ -153,18 +144,17 @@ class EVSelect(UnifiConnectEntity, SelectEntity):
         else:
             self._attr_options = config.get("default_options", [])
 
-    @property
-    def current_option(self):
-        return self._get_shadow().get(self._shadow_key, "")
+    def _update_state(self) -> None:
+        self._attr_current_option = self._get_shadow().get(self._shadow_key, "")
 
     async def async_select_option(self, option: str):
-        await self._hub.api.perform_action(
-            self._device_id,
-            self._action_id,
+        actions = self._actions()
+        await self._async_perform_action(
+            actions.action_id(self._action_name, self._fallback_action_id),
             self._action_name,
-            {self._arg_key: option},
+            {actions.arg_key(self._action_name, self._fallback_arg_key): option},
+            optimistic={"_attr_current_option": option},
         )
-        await self.coordinator.async_request_refresh()
 
 
 class EVBreakerSelect(UnifiConnectEntity, SelectEntity):
@@ -174,23 +164,11 @@ class EVBreakerSelect(UnifiConnectEntity, SelectEntity):
     Action ID resolved dynamically from device data.
     """
 
-    def __init__(self, hub: UnifiConnectHub, device: dict, breaker_limits: list):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice, breaker_limits: list):
         super().__init__(hub, device, "Breaker Amperage", "breaker_amperage")
+        self._watch("extraInfo")
         self._attr_icon = "mdi:fuse"
 
-        # Dynamically resolve action ID and arg key
-        self._action_id = resolve_action_id(
-            device, "set_breaker_amp", EV_ACTION_SET_BREAKER
-        )
-        dynamic_arg_key = get_action_arg_key(device, "set_breaker_amp")
-        self._arg_key = dynamic_arg_key or "breakerAm"
-
-        _LOGGER.debug(
-            "EV breaker select: action_id=%s, arg_key='%s'",
-            self._action_id,
-            self._arg_key,
-        )
-
         # Build options like ["15A", "20A", "30A", "40A", "50A", "60A", "70A"]
         self._breaker_map: dict[str, int] = {}
         options = []
@@ -202,22 +180,18 @@ class EVBreakerSelect(UnifiConnectEntity, SelectEntity):
                 self._breaker_map[label] = amp
         self._attr_options = options
 
-    @property
-    def current_option(self):
+    def _update_state(self) -> None:
         device = self._get_device()
-        if device:
-            breaker_am = device.get("extraInfo", {}).get("breakerAm")
-            if breaker_am is not None:
-                return f"{breaker_am}A"
-        return None
+        breaker_am = device.extra_info.get("breakerAm") if device else None
+        self._attr_current_option = f"{breaker_am}A" if breaker_am is not None else None
 
     async def async_select_option(self, option: str):
         amp_value = self._breaker_map.get(option)
         if amp_value is not None:
-            await self._hub.api.perform_action(
-                self._device_id,
-                self._action_id,
+            actions = self._actions()
+            await self._async_perform_action(
+                actions.action_id("set_breaker_amp", EV_ACTION_SET_BREAKER),
                 "set_breaker_amp",
-                {self._arg_key: amp_value},
+                {actions.arg_key("set_breaker_amp", "breakerAm"): amp_value},
+                optimistic={"_attr_current_option": option},
             )
-            await self.coordinator.async_request_refresh()
@@ -7,8 +7,9 @@ and per-session cost estimates using Ontario TOU rates.
 from __future__ import annotations
 
 import logging
+import time
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -17,6 +18,7 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
@@ -24,232 +26,45 @@ from homeassistant.const import (
     UnitOfTime,
     PERCENTAGE,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-
-from .const import DOMAIN
-from .coordinator import _is_ev_device
-from .entity import UnifiConnectEntity
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import (
+    DOMAIN,
+    HISTORY_ATTR_SESSIONS,
+    SHADOW_KEY_PREFIX,
+    WATCH_CHARGE_HISTORY,
+    WATCH_POWER,
+)
+from .entity import UnifiConnectEntity, async_setup_device_entities
+from .history import (
+    _compute_session_cost,
+    _extract_charge_end,
+    _extract_charge_start,
+    _extract_energy,
+    _extract_source,
+    _format_duration,
+    _get_tou_rate,
+    _parse_duration_seconds,
+    TOU_PERIODS,
+    TOU_RATE_ENTITY_IDS,
+)
 from .hub import UnifiConnectHub
+from .model import UnifiDevice
+from .rollup import (
+    FLEET,
+    PERIOD_LAST_MONTH,
+    PERIOD_THIS_MONTH,
+    PERIOD_THIS_WEEK,
+    PERIOD_TODAY,
+    ROLLUP_COST,
+    ROLLUP_ENERGY,
+    ROLLUP_PERIODS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-# Ordered list of keys to try when extracting energy from a charge session.
-# The stats/evs/chargingHistory endpoint uses "powerUsage" (kWh).
-# The per-device chargeHistory endpoint uses "energy".
-_ENERGY_KEYS = ("powerUsage", "energyDelivered", "energy", "totalEnergy", "kwh", "wh")
-
-
-def _extract_energy(session: dict) -> float | None:
-    """Extract energy value from a charge session dict.
-
-    Uses explicit ``is not None`` checks so that a legitimate ``0``
-    value is returned instead of falling through to the next key
-    (plain ``or`` chains treat 0 as falsy).
-    """
-    for key in _ENERGY_KEYS:
-        value = session.get(key)
-        if value is not None:
-            return value
-    return None
-
-
-def _extract_charge_start(session: dict) -> float:
-    """Extract the charge start timestamp (Unix seconds) from a session.
-
-    The stats endpoint uses ``date`` (Unix seconds).
-    The per-device endpoint uses ``chargeStart`` (Unix seconds or ISO).
-    """
-    # stats endpoint: "date" is unix seconds
-    ts = session.get("date")
-    if ts is not None:
-        try:
-            return float(ts)
-        except (ValueError, TypeError):
-            pass
-    # per-device endpoint
-    ts = session.get("chargeStart", 0)
-    if isinstance(ts, str):
-        try:
-            return datetime.fromisoformat(ts).timestamp()
-        except (ValueError, TypeError):
-            return 0
-    return float(ts) if ts else 0
-
-
-def _extract_charge_end(session: dict) -> float:
-    """Extract the charge end timestamp from a session."""
-    # stats endpoint: date + totalTime
-    start = session.get("date")
-    total_time = session.get("totalTime")
-    if start is not None and total_time is not None:
-        try:
-            return float(start) + float(total_time)
-        except (ValueError, TypeError):
-            pass
-    # per-device endpoint
-    return float(session.get("chargeEnd", 0) or 0)
-
-
-def _extract_source(session: dict) -> str:
-    """Extract the session source/mode."""
-    return session.get("usageMode", session.get("source", ""))
-
-
-def _parse_duration_seconds(value) -> float:
-    """Parse a duration value into total seconds.
-
-    Handles both:
-      - ISO datetime-from-epoch like "1970-01-01T02:06:37+00:00" → 7597s
-      - Numeric seconds directly
-    """
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        try:
-            dt = datetime.fromisoformat(value)
-            # Duration encoded as datetime from epoch
-            epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
-            return (dt - epoch).total_seconds()
-        except (ValueError, TypeError):
-            return 0.0
-    return 0.0
-
-
-def _format_duration(total_seconds: float) -> str:
-    """Format seconds into Xh Ym Zs string."""
-    total_seconds = int(total_seconds)
-    hours, remainder = divmod(total_seconds, 3600)
-    minutes, seconds = divmod(remainder, 60)
-    if hours > 0:
-        return f"{hours}h {minutes}m {seconds}s"
-    if minutes > 0:
-        return f"{minutes}m {seconds}s"
-    return f"{seconds}s"
-
-
-def _get_tou_period(timestamp: int | float, tz_name: str = "America/Toronto") -> str:
-    """Determine Ontario TOU period for a given Unix timestamp.
-
-    Ontario TOU schedule:
-    - Winter (Nov 1 - Apr 30):
-      Off-peak: 7pm-7am weekdays, all day weekends/holidays
-      Mid-peak: 11am-5pm weekdays
-      On-peak:  7am-11am and 5pm-7pm weekdays
-    - Summer (May 1 - Oct 31):
-      Off-peak: 7pm-7am weekdays, all day weekends/holidays
-      Mid-peak: 7am-11am and 5pm-7pm weekdays
-      On-peak:  11am-5pm weekdays
-    """
-    try:
-        import zoneinfo
-        tz = zoneinfo.ZoneInfo(tz_name)
-    except Exception:
-        tz = timezone.utc
-
-    dt = datetime.fromtimestamp(timestamp, tz=tz)
-
-    # Weekends are always off-peak
-    if dt.weekday() >= 5:
-        return "off_peak"
-
-    hour = dt.hour
-    month = dt.month
-
-    # Off-peak hours (all seasons): 7pm-7am
-    if hour < 7 or hour >= 19:
-        return "off_peak"
-
-    # Determine season
-    is_winter = month >= 11 or month <= 4
-
-    if is_winter:
-        # Winter: On-peak 7-11, Mid-peak 11-17, On-peak 17-19
-        if 7 <= hour < 11 or 17 <= hour < 19:
-            return "on_peak"
-        return "mid_peak"  # 11-17
-    else:
-        # Summer: Mid-peak 7-11, On-peak 11-17, Mid-peak 17-19
-        if 11 <= hour < 17:
-            return "on_peak"
-        return "mid_peak"  # 7-11, 17-19
-
-
-def _get_tou_rate(period: str, hass=None) -> float:
-    """Get TOU rate in $/kWh for the given period.
-
-    Reads from input_number helpers if they exist, otherwise uses
-    Ontario TOU defaults (as of 2025).
-
-    Supports two helper naming conventions:
-      - input_number.tou_rate_off_peak  (in ¢/kWh, divided by 100)
-      - input_number.ev_rate_off_peak   (in $/kWh, used directly)
-    """
-    defaults = {
-        "off_peak": 0.087,
-        "mid_peak": 0.122,
-        "on_peak": 0.180,
-    }
-    if hass:
-        # Try ¢/kWh helpers first (existing house energy helpers)
-        cents_map = {
-            "off_peak": "input_number.tou_rate_off_peak",
-            "mid_peak": "input_number.tou_rate_mid_peak",
-            "on_peak": "input_number.tou_rate_on_peak",
-        }
-        entity_id = cents_map.get(period)
-        if entity_id:
-            state = hass.states.get(entity_id)
-            if state and state.state not in ("unknown", "unavailable"):
-                try:
-                    return float(state.state) / 100.0  # ¢ to $
-                except (ValueError, TypeError):
-                    pass
-
-        # Fall back to $/kWh helpers
-        dollars_map = {
-            "off_peak": "input_number.ev_rate_off_peak",
-            "mid_peak": "input_number.ev_rate_mid_peak",
-            "on_peak": "input_number.ev_rate_on_peak",
-        }
-        entity_id = dollars_map.get(period)
-        if entity_id:
-            state = hass.states.get(entity_id)
-            if state and state.state not in ("unknown", "unavailable"):
-                try:
-                    return float(state.state)
-                except (ValueError, TypeError):
-                    pass
-    return defaults.get(period, 0.087)
-
-
-def _compute_session_cost(session: dict, hass=None) -> dict:
-    """Compute cost for a single charge session.
-
-    Returns dict with tou_period, rate, energy, cost.
-    """
-    energy = _extract_energy(session)
-    if energy is None:
-        energy = 0.0
-    else:
-        try:
-            energy = float(energy)
-        except (ValueError, TypeError):
-            energy = 0.0
-
-    charge_start = _extract_charge_start(session)
-    period = _get_tou_period(charge_start)
-    rate = _get_tou_rate(period, hass)
-    cost = round(energy * rate, 2)
-
-    return {
-        "tou_period": period,
-        "rate": rate,
-        "energy_kwh": round(energy, 2),
-        "cost": cost,
-    }
-
-
 # Read-only sensor definitions from EV Station shadow
 EV_SENSOR_DEFINITIONS: list[dict[str, Any]] = [
     {
@@ -391,69 +206,224 @@ EV_REALTIME_POWER_SENSOR_DEFINITIONS: list[dict[str, Any]] = [
 ]
 
 
-async def async_setup_entry(
-    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
-) -> None:
-    """Set up UniFi Connect sensor entities from config entry."""
-    hub: UnifiConnectHub = hass.data[DOMAIN][entry.entry_id]
-    entities: list[SensorEntity] = []
+# ── Hub performance (diagnostic, disabled by default) ──
 
-    for device in hub.coordinator.data or []:
-        if not _is_ev_device(device):
-            continue
 
-        shadow = device.get("shadow", {})
-        extra_info = device.get("extraInfo", {})
-        _LOGGER.info(
-            "Setting up EV sensors for %s (platform: %s)",
-            device.get("name"),
-            device.get("type", {}).get("platform"),
-        )
+def _last_refresh_ms(hub: UnifiConnectHub) -> int | None:
+    cycle = hub.coordinator.last_cycle
+    return round(cycle.total * 1000) if cycle else None
+
 
-        # Create read-only sensors for matching shadow keys
-        for sensor_def in EV_SENSOR_DEFINITIONS:
-            if sensor_def["shadow_key"] in shadow:
-                entities.append(EVShadowSensor(hub, device, sensor_def))
+def _history_sync_ms(hub: UnifiConnectHub) -> int | None:
+    series = hub.coordinator.cycle_metrics.get("history_sync")
+    return round(series.last * 1000) if series and series.last is not None else None
 
-        # Create sensors from top-level device keys
-        for sensor_def in EV_DEVICE_SENSOR_DEFINITIONS:
-            if device.get(sensor_def["device_key"]) is not None:
-                entities.append(EVDeviceKeySensor(hub, device, sensor_def))
 
-        # Create sensors from extraInfo
-        for sensor_def in EV_EXTRA_INFO_SENSOR_DEFINITIONS:
-            if extra_info.get(sensor_def["extra_key"]) is not None:
-                entities.append(EVExtraInfoSensor(hub, device, sensor_def))
+def _requests_per_cycle(hub: UnifiConnectHub) -> int | None:
+    coordinator = hub.coordinator
+    return coordinator.last_cycle_requests if coordinator.last_cycle else None
 
-        # Uptime sensor (from lastBootTimestamp)
-        if device.get("lastBootTimestamp"):
-            entities.append(EVUptimeSensor(hub, device))
 
-        # Active charging session sensor
-        entities.append(EVActiveSessionSensor(hub, device))
+def _websocket_message_rate(hub: UnifiConnectHub) -> float:
+    return round(hub.websocket.rate.rates()[0], 2)
 
-        # Real-time power sensors (from WebSocket)
-        for sensor_def in EV_REALTIME_POWER_SENSOR_DEFINITIONS:
-            entities.append(EVRealtimePowerSensor(hub, device, sensor_def))
 
-        # Charge history sensors
-        entities.append(EVChargeHistoryEnergySensor(hub, device))
-        entities.append(EVChargeHistoryCountSensor(hub, device))
-        entities.append(EVLastSessionSensor(hub, device))
+def _power_frame_age(hub: UnifiConnectHub) -> int | None:
+    last = hub.websocket.last_power_at
+    return round(time.monotonic() - last) if last is not None else None
 
-        # Stats sensors
-        entities.append(EVTotalChargingTimeSensor(hub, device))
-        entities.append(EVAverageSessionTimeSensor(hub, device))
-        entities.append(EVAverageEnergyPerSessionSensor(hub, device))
-        entities.append(EVTotalCostSensor(hub, device))
-        entities.append(EVChargeHistoryLogSensor(hub, device))
 
-        # Raw shadow dump sensor for debugging
-        entities.append(EVShadowDumpSensor(hub, device))
+def _websocket_reconnects(hub: UnifiConnectHub) -> int:
+    return max(0, hub.websocket.counters["connects"] - 1)
 
-    if entities:
-        _LOGGER.info("Adding %d EV sensor entities", len(entities))
-    async_add_entities(entities)
+
+PERFORMANCE_METRICS: dict[str, Callable[[UnifiConnectHub], Any]] = {
+    "last_refresh": _last_refresh_ms,
+    "history_sync": _history_sync_ms,
+    "requests_per_cycle": _requests_per_cycle,
+    "websocket_message_rate": _websocket_message_rate,
+    "power_frame_age": _power_frame_age,
+    "websocket_reconnects": _websocket_reconnects,
+}
+
+HUB_PERFORMANCE_SENSOR_DEFINITIONS: list[dict[str, Any]] = [
+    {
+        "name_suffix": "Last Refresh Duration",
+        "unique_suffix": "last_refresh_duration",
+        "metric": "last_refresh",
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": UnitOfTime.MILLISECONDS,
+        "icon": "mdi:timer-sync-outline",
+    },
+    {
+        "name_suffix": "History Sync Duration",
+        "unique_suffix": "history_sync_duration",
+        "metric": "history_sync",
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": UnitOfTime.MILLISECONDS,
+        "icon": "mdi:history",
+    },
+    {
+        "name_suffix": "Requests Per Refresh",
+        "unique_suffix": "requests_per_refresh",
+        "metric": "requests_per_cycle",
+        "device_class": None,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": None,
+        "icon": "mdi:swap-horizontal",
+    },
+    {
+        "name_suffix": "WebSocket Message Rate",
+        "unique_suffix": "websocket_message_rate",
+        "metric": "websocket_message_rate",
+        "device_class": None,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": "msg/s",
+        "icon": "mdi:message-flash-outline",
+    },
+    {
+        "name_suffix": "Time Since Last Power Frame",
+        "unique_suffix": "power_frame_age",
+        "metric": "power_frame_age",
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": UnitOfTime.SECONDS,
+        "icon": "mdi:timer-alert-outline",
+    },
+    {
+        "name_suffix": "WebSocket Reconnects",
+        "unique_suffix": "websocket_reconnects",
+        "metric": "websocket_reconnects",
+        "device_class": None,
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "unit": None,
+        "icon": "mdi:lan-disconnect",
+    },
+]
+
+
+# ── Period rollups (today / this week / this month / last month) ──
+
+ROLLUP_PERIOD_NAMES = {
+    PERIOD_TODAY: "Today",
+    PERIOD_THIS_WEEK: "This Week",
+    PERIOD_THIS_MONTH: "This Month",
+    PERIOD_LAST_MONTH: "Last Month",
+}
+
+
+def _fleet_device(hub: UnifiConnectHub) -> UnifiDevice:
+    """Pseudo device for the hub-level fleet rollup sensors."""
+    return UnifiDevice(
+        {
+            "id": hub.entry.entry_id,
+            "name": "UniFi Connect EV Fleet",
+            "type": {"fullName": "EV Station Fleet"},
+        }
+    )
+
+
+def _console_device(hub: UnifiConnectHub) -> UnifiDevice:
+    """Pseudo device for the hub's own performance sensors."""
+    return UnifiDevice(
+        {
+            "id": hub.console_device_id,
+            "name": "UniFi Connect Console",
+            "type": {"fullName": "UniFi Connect Console"},
+        }
+    )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up UniFi Connect sensor entities from config entry."""
+    hub: UnifiConnectHub = hass.data[DOMAIN][entry.entry_id]
+    console = _console_device(hub)
+    async_add_entities(
+        HubPerformanceSensor(hub, console, sensor_def)
+        for sensor_def in HUB_PERFORMANCE_SENSOR_DEFINITIONS
+    )
+    fleet_added = False
+
+    def _entities(hub: UnifiConnectHub, device: UnifiDevice) -> list[SensorEntity]:
+        nonlocal fleet_added
+        entities = _device_entities(hub, device)
+        # Fleet-wide rollups across all EV Stations, once the first one exists
+        if entities and not fleet_added:
+            fleet_added = True
+            fleet = _fleet_device(hub)
+            for period in ROLLUP_PERIODS:
+                for kind in (ROLLUP_ENERGY, ROLLUP_COST):
+                    entities.append(EVRollupSensor(hub, fleet, period, kind, fleet=True))
+        return entities
+
+    async_setup_device_entities(hub, async_add_entities, _entities)
+
+
+def _device_entities(hub: UnifiConnectHub, device: UnifiDevice) -> list[SensorEntity]:
+    """Build the sensor entities for one EV Station."""
+    entities: list[SensorEntity] = []
+    if not device.is_ev:
+        return entities
+
+    shadow = device.shadow
+    extra_info = device.extra_info
+    _LOGGER.info(
+        "Setting up EV sensors for %s (platform: %s)",
+        device.name,
+        device.platform,
+    )
+
+    # Create read-only sensors for matching shadow keys
+    for sensor_def in EV_SENSOR_DEFINITIONS:
+        if sensor_def["shadow_key"] in shadow:
+            entities.append(EVShadowSensor(hub, device, sensor_def))
+
+    # Create sensors from top-level device keys
+    for sensor_def in EV_DEVICE_SENSOR_DEFINITIONS:
+        if device.get(sensor_def["device_key"]) is not None:
+            entities.append(EVDeviceKeySensor(hub, device, sensor_def))
+
+    # Create sensors from extraInfo
+    for sensor_def in EV_EXTRA_INFO_SENSOR_DEFINITIONS:
+        if extra_info.get(sensor_def["extra_key"]) is not None:
+            entities.append(EVExtraInfoSensor(hub, device, sensor_def))
+
+    # Uptime sensor (from lastBootTimestamp)
+    if device.get("lastBootTimestamp"):
+        entities.append(EVUptimeSensor(hub, device))
+
+    # Active charging session sensor
+    entities.append(EVActiveSessionSensor(hub, device))
+
+    # Real-time power sensors (from WebSocket)
+    for sensor_def in EV_REALTIME_POWER_SENSOR_DEFINITIONS:
+        entities.append(EVRealtimePowerSensor(hub, device, sensor_def))
+
+    # Charge history sensors
+    entities.append(EVChargeHistoryEnergySensor(hub, device))
+    entities.append(EVChargeHistoryCountSensor(hub, device))
+    entities.append(EVLastSessionSensor(hub, device))
+
+    # Stats sensors
+    entities.append(EVTotalChargingTimeSensor(hub, device))
+    entities.append(EVAverageSessionTimeSensor(hub, device))
+    entities.append(EVAverageEnergyPerSessionSensor(hub, device))
+    entities.append(EVTotalCostSensor(hub, device))
+    entities.append(EVChargeHistoryLogSensor(hub, device))
+
+    # Period rollup sensors
+    for period in ROLLUP_PERIODS:
+        for kind in (ROLLUP_ENERGY, ROLLUP_COST):
+            entities.append(EVRollupSensor(hub, device, period, kind))
+
+    # Raw shadow dump sensor for debugging
+    entities.append(EVShadowDumpSensor(hub, device))
+
+    return entities
 
 
 class EVShadowSensor(UnifiConnectEntity, SensorEntity):
@@ -462,19 +432,26 @@ class EVShadowSensor(UnifiConnectEntity, SensorEntity):
     def __init__(
         self,
         hub: UnifiConnectHub,
-        device: dict,
+        device: UnifiDevice,
         sensor_def: dict[str, Any],
     ):
         super().__init__(hub, device, sensor_def["name_suffix"], sensor_def["unique_suffix"])
         self._shadow_key = sensor_def["shadow_key"]
+        self._watch(SHADOW_KEY_PREFIX + self._shadow_key)
         self._attr_device_class = sensor_def["device_class"]
         self._attr_state_class = sensor_def["state_class"]
         self._attr_native_unit_of_measurement = sensor_def["unit"]
         self._attr_icon = sensor_def.get("icon")
 
-    @property
-    def native_value(self):
-        value = self._get_shadow().get(self._shadow_key)
+    def _update_state(self) -> None:
+        raw = self._get_shadow().get(self._shadow_key)
+        attrs = {"shadow_key": self._shadow_key}
+        if isinstance(raw, dict):
+            attrs.update(raw)
+        self._attr_extra_state_attributes = attrs
+        self._attr_native_value = self._convert(raw)
+
+    def _convert(self, value):
         if value is None:
             return None
         if self._attr_device_class in (
@@ -490,29 +467,17 @@ class EVShadowSensor(UnifiConnectEntity, SensorEntity):
             return str(value)
         return value
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        raw = self._get_shadow().get(self._shadow_key)
-        attrs = {"shadow_key": self._shadow_key}
-        if isinstance(raw, dict):
-            attrs.update(raw)
-        return attrs
-
 
 class EVShadowDumpSensor(UnifiConnectEntity, SensorEntity):
     """Diagnostic sensor that exposes all shadow keys as attributes."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Shadow Data", "shadow_dump")
+        self._watch("shadow")
         self._attr_icon = "mdi:bug"
         self._attr_entity_registry_enabled_default = False
 
-    @property
-    def native_value(self):
-        return len(self._get_shadow())
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _update_state(self) -> None:
         shadow = self._get_shadow()
         attrs: dict[str, Any] = {}
         for key, value in shadow.items():
@@ -520,24 +485,76 @@ class EVShadowDumpSensor(UnifiConnectEntity, SensorEntity):
                 attrs[key] = str(value)
             else:
                 attrs[key] = value
-        return attrs
+        self._attr_native_value = len(shadow)
+        self._attr_extra_state_attributes = attrs
+
 
+class EVHistorySensor(UnifiConnectEntity, SensorEntity):
+    """Base for sensors derived from a station's charge history.
+
+    Aggregates are only recomputed when the history index reports a
+    change for the station, or for cost sensors when a TOU rate changes.
+    """
 
-class EVChargeHistoryEnergySensor(UnifiConnectEntity, SensorEntity):
+    _uses_rates = False
+
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice, name_suffix: str, unique_suffix: str):
+        super().__init__(hub, device, name_suffix, unique_suffix)
+        self._watch(WATCH_CHARGE_HISTORY)
+        self._history_key: Any = None
+
+    def _update_state(self) -> None:
+        history = self.coordinator.charge_history.get(self._device_id)
+        if history is None:
+            # Not fetched since startup; showing a partial total would
+            # look like a meter reset to the recorder
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            self._history_key = None
+            return
+        key: Any = self.coordinator.history_index.version(self._device_id)
+        if self._uses_rates:
+            key = (key, tuple(_get_tou_rate(p, self.hass) for p in TOU_PERIODS))
+        if key == self._history_key:
+            return
+        self._history_key = key
+        self._update_history_state(history)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self._uses_rates:
+            self.async_on_remove(
+                async_track_state_change_event(
+                    self.hass, TOU_RATE_ENTITY_IDS, self._handle_rate_change
+                )
+            )
+
+    @callback
+    def _handle_rate_change(self, event: Event[EventStateChangedData]) -> None:
+        self._async_update_and_write()
+
+    def _update_history_state(self, history: list[dict]) -> None:
+        """Recompute the cached state from the station's raw history."""
+        raise NotImplementedError
+
+
+class EVChargeHistoryEnergySensor(EVHistorySensor):
     """Total energy delivered across all charge sessions."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Total Energy Delivered", "total_energy_kwh")
         self._attr_device_class = SensorDeviceClass.ENERGY
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
         self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
         self._attr_icon = "mdi:lightning-bolt-circle"
 
-    @property
-    def native_value(self):
-        history = self.coordinator.charge_history.get(self._device_id, [])
-        if not history:
-            return None
+    def _update_history_state(self, history: list[dict]) -> None:
+        attrs: dict[str, Any] = {"total_sessions": len(history)}
+        if history:
+            last = history[-1] if isinstance(history[-1], dict) else {}
+            attrs["last_session_keys"] = list(last.keys())
+        self._attr_extra_state_attributes = attrs
+
         total = 0.0
         for session in history:
             energy = _extract_energy(session)
@@ -545,61 +562,48 @@ class EVChargeHistoryEnergySensor(UnifiConnectEntity, SensorEntity):
                 total += float(energy)
             except (ValueError, TypeError):
                 continue
-        return round(total, 2) if total > 0 else None
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        history = self.coordinator.charge_history.get(self._device_id, [])
-        attrs: dict[str, Any] = {"total_sessions": len(history)}
-        if history:
-            last = history[-1] if isinstance(history[-1], dict) else {}
-            attrs["last_session_keys"] = list(last.keys())
-        return attrs
+        self._attr_native_value = round(total, 2) if total > 0 else None
 
 
-class EVChargeHistoryCountSensor(UnifiConnectEntity, SensorEntity):
+class EVChargeHistoryCountSensor(EVHistorySensor):
     """Number of charge sessions."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Charge Sessions", "charge_sessions")
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
         self._attr_icon = "mdi:counter"
 
-    @property
-    def native_value(self):
-        history = self.coordinator.charge_history.get(self._device_id, [])
-        return len(history) if history else 0
+    def _update_history_state(self, history: list[dict]) -> None:
+        self._attr_native_value = len(history) if history else 0
 
 
-class EVLastSessionSensor(UnifiConnectEntity, SensorEntity):
+class EVLastSessionSensor(EVHistorySensor):
     """Most recent charge session details."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    _uses_rates = True
+
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Last Charge Session", "last_session_kwh")
         self._attr_device_class = SensorDeviceClass.ENERGY
         self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
         self._attr_icon = "mdi:ev-plug-type2"
 
-    @property
-    def native_value(self):
-        history = self.coordinator.charge_history.get(self._device_id, [])
+    def _update_history_state(self, history: list[dict]) -> None:
         if not history:
-            return None
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
         last = history[-1] if isinstance(history[-1], dict) else {}
+
+        value = None
         energy = _extract_energy(last)
         if energy is not None:
             try:
-                return round(float(energy), 2)
+                value = round(float(energy), 2)
             except (ValueError, TypeError):
                 pass
-        return None
+        self._attr_native_value = value
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        history = self.coordinator.charge_history.get(self._device_id, [])
-        if not history:
-            return {}
-        last = history[-1] if isinstance(history[-1], dict) else {}
         attrs: dict[str, Any] = {}
         # Add cost info for last session
         cost_info = _compute_session_cost(last, self.hass)
@@ -629,29 +633,28 @@ class EVLastSessionSensor(UnifiConnectEntity, SensorEntity):
             attrs["charge_time"] = _format_duration(
                 _parse_duration_seconds(charge_time)
             )
-        return attrs
+        self._attr_extra_state_attributes = attrs
 
 
-class EVTotalChargingTimeSensor(UnifiConnectEntity, SensorEntity):
+class EVTotalChargingTimeSensor(EVHistorySensor):
     """Total charging time across all sessions."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Total Charging Time", "total_charging_time")
         self._attr_device_class = SensorDeviceClass.DURATION
         self._attr_native_unit_of_measurement = UnitOfTime.HOURS
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
         self._attr_icon = "mdi:timer"
 
-    @property
-    def native_value(self):
-        history = self.coordinator.charge_history.get(self._device_id, [])
-        if not history:
-            return None
+    def _update_history_state(self, history: list[dict]) -> None:
         total_seconds = 0.0
+        reported_seconds = 0.0
         for session in history:
             charge_time = session.get("chargeTime")
             if charge_time is not None:
-                total_seconds += _parse_duration_seconds(charge_time)
+                secs = _parse_duration_seconds(charge_time)
+                total_seconds += secs
+                reported_seconds += secs
             else:
                 # Fallback: compute from start/end using schema helpers
                 start = _extract_charge_start(session)
@@ -659,50 +662,22 @@ class EVTotalChargingTimeSensor(UnifiConnectEntity, SensorEntity):
                 if start and end:
                     total_seconds += max(0, end - start)
         hours = total_seconds / 3600.0
-        return round(hours, 2) if hours > 0 else None
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        history = self.coordinator.charge_history.get(self._device_id, [])
-        total_seconds = 0.0
-        for session in history:
-            charge_time = session.get("chargeTime")
-            if charge_time is not None:
-                total_seconds += _parse_duration_seconds(charge_time)
-        return {"formatted": _format_duration(total_seconds)}
+        self._attr_native_value = round(hours, 2) if history and hours > 0 else None
+        self._attr_extra_state_attributes = {
+            "formatted": _format_duration(reported_seconds)
+        }
 
 
-class EVAverageSessionTimeSensor(UnifiConnectEntity, SensorEntity):
+class EVAverageSessionTimeSensor(EVHistorySensor):
     """Average charging time per session."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Average Session Time", "avg_session_time")
         self._attr_device_class = SensorDeviceClass.DURATION
         self._attr_native_unit_of_measurement = UnitOfTime.HOURS
         self._attr_icon = "mdi:timer-outline"
 
-    @property
-    def native_value(self):
-        history = self.coordinator.charge_history.get(self._device_id, [])
-        if not history:
-            return None
-        total_seconds = 0.0
-        count = 0
-        for session in history:
-            charge_time = session.get("chargeTime")
-            if charge_time is not None:
-                secs = _parse_duration_seconds(charge_time)
-                if secs > 0:
-                    total_seconds += secs
-                    count += 1
-        if count == 0:
-            return None
-        avg_hours = (total_seconds / count) / 3600.0
-        return round(avg_hours, 2)
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        history = self.coordinator.charge_history.get(self._device_id, [])
+    def _update_history_state(self, history: list[dict]) -> None:
         total_seconds = 0.0
         count = 0
         for session in history:
@@ -713,25 +688,24 @@ class EVAverageSessionTimeSensor(UnifiConnectEntity, SensorEntity):
                     total_seconds += secs
                     count += 1
         if count == 0:
-            return {}
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
         avg_secs = total_seconds / count
-        return {"formatted": _format_duration(avg_secs)}
+        self._attr_native_value = round(avg_secs / 3600.0, 2)
+        self._attr_extra_state_attributes = {"formatted": _format_duration(avg_secs)}
 
 
-class EVAverageEnergyPerSessionSensor(UnifiConnectEntity, SensorEntity):
+class EVAverageEnergyPerSessionSensor(EVHistorySensor):
     """Average energy delivered per session."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Average Energy Per Session", "avg_energy_session")
         self._attr_device_class = SensorDeviceClass.ENERGY
         self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
         self._attr_icon = "mdi:lightning-bolt"
 
-    @property
-    def native_value(self):
-        history = self.coordinator.charge_history.get(self._device_id, [])
-        if not history:
-            return None
+    def _update_history_state(self, history: list[dict]) -> None:
         total = 0.0
         count = 0
         for session in history:
@@ -742,129 +716,172 @@ class EVAverageEnergyPerSessionSensor(UnifiConnectEntity, SensorEntity):
                     count += 1
                 except (ValueError, TypeError):
                     continue
-        if count == 0:
-            return None
-        return round(total / count, 2)
+        self._attr_native_value = round(total / count, 2) if count else None
 
 
-class EVTotalCostSensor(UnifiConnectEntity, SensorEntity):
+class EVTotalCostSensor(EVHistorySensor):
     """Estimated total cost across all charge sessions using TOU rates."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    _uses_rates = True
+
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Total Charging Cost", "total_charging_cost")
         self._attr_native_unit_of_measurement = "$"
         self._attr_icon = "mdi:currency-usd"
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
 
-    @property
-    def native_value(self):
-        history = self.coordinator.charge_history.get(self._device_id, [])
+    def _update_history_state(self, history: list[dict]) -> None:
         if not history:
-            return None
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        kwh = {period: 0.0 for period in TOU_PERIODS}
+        cost = {period: 0.0 for period in TOU_PERIODS}
         total_cost = 0.0
-        for session in history:
-            cost_info = _compute_session_cost(session, self.hass)
-            total_cost += cost_info["cost"]
-        return round(total_cost, 2) if total_cost > 0 else None
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        history = self.coordinator.charge_history.get(self._device_id, [])
-        if not history:
-            return {}
-        off_peak_kwh = 0.0
-        mid_peak_kwh = 0.0
-        on_peak_kwh = 0.0
-        off_peak_cost = 0.0
-        mid_peak_cost = 0.0
-        on_peak_cost = 0.0
         for session in history:
             info = _compute_session_cost(session, self.hass)
-            if info["tou_period"] == "off_peak":
-                off_peak_kwh += info["energy_kwh"]
-                off_peak_cost += info["cost"]
-            elif info["tou_period"] == "mid_peak":
-                mid_peak_kwh += info["energy_kwh"]
-                mid_peak_cost += info["cost"]
-            else:
-                on_peak_kwh += info["energy_kwh"]
-                on_peak_cost += info["cost"]
-        return {
-            "off_peak_kwh": round(off_peak_kwh, 2),
-            "off_peak_cost": round(off_peak_cost, 2),
-            "mid_peak_kwh": round(mid_peak_kwh, 2),
-            "mid_peak_cost": round(mid_peak_cost, 2),
-            "on_peak_kwh": round(on_peak_kwh, 2),
-            "on_peak_cost": round(on_peak_cost, 2),
+            total_cost += info["cost"]
+            period = info["tou_period"] if info["tou_period"] in kwh else "on_peak"
+            kwh[period] += info["energy_kwh"]
+            cost[period] += info["cost"]
+        self._attr_native_value = round(total_cost, 2) if total_cost > 0 else None
+        self._attr_extra_state_attributes = {
+            "off_peak_kwh": round(kwh["off_peak"], 2),
+            "off_peak_cost": round(cost["off_peak"], 2),
+            "mid_peak_kwh": round(kwh["mid_peak"], 2),
+            "mid_peak_cost": round(cost["mid_peak"], 2),
+            "on_peak_kwh": round(kwh["on_peak"], 2),
+            "on_peak_cost": round(cost["on_peak"], 2),
             "rate_off_peak": _get_tou_rate("off_peak", self.hass),
             "rate_mid_peak": _get_tou_rate("mid_peak", self.hass),
             "rate_on_peak": _get_tou_rate("on_peak", self.hass),
         }
 
 
-class EVChargeHistoryLogSensor(UnifiConnectEntity, SensorEntity):
-    """Full charge session history log with per-session costs."""
+class EVChargeHistoryLogSensor(EVHistorySensor):
+    """Charge session count with the most recent sessions as attributes.
+
+    Only the newest ``HISTORY_ATTR_SESSIONS`` sessions are exposed, and
+    they are excluded from the recorder.  The full history is served by
+    the ``get_charge_history`` service and WebSocket command.
+    """
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    _uses_rates = True
+    _unrecorded_attributes = frozenset({"sessions", "api_meta"})
+
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Charge History", "charge_history_log")
         self._attr_icon = "mdi:clipboard-text-clock"
 
-    @property
-    def native_value(self):
-        history = self.coordinator.charge_history.get(self._device_id, [])
-        return len(history) if history else 0
+    def _update_history_state(self, history: list[dict]) -> None:
+        index = self.coordinator.history_index
+        recent = index.recent(self._device_id, HISTORY_ATTR_SESSIONS)
+        total = len(index.sessions(self._device_id))
+        attrs: dict[str, Any] = {
+            "sessions": [session.as_dict(self.hass) for session in recent],
+            "total_sessions": total,
+        }
+        # Expose raw API pagination metadata for debugging
+        meta = getattr(self._hub.api, "_charge_history_meta", None)
+        if meta:
+            attrs["api_meta"] = meta
+        self._attr_native_value = total
+        self._attr_extra_state_attributes = attrs
+
+
+class HubPerformanceSensor(UnifiConnectEntity, SensorEntity):
+    """Diagnostic sensor for the hub's own refresh and WebSocket performance.
+
+    Read once per refresh from the counters the coordinator, API client
+    and WebSocket already keep.  Stays available through console
+    outages, when the numbers matter most.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        hub: UnifiConnectHub,
+        device: UnifiDevice,
+        sensor_def: dict[str, Any],
+    ):
+        super().__init__(hub, device, sensor_def["name_suffix"], sensor_def["unique_suffix"])
+        self._metric = PERFORMANCE_METRICS[sensor_def["metric"]]
+        self._attr_device_class = sensor_def["device_class"]
+        self._attr_state_class = sensor_def["state_class"]
+        self._attr_native_unit_of_measurement = sensor_def["unit"]
+        self._attr_icon = sensor_def.get("icon")
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        history = self.coordinator.charge_history.get(self._device_id, [])
-        if not history:
-            return {"sessions": []}
+    def available(self) -> bool:
+        return True
 
-        sessions = []
-        for session in reversed(history):  # Most recent first
-            energy = _extract_energy(session)
-            try:
-                energy_val = round(float(energy), 2) if energy is not None else 0.0
-            except (ValueError, TypeError):
-                energy_val = 0.0
+    def _update_state(self) -> None:
+        self._attr_native_value = self._metric(self._hub)
 
-            charge_start = _extract_charge_start(session)
-            charge_end = _extract_charge_end(session)
-            charge_time_raw = session.get("chargeTime")
-            charge_secs = _parse_duration_seconds(charge_time_raw) if charge_time_raw else 0
 
-            # Format timestamps
-            try:
-                start_dt = datetime.fromtimestamp(charge_start, tz=timezone.utc)
-                start_str = start_dt.isoformat()
-            except (ValueError, OSError):
-                start_str = str(charge_start)
+class EVRollupSensor(UnifiConnectEntity, SensorEntity):
+    """Energy or cost for a charging period, per station or fleet-wide.
 
-            try:
-                end_dt = datetime.fromtimestamp(charge_end, tz=timezone.utc)
-                end_str = end_dt.isoformat()
-            except (ValueError, OSError):
-                end_str = str(charge_end)
-
-            cost_info = _compute_session_cost(session, self.hass)
-
-            sessions.append({
-                "date": start_str,
-                "end": end_str,
-                "energy_kwh": energy_val,
-                "charge_time": _format_duration(charge_secs),
-                "tou_period": cost_info["tou_period"],
-                "rate": cost_info["rate"],
-                "cost": cost_info["cost"],
-                "source": _extract_source(session),
-            })
-
-        attrs = {"sessions": sessions, "total_sessions": len(sessions)}
-        # Expose raw API pagination metadata for debugging
-        meta = getattr(self._hub.api, "_charge_history_meta", None)
-        if meta:
-            attrs["api_meta"] = meta
-        return attrs
+    Values come from the running accumulators in ``EnergyRollup`` and
+    are pushed when a session is added, a live session advances, or the
+    period rolls over.
+    """
+
+    def __init__(
+        self,
+        hub: UnifiConnectHub,
+        device: UnifiDevice,
+        period: str,
+        kind: str,
+        fleet: bool = False,
+    ):
+        label = ROLLUP_PERIOD_NAMES[period]
+        if kind == ROLLUP_ENERGY:
+            name_suffix = f"Energy {label}"
+        else:
+            name_suffix = f"Charging Cost {label}"
+        unique_suffix = f"{kind}_{period}"
+        if fleet:
+            unique_suffix = f"fleet_{unique_suffix}"
+        super().__init__(hub, device, name_suffix, unique_suffix)
+        # Pushed by the rollup listener; refreshes only matter for availability
+        self._watch()
+        self._station = FLEET if fleet else device.id
+        self._period = period
+        self._kind = kind
+        if kind == ROLLUP_ENERGY:
+            self._attr_device_class = SensorDeviceClass.ENERGY
+            self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+            self._attr_icon = "mdi:lightning-bolt"
+        else:
+            self._attr_native_unit_of_measurement = "$"
+            self._attr_icon = "mdi:currency-usd"
+        # Current periods reset at rollover; last month is a fixed value.
+        # Cost is re-priced when a TOU rate changes, so it can go down.
+        if period != PERIOD_LAST_MONTH:
+            if kind == ROLLUP_ENERGY:
+                self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+            else:
+                self._attr_state_class = SensorStateClass.TOTAL
+
+    def _update_state(self) -> None:
+        rollup = self.coordinator.rollup
+        self._attr_native_value = rollup.value(self._station, self._period, self._kind)
+        if self._attr_state_class == SensorStateClass.TOTAL:
+            self._attr_last_reset = rollup.period_start(self._period)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.rollup.async_add_listener(self._handle_rollup_update)
+        )
+
+    @callback
+    def _handle_rollup_update(self, changed: set[str | None]) -> None:
+        if self._station in changed:
+            self._async_update_and_write()
 
 
 class EVDeviceKeySensor(UnifiConnectEntity, SensorEntity):
@@ -873,25 +890,23 @@ class EVDeviceKeySensor(UnifiConnectEntity, SensorEntity):
     def __init__(
         self,
         hub: UnifiConnectHub,
-        device: dict,
+        device: UnifiDevice,
         sensor_def: dict[str, Any],
     ):
         super().__init__(hub, device, sensor_def["name_suffix"], sensor_def["unique_suffix"])
         self._device_key = sensor_def["device_key"]
+        self._watch(self._device_key)
         self._attr_device_class = sensor_def["device_class"]
         self._attr_state_class = sensor_def["state_class"]
         self._attr_native_unit_of_measurement = sensor_def["unit"]
         self._attr_icon = sensor_def.get("icon")
 
-    @property
-    def native_value(self):
+    def _update_state(self) -> None:
         device = self._get_device()
-        if not device:
-            return None
-        value = device.get(self._device_key)
+        value = device.get(self._device_key) if device else None
         if isinstance(value, (dict, list)):
-            return str(value)
-        return value
+            value = str(value)
+        self._attr_native_value = value
 
 
 class EVExtraInfoSensor(UnifiConnectEntity, SensorEntity):
@@ -900,125 +915,105 @@ class EVExtraInfoSensor(UnifiConnectEntity, SensorEntity):
     def __init__(
         self,
         hub: UnifiConnectHub,
-        device: dict,
+        device: UnifiDevice,
         sensor_def: dict[str, Any],
     ):
         super().__init__(hub, device, sensor_def["name_suffix"], sensor_def["unique_suffix"])
         self._extra_key = sensor_def["extra_key"]
+        self._watch("extraInfo")
         self._attr_device_class = sensor_def["device_class"]
         self._attr_state_class = sensor_def["state_class"]
         self._attr_native_unit_of_measurement = sensor_def["unit"]
         self._attr_icon = sensor_def.get("icon")
 
-    @property
-    def native_value(self):
+    def _update_state(self) -> None:
         device = self._get_device()
         if not device:
-            return None
-        extra_info = device.get("extraInfo", {})
-        value = extra_info.get(self._extra_key)
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        value = device.extra_info.get(self._extra_key)
         if value is not None and self._attr_state_class is not None:
             try:
-                return round(float(value), 1)
+                value = round(float(value), 1)
             except (ValueError, TypeError):
-                return None
-        return value
+                value = None
+        self._attr_native_value = value
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        device = self._get_device()
-        if not device:
-            return {}
-        extra_info = device.get("extraInfo", {})
         attrs: dict[str, Any] = {}
-        for key, value in extra_info.items():
-            if isinstance(value, (dict, list)):
-                attrs[key] = str(value)
+        for key, item in device.extra_info.items():
+            if isinstance(item, (dict, list)):
+                attrs[key] = str(item)
             else:
-                attrs[key] = value
-        return attrs
+                attrs[key] = item
+        self._attr_extra_state_attributes = attrs
 
 
 class EVUptimeSensor(UnifiConnectEntity, SensorEntity):
-    """Sensor showing device uptime based on lastBootTimestamp."""
+    """Sensor showing device uptime based on lastBootTimestamp.
+
+    The state is the last boot time as a datetime; HA renders timestamp
+    sensors as relative time ("X hours ago").
+    """
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Uptime", "uptime")
         self._attr_device_class = SensorDeviceClass.TIMESTAMP
         self._attr_icon = "mdi:clock-check-outline"
 
-    @property
-    def native_value(self):
-        """Return the last boot time as a datetime.
-
-        HA renders timestamp sensors as relative time ("X hours ago").
-        """
+    def _update_state(self) -> None:
         device = self._get_device()
-        if not device:
-            return None
-        boot_ts = device.get("lastBootTimestamp")
+        boot_ts = device.get("lastBootTimestamp") if device else None
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {}
         if boot_ts is None:
-            return None
+            return
+        attrs: dict[str, Any] = {"boot_timestamp": boot_ts}
         try:
             ts = float(boot_ts)
             if ts > 1e12:
                 ts = ts / 1000
-            return datetime.fromtimestamp(ts, tz=timezone.utc)
+            boot_dt = datetime.fromtimestamp(ts, tz=timezone.utc)
+            uptime_seconds = (datetime.now(tz=timezone.utc) - boot_dt).total_seconds()
+            attrs["uptime_days"] = round(uptime_seconds / 86400, 1)
+            attrs["uptime_hours"] = round(uptime_seconds / 3600, 1)
+            self._attr_native_value = boot_dt
         except (ValueError, TypeError, OSError):
-            return None
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        device = self._get_device()
-        if not device:
-            return {}
-        boot_ts = device.get("lastBootTimestamp")
-        attrs: dict[str, Any] = {}
-        if boot_ts is not None:
-            attrs["boot_timestamp"] = boot_ts
-            try:
-                ts = float(boot_ts)
-                if ts > 1e12:
-                    ts = ts / 1000
-                boot_dt = datetime.fromtimestamp(ts, tz=timezone.utc)
-                uptime_seconds = (datetime.now(tz=timezone.utc) - boot_dt).total_seconds()
-                attrs["uptime_days"] = round(uptime_seconds / 86400, 1)
-                attrs["uptime_hours"] = round(uptime_seconds / 3600, 1)
-            except (ValueError, TypeError, OSError):
-                pass
-        return attrs
+            pass
+        self._attr_extra_state_attributes = attrs
 
 
 class EVActiveSessionSensor(UnifiConnectEntity, SensorEntity):
-    """Sensor showing the active charging session status."""
+    """Sensor showing the active charging session status.
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    The state is the charging source type if a session is active,
+    else 'idle'.
+    """
+
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Active Session", "active_session")
+        self._watch("chargingSession")
         self._attr_icon = "mdi:ev-plug-type2"
 
-    @property
-    def native_value(self):
-        """Return charging source type if session active, else 'idle'."""
-        device = self._get_device()
-        if not device:
-            return None
-        session = device.get("chargingSession")
-        if session and isinstance(session, dict) and session.get("id"):
-            return session.get("source", "active")
-        return "idle"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _update_state(self) -> None:
         device = self._get_device()
         if not device:
-            return {}
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
         session = device.get("chargingSession")
         if not session or not isinstance(session, dict):
-            return {"session_active": False}
+            self._attr_native_value = "idle"
+            self._attr_extra_state_attributes = {"session_active": False}
+            return
+        if session.get("id"):
+            self._attr_native_value = session.get("source", "active")
+        else:
+            self._attr_native_value = "idle"
         attrs: dict[str, Any] = {"session_active": bool(session.get("id"))}
         for key, value in session.items():
             attrs[f"session_{key}"] = value
-        return attrs
+        self._attr_extra_state_attributes = attrs
 
 
 class EVRealtimePowerSensor(UnifiConnectEntity, SensorEntity):
@@ -1031,11 +1026,12 @@ class EVRealtimePowerSensor(UnifiConnectEntity, SensorEntity):
     def __init__(
         self,
         hub: UnifiConnectHub,
-        device: dict,
+        device: UnifiDevice,
         sensor_def: dict[str, Any],
     ):
         super().__init__(hub, device, sensor_def["name_suffix"], sensor_def["unique_suffix"])
         self._ws_key = sensor_def["ws_key"]
+        self._watch(WATCH_POWER)
         self._attr_device_class = sensor_def["device_class"]
         self._attr_state_class = sensor_def["state_class"]
         self._attr_native_unit_of_measurement = sensor_def["unit"]
@@ -1048,10 +1044,13 @@ class EVRealtimePowerSensor(UnifiConnectEntity, SensorEntity):
         """Available when coordinator data exists (WS data may be empty when idle)."""
         return self.coordinator.data is not None
 
-    @property
-    def native_value(self):
-        """Return the real-time value from WebSocket data."""
+    def _update_state(self) -> None:
         power_data = self._get_power_data()
+        self._attr_native_value = self._realtime_value(power_data)
+        self._attr_extra_state_attributes = self._realtime_attributes(power_data)
+
+    def _realtime_value(self, power_data: dict[str, Any]):
+        """Return the real-time value from WebSocket data."""
         if not power_data or not power_data.get("streaming"):
             # Not actively charging — return 0 for power/current/voltage,
             # None for session-specific metrics
@@ -1067,10 +1066,8 @@ class EVRealtimePowerSensor(UnifiConnectEntity, SensorEntity):
         except (ValueError, TypeError):
             return None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def _realtime_attributes(self, power_data: dict[str, Any]) -> dict[str, Any]:
         """Expose all WebSocket power data as attributes."""
-        power_data = self._get_power_data()
         if not power_data:
             return {
                 "source": "websocket",
@@ -0,0 +1,367 @@
+"""Services and WebSocket commands for UniFi Connect."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .api import UnifiConnectTimeoutError
+from .const import (
+    ATTR_ACTION,
+    ATTR_ARGS,
+    ATTR_CONCURRENCY,
+    ATTR_END,
+    ATTR_LIMIT,
+    ATTR_OFFSET,
+    ATTR_REFRESHES,
+    ATTR_START,
+    ATTR_TIMEOUT,
+    ATTR_TOU_PERIOD,
+    ATTR_WEBSOCKET_SECONDS,
+    BULK_DEFAULT_CONCURRENCY,
+    BULK_DEFAULT_TIMEOUT,
+    BULK_MAX_CONCURRENCY,
+    DOMAIN,
+    HISTORY_QUERY_DEFAULT_LIMIT,
+    HISTORY_QUERY_MAX_LIMIT,
+    MAX_CONCURRENT_REQUESTS,
+    POLL_MAX_INTERVAL,
+    PROFILE_MAX_REFRESHES,
+    PROFILE_MAX_WEBSOCKET_SECONDS,
+    SERVICE_BULK_ACTION,
+    SERVICE_GET_CHARGE_HISTORY,
+    SERVICE_PROFILE,
+)
+from .history import TOU_PERIODS, ChargeSession
+from .profiling import ProfileCapture
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_QUERY_FIELDS = {
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_START): cv.datetime,
+    vol.Optional(ATTR_END): cv.datetime,
+    vol.Optional(ATTR_TOU_PERIOD): vol.In(TOU_PERIODS),
+    vol.Optional(ATTR_OFFSET, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+    vol.Optional(ATTR_LIMIT, default=HISTORY_QUERY_DEFAULT_LIMIT): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=HISTORY_QUERY_MAX_LIMIT)
+    ),
+}
+
+GET_CHARGE_HISTORY_SCHEMA = vol.Schema(HISTORY_QUERY_FIELDS)
+
+BULK_ACTION_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_ACTION): cv.string,
+        vol.Optional(ATTR_ARGS): dict,
+        vol.Optional(ATTR_CONCURRENCY, default=BULK_DEFAULT_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=BULK_MAX_CONCURRENCY)
+        ),
+        vol.Optional(ATTR_TIMEOUT, default=BULK_DEFAULT_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=60)
+        ),
+    }
+)
+
+
+
+def _require_profile_target(data: dict[str, Any]) -> dict[str, Any]:
+    if not data[ATTR_REFRESHES] and not data[ATTR_WEBSOCKET_SECONDS]:
+        raise vol.Invalid(f"Set {ATTR_REFRESHES} or {ATTR_WEBSOCKET_SECONDS}")
+    return data
+
+
+PROFILE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_REFRESHES, default=1): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=PROFILE_MAX_REFRESHES)
+            ),
+            vol.Optional(ATTR_WEBSOCKET_SECONDS, default=0): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=PROFILE_MAX_WEBSOCKET_SECONDS)
+            ),
+        }
+    ),
+    _require_profile_target,
+)
+
+
+def _to_timestamp(value: datetime | None) -> float | None:
+    """Convert a service datetime to Unix seconds (naive = HA local time)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.get_default_time_zone())
+    return value.timestamp()
+
+
+def _resolve_station_ids(hass: HomeAssistant, device_ids: list[str]) -> list[str]:
+    """Map HA device registry IDs to UniFi device IDs.
+
+    IDs that are not in the device registry are assumed to already be
+    UniFi device IDs.
+    """
+    registry = dr.async_get(hass)
+    station_ids: list[str] = []
+    for device_id in device_ids:
+        device = registry.async_get(device_id)
+        if device is None:
+            station_ids.append(device_id)
+            continue
+        station_ids.extend(
+            identifier for domain, identifier in device.identifiers if domain == DOMAIN
+        )
+    return station_ids
+
+
+def _query_charge_history(hass: HomeAssistant, params: dict[str, Any]) -> dict[str, Any]:
+    """Run a charge history query across all loaded hubs."""
+    station_ids = (
+        _resolve_station_ids(hass, params[ATTR_DEVICE_ID])
+        if ATTR_DEVICE_ID in params
+        else None
+    )
+    offset = params[ATTR_OFFSET]
+    limit = params[ATTR_LIMIT]
+    query = {
+        "device_ids": station_ids,
+        "start": _to_timestamp(params.get(ATTR_START)),
+        "end": _to_timestamp(params.get(ATTR_END)),
+        "tou_period": params.get(ATTR_TOU_PERIOD),
+    }
+
+    hubs = list(hass.data.get(DOMAIN, {}).values())
+    names: dict[str, str] = {}
+    for hub in hubs:
+        for device in hub.coordinator.devices.values():
+            names[device.id] = device.name
+
+    if len(hubs) == 1:
+        total, page = hubs[0].coordinator.history_index.query(
+            **query, offset=offset, limit=limit
+        )
+    else:
+        # Each hub returns its first offset+limit matches; the merged
+        # page is then cut from the combined newest-first stream.
+        total = 0
+        pages: list[list[ChargeSession]] = []
+        for hub in hubs:
+            hub_total, hub_page = hub.coordinator.history_index.query(
+                **query, offset=0, limit=offset + limit
+            )
+            total += hub_total
+            pages.append(hub_page)
+        merged = heapq.merge(*pages, key=lambda s: s.start, reverse=True)
+        page = list(islice(merged, offset, offset + limit))
+
+    sessions = []
+    for session in page:
+        item = session.as_dict(hass)
+        item["station_name"] = names.get(session.device_id)
+        sessions.append(item)
+
+    return {"total": total, "offset": offset, "limit": limit, "sessions": sessions}
+
+
+async def _async_get_charge_history(call: ServiceCall) -> ServiceResponse:
+    """Handle the get_charge_history service."""
+    return _query_charge_history(call.hass, call.data)
+
+
+async def _async_bulk_action(call: ServiceCall) -> ServiceResponse:
+    """Handle the bulk_action service.
+
+    Runs one action on every target station concurrently (bounded by
+    ``concurrency``, capped at the request scheduler's slots), then
+    refreshes each affected hub once and reports per-station results.
+    Each PATCH is bounded by ``timeout`` from when it gets a slot.
+    """
+    hass = call.hass
+    action_name = call.data[ATTR_ACTION]
+    args = call.data.get(ATTR_ARGS)
+    request_timeout = call.data[ATTR_TIMEOUT]
+    # More would only queue in the scheduler
+    semaphore = asyncio.Semaphore(
+        min(call.data[ATTR_CONCURRENCY], MAX_CONCURRENT_REQUESTS)
+    )
+
+    hubs_by_station = {
+        device_id: hub
+        for hub in hass.data.get(DOMAIN, {}).values()
+        for device_id in hub.coordinator.devices
+    }
+
+    async def _async_run(station_id: str) -> dict[str, Any]:
+        result: dict[str, Any] = {"device_id": station_id, "success": False}
+        hub = hubs_by_station.get(station_id)
+        if hub is None:
+            result["error"] = "unknown_device"
+            return result
+        result["station_name"] = hub.coordinator.devices[station_id].name
+        actions = hub.coordinator.action_table(station_id)
+        if not actions.has_action(action_name):
+            result["error"] = "unsupported_action"
+            return result
+
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                result["success"] = await hub.api.perform_action(
+                    station_id,
+                    actions.action_id(action_name),
+                    action_name,
+                    args,
+                    timeout=request_timeout,
+                )
+            except UnifiConnectTimeoutError:
+                # No response in time; the station may still have applied it
+                result["error"] = "timeout"
+            else:
+                if not result["success"]:
+                    result["error"] = "request_failed"
+            result["latency_ms"] = round((time.monotonic() - started) * 1000)
+        return result
+
+    started = time.monotonic()
+    station_ids = list(dict.fromkeys(_resolve_station_ids(hass, call.data[ATTR_DEVICE_ID])))
+    results = await asyncio.gather(*(_async_run(station_id) for station_id in station_ids))
+    elapsed_ms = round((time.monotonic() - started) * 1000)
+
+    # One refresh per hub that actually changed something
+    refreshed: list[Any] = []
+    for result in results:
+        hub = hubs_by_station.get(result["device_id"])
+        if result["success"] and hub not in refreshed:
+            refreshed.append(hub)
+    for hub in refreshed:
+        await hub.coordinator.async_request_refresh()
+
+    succeeded = sum(1 for result in results if result["success"])
+    _LOGGER.info(
+        "Bulk %s: %d/%d stations succeeded in %d ms",
+        action_name, succeeded, len(results), elapsed_ms,
+    )
+    return {
+        "action": action_name,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "elapsed_ms": elapsed_ms,
+        "results": list(results),
+    }
+
+
+async def _async_profile(call: ServiceCall) -> ServiceResponse:
+    """Handle the profile service.
+
+    Profiles the next ``refreshes`` refreshes of every hub and/or their
+    WebSocket message handling for ``websocket_seconds``, then writes
+    the stats, sorted by cumulative and own time, to the config dir.
+    """
+    hass = call.hass
+    hubs = list(hass.data.get(DOMAIN, {}).values())
+    if not hubs:
+        raise HomeAssistantError("No UniFi Connect hub is loaded")
+    if any(hub.coordinator.profile or hub.websocket.profile for hub in hubs):
+        raise HomeAssistantError("A UniFi Connect profile is already running")
+
+    capture = ProfileCapture(call.data[ATTR_REFRESHES], call.data[ATTR_WEBSOCKET_SECONDS])
+    for hub in hubs:
+        if capture.refreshes:
+            capture.add_coordinator(hub.coordinator)
+            hub.coordinator.profile = capture
+        if capture.websocket_seconds:
+            hub.websocket.profile = capture
+    # Refreshes slow down to POLL_MAX_INTERVAL while the console is unhealthy
+    max_wait = capture.websocket_seconds + capture.refreshes * POLL_MAX_INTERVAL
+    timed_out = False
+    try:
+        async with asyncio.timeout(max_wait):
+            await capture.async_wait()
+    except asyncio.TimeoutError:
+        timed_out = True
+    finally:
+        capture.stop()
+        for hub in hubs:
+            if hub.coordinator.profile is capture:
+                hub.coordinator.profile = None
+            if hub.websocket.profile is capture:
+                hub.websocket.profile = None
+    if capture.error:
+        raise HomeAssistantError(f"Could not start the profiler: {capture.error}")
+
+    stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+    stats_path = hass.config.path(f"{DOMAIN}_profile_{stamp}.txt")
+    profile_path = hass.config.path(f"{DOMAIN}_profile_{stamp}.prof")
+    await hass.async_add_executor_job(capture.write, stats_path, profile_path)
+    _LOGGER.info("Profile written to %s", stats_path)
+    return {
+        **capture.as_dict(),
+        "timed_out": timed_out,
+        "stats_file": stats_path,
+        "profile_file": profile_path,
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/charge_history",
+        **HISTORY_QUERY_FIELDS,
+    }
+)
+@callback
+def _ws_charge_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Handle the charge_history WebSocket command."""
+    connection.send_result(msg["id"], _query_charge_history(hass, msg))
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register UniFi Connect services and WebSocket commands."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CHARGE_HISTORY,
+        _async_get_charge_history,
+        schema=GET_CHARGE_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_ACTION,
+        _async_bulk_action,
+        schema=BULK_ACTION_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    websocket_api.async_register_command(hass, _ws_charge_history)
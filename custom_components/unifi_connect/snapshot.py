@@ -0,0 +1,159 @@
+"""Cached device snapshot for instant startup.
+
+The last successful device list and the parsed charge sessions are
+persisted so the next start can create entities on last-known values
+straight away, with login, polling and history sync catching up in the
+background.  The raw charge history is not cached; the first history
+sync refetches it.  Saves are throttled: at most one write per
+``SNAPSHOT_SAVE_DELAY`` seconds, always with the latest data, and the
+sessions are kept in a separate store that is only written when the
+history index changed.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .history import ChargeSession
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Seconds between snapshot writes while data keeps changing
+SNAPSHOT_SAVE_DELAY = 300
+
+
+def _session_row(session: ChargeSession) -> list[Any]:
+    return [
+        session.key,
+        session.start,
+        session.end,
+        session.energy_kwh,
+        session.charge_seconds,
+        session.source,
+        session.tou_period,
+    ]
+
+
+def _parse_rows(device_id: str, rows: Any) -> list[ChargeSession]:
+    sessions: list[ChargeSession] = []
+    if not isinstance(rows, list):
+        return sessions
+    for row in rows:
+        try:
+            key, start, end, energy_kwh, charge_seconds, source, tou_period = row
+            sessions.append(
+                ChargeSession(
+                    str(key),
+                    device_id,
+                    float(start),
+                    float(end),
+                    float(energy_kwh),
+                    float(charge_seconds),
+                    str(source),
+                    str(tou_period),
+                )
+            )
+        except (TypeError, ValueError):
+            continue
+    return sessions
+
+
+class DeviceSnapshotStore:
+    """Persists and restores the coordinator's device and history data."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, coordinator: Any) -> None:
+        self.hass = hass
+        self._coordinator = coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        self._sessions_store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.sessions"
+        )
+        self._save_pending = False
+        self._sessions_pending = False
+        self._saved_versions: dict[str, int] = {}
+
+    async def async_restore(self) -> bool:
+        """Load the snapshot into the coordinator; return False if there is none."""
+        snapshot = await self._store.async_load()
+        if not isinstance(snapshot, dict):
+            return False
+        devices = snapshot.get("devices")
+        if not isinstance(devices, list) or not devices:
+            return False
+        stored = await self._sessions_store.async_load()
+        rows = stored.get("sessions") if isinstance(stored, dict) else None
+        sessions = (
+            {
+                device_id: _parse_rows(device_id, station_rows)
+                for device_id, station_rows in rows.items()
+            }
+            if isinstance(rows, dict)
+            else {}
+        )
+        self._coordinator.async_restore(
+            devices, sessions, snapshot.get("saved_at", 0.0)
+        )
+        self._saved_versions = self._index_versions()
+        _LOGGER.info(
+            "Restored %d devices from the snapshot saved %.0fs ago",
+            len(devices),
+            time.time() - snapshot.get("saved_at", 0.0),
+        )
+        return True
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule a write after a successful refresh (coordinator listener)."""
+        if not self._coordinator.last_update_success:
+            return
+        if not self._save_pending:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+        if (
+            not self._sessions_pending
+            and self._index_versions() != self._saved_versions
+        ):
+            self._sessions_pending = True
+            self._sessions_store.async_delay_save(
+                self._sessions_to_save, SNAPSHOT_SAVE_DELAY
+            )
+
+    async def async_flush(self) -> None:
+        """Write a pending snapshot now (on unload)."""
+        if self._save_pending:
+            await self._store.async_save(self._data_to_save())
+        if self._sessions_pending:
+            await self._sessions_store.async_save(self._sessions_to_save())
+
+    def _index_versions(self) -> dict[str, int]:
+        index = self._coordinator.history_index
+        return {device_id: index.version(device_id) for device_id in index.device_ids()}
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        return {
+            "saved_at": time.time(),
+            "devices": self._coordinator.data or [],
+        }
+
+    @callback
+    def _sessions_to_save(self) -> dict[str, Any]:
+        self._sessions_pending = False
+        self._saved_versions = self._index_versions()
+        index = self._coordinator.history_index
+        return {
+            "sessions": {
+                device_id: [_session_row(s) for s in index.sessions(device_id)]
+                for device_id in index.device_ids()
+            }
+        }
@@ -0,0 +1,258 @@
+"""Import charge sessions into Home Assistant long-term statistics.
+
+Each EV Station gets two external statistics, hourly charging energy
+(kWh) and estimated cost ($), so the energy dashboard can show history
+from before the integration was installed.  A per-station checkpoint
+records the last imported session and the running sums, so later syncs
+only insert hours touched by new sessions.  Sessions indexed late with
+an earlier start (a history page refetched on a later sync) change every
+later sum, so they trigger a rebuild of that station's statistics.
+Imports run as a background task in batches, never on the coordinator's
+poll path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import MAJOR_VERSION, MINOR_VERSION, UnitOfEnergy
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+from homeassistant.util.unit_conversion import EnergyConverter
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # Home Assistant < 2025.4
+    StatisticMeanType = None
+
+from .const import DOMAIN
+from .history import ChargeHistoryIndex, ChargeSession, _get_tou_rate
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Statistics rows handed to the recorder per call
+IMPORT_BATCH_SIZE = 500
+# Delay before a changed checkpoint is written to disk
+SAVE_DELAY = 30
+
+_HOUR = 3600
+
+# Statistics metadata takes a unit_class from Home Assistant 2025.10
+_HAS_UNIT_CLASS = (MAJOR_VERSION, MINOR_VERSION) >= (2025, 10)
+
+
+def statistic_ids(device_id: str) -> tuple[str, str]:
+    """Return the (energy, cost) external statistic IDs for a station."""
+    object_id = slugify(device_id)
+    return f"{DOMAIN}:energy_{object_id}", f"{DOMAIN}:cost_{object_id}"
+
+
+def _new_checkpoint() -> dict[str, float]:
+    return {
+        "last_start": 0.0,
+        # Sessions starting at or before last_start when it was imported
+        "imported": 0,
+        "last_hour": 0.0,
+        "hour_energy": 0.0,
+        "hour_cost": 0.0,
+        "sum_energy": 0.0,
+        "sum_cost": 0.0,
+    }
+
+
+def _hourly_buckets(
+    sessions: list[ChargeSession], rates: dict[str, float], floor_hour: float
+) -> dict[float, list[float]]:
+    """Spread each session's energy and cost across the hours it spans."""
+    buckets: dict[float, list[float]] = {}
+    for session in sessions:
+        cost = session.energy_kwh * rates.get(session.tou_period, 0.0)
+        start, end = session.start, session.end
+        hour = max(start - start % _HOUR, floor_hour)
+        if end <= max(start, hour):
+            # Instantaneous session, or one that ends before an hour that
+            # is already imported: book it all in a single hour.
+            bucket = buckets.setdefault(hour, [0.0, 0.0])
+            bucket[0] += session.energy_kwh
+            bucket[1] += cost
+            continue
+        start = max(start, hour)
+        duration = end - start
+        while hour < end:
+            fraction = (min(end, hour + _HOUR) - max(start, hour)) / duration
+            bucket = buckets.setdefault(hour, [0.0, 0.0])
+            bucket[0] += session.energy_kwh * fraction
+            bucket[1] += cost * fraction
+            hour += _HOUR
+    return buckets
+
+
+def _statistic_metadata(
+    name: str, statistic_id: str, unit: str, unit_class: str | None
+) -> dict[str, Any]:
+    """Metadata for a summed statistic, in the form this HA version expects."""
+    metadata: dict[str, Any] = {
+        "has_sum": True,
+        "name": name,
+        "source": DOMAIN,
+        "statistic_id": statistic_id,
+        "unit_of_measurement": unit,
+    }
+    if StatisticMeanType is not None:
+        metadata["mean_type"] = StatisticMeanType.NONE
+    else:
+        metadata["has_mean"] = False
+    if _HAS_UNIT_CLASS:
+        metadata["unit_class"] = unit_class
+    return metadata
+
+
+class ChargeStatisticsImporter:
+    """Incrementally imports charge sessions as hourly external statistics."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, index: ChargeHistoryIndex
+    ) -> None:
+        self.hass = hass
+        self._index = index
+        self._store: Store[dict[str, dict[str, float]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics"
+        )
+        self._checkpoints: dict[str, dict[str, float]] = {}
+        self._loaded = False
+        self._names: dict[str, str] = {}
+        self._task: asyncio.Task | None = None
+        self._rerun = False
+
+    async def async_load(self) -> None:
+        """Load the import checkpoints."""
+        self._checkpoints = await self._store.async_load() or {}
+        self._loaded = True
+
+    async def async_shutdown(self) -> None:
+        """Cancel a running import and flush the checkpoints."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        # Don't overwrite the stored checkpoints if they were never loaded
+        if self._loaded:
+            await self._store.async_save(self._checkpoints)
+
+    @callback
+    def async_schedule(self, names: dict[str, str] | None = None) -> None:
+        """Start a background import, or queue another pass if one is running."""
+        if names:
+            self._names.update(names)
+        if self._task and not self._task.done():
+            self._rerun = True
+            return
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"{DOMAIN} statistics import"
+        )
+
+    async def _async_run(self) -> None:
+        while True:
+            self._rerun = False
+            for device_id in list(self._index.device_ids()):
+                try:
+                    await self._async_import_station(device_id)
+                except Exception:
+                    _LOGGER.exception("Statistics import failed for %s", device_id)
+            if not self._rerun:
+                return
+
+    async def _async_import_station(self, device_id: str) -> None:
+        """Import sessions newer than the station's checkpoint."""
+        checkpoint = self._checkpoints.get(device_id) or _new_checkpoint()
+        sessions = self._index.sessions(device_id)
+        starts = [session.start for session in sessions]
+        covered = bisect_right(starts, checkpoint["last_start"])
+        # Fewer is a partial download; the sessions come back later
+        if covered > checkpoint.get("imported", covered):
+            _LOGGER.info(
+                "%d session(s) for %s arrived before the last import; "
+                "rebuilding its statistics",
+                covered - checkpoint["imported"], device_id,
+            )
+            checkpoint = _new_checkpoint()
+            covered = 0
+        new_sessions = sessions[covered:]
+        if not new_sessions:
+            return
+
+        rates = {
+            period: _get_tou_rate(period, self.hass)
+            for period in {session.tou_period for session in new_sessions}
+        }
+        last_hour = checkpoint["last_hour"]
+        buckets = _hourly_buckets(new_sessions, rates, last_hour)
+
+        # The checkpoint hour may already be in the recorder; re-emit it
+        # with the merged value rather than double counting its sum.
+        sum_energy = checkpoint["sum_energy"]
+        sum_cost = checkpoint["sum_cost"]
+        if last_hour in buckets:
+            buckets[last_hour][0] += checkpoint["hour_energy"]
+            buckets[last_hour][1] += checkpoint["hour_cost"]
+            sum_energy -= checkpoint["hour_energy"]
+            sum_cost -= checkpoint["hour_cost"]
+
+        energy_rows: list[dict[str, Any]] = []
+        cost_rows: list[dict[str, Any]] = []
+        for hour in sorted(buckets):
+            energy, cost = buckets[hour]
+            sum_energy += energy
+            sum_cost += cost
+            start = datetime.fromtimestamp(hour, tz=timezone.utc)
+            energy_rows.append(
+                {"start": start, "state": round(energy, 3), "sum": round(sum_energy, 3)}
+            )
+            cost_rows.append(
+                {"start": start, "state": round(cost, 2), "sum": round(sum_cost, 2)}
+            )
+
+        energy_id, cost_id = statistic_ids(device_id)
+        name = self._names.get(device_id, device_id)
+        energy_meta = _statistic_metadata(
+            f"{name} charging energy",
+            energy_id,
+            UnitOfEnergy.KILO_WATT_HOUR,
+            EnergyConverter.UNIT_CLASS,
+        )
+        cost_meta = _statistic_metadata(f"{name} charging cost", cost_id, "$", None)
+        for offset in range(0, len(energy_rows), IMPORT_BATCH_SIZE):
+            async_add_external_statistics(
+                self.hass, energy_meta, energy_rows[offset : offset + IMPORT_BATCH_SIZE]
+            )
+            async_add_external_statistics(
+                self.hass, cost_meta, cost_rows[offset : offset + IMPORT_BATCH_SIZE]
+            )
+            # Let the event loop breathe between batches during backfill
+            await asyncio.sleep(0)
+
+        final_hour = max(buckets)
+        self._checkpoints[device_id] = {
+            "last_start": new_sessions[-1].start,
+            "imported": len(sessions),
+            "last_hour": final_hour,
+            "hour_energy": buckets[final_hour][0],
+            "hour_cost": buckets[final_hour][1],
+            "sum_energy": sum_energy,
+            "sum_cost": sum_cost,
+        }
+        self._store.async_delay_save(lambda: self._checkpoints, SAVE_DELAY)
+        _LOGGER.debug(
+            "Imported %d session(s) into %d hourly statistic(s) for %s",
+            len(new_sessions), len(energy_rows), device_id,
+        )
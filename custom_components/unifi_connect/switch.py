@@ -5,9 +5,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .actions import resolve_action_id
 from .const import (
-    DOMAIN, DEVICE_PLATFORM_SE21,
+    DOMAIN, SHADOW_KEY_PREFIX,
     ACTION_DISPLAY_ON, ACTION_DISPLAY_OFF,
     ACTION_ENABLE_AUTO_ROTATE, ACTION_DISABLE_AUTO_ROTATE,
     ACTION_ENABLE_AUTO_RELOAD, ACTION_DISABLE_AUTO_RELOAD,
@@ -17,9 +16,9 @@ from .const import (
     EV_ACTION_ENABLE_CHARGING, EV_ACTION_DISABLE_CHARGING,
     EV_ACTION_START_LOCATING, EV_ACTION_STOP_LOCATING,
 )
-from .coordinator import _is_ev_device
-from .entity import UnifiConnectEntity
+from .entity import UnifiConnectEntity, async_setup_device_entities
 from .hub import UnifiConnectHub
+from .model import UnifiDevice
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -72,7 +71,7 @@ TOGGLE_SWITCHES = [
     },
 ]
 
-# EV Station toggle switches - action IDs resolved dynamically at init
+# EV Station toggle switches - action IDs resolved dynamically at press time
 EV_TOGGLE_SWITCHES = [
     {
         "shadow_key": "statusLightEnabled",
@@ -114,56 +113,56 @@ async def async_setup_entry(
 ) -> None:
     """Set up UniFi Connect switch entities from config entry."""
     hub: UnifiConnectHub = hass.data[DOMAIN][entry.entry_id]
-    entities: list[SwitchEntity] = []
+    async_setup_device_entities(hub, async_add_entities, _device_entities)
+
 
-    for device in hub.coordinator.data or []:
-        platform = device.get("type", {}).get("platform")
+def _device_entities(hub: UnifiConnectHub, device: UnifiDevice) -> list[SwitchEntity]:
+    """Build the switch entities for one device."""
+    entities: list[SwitchEntity] = []
 
-        # SE21 Display switches
-        if platform == DEVICE_PLATFORM_SE21:
-            shadow = device.get("shadow", {})
-            for config in TOGGLE_SWITCHES:
-                if config["shadow_key"] in shadow:
-                    entities.append(DisplayToggleSwitch(hub, device, config))
+    # SE21 Display switches
+    if device.is_display:
+        shadow = device.shadow
+        for config in TOGGLE_SWITCHES:
+            if config["shadow_key"] in shadow:
+                entities.append(DisplayToggleSwitch(hub, device, config))
 
-        # EV Station switches
-        if _is_ev_device(device):
-            shadow = device.get("shadow", {})
-            relay_shadow = device.get("relayShadow", {})
-            for config in EV_TOGGLE_SWITCHES:
-                source = shadow if config.get("source") == "shadow" else relay_shadow
-                if config["shadow_key"] in source:
-                    entities.append(EVToggleSwitch(hub, device, config))
+    # EV Station switches
+    if device.is_ev:
+        shadow = device.shadow
+        relay_shadow = device.relay_shadow
+        for config in EV_TOGGLE_SWITCHES:
+            source = shadow if config.get("source") == "shadow" else relay_shadow
+            if config["shadow_key"] in source:
+                entities.append(EVToggleSwitch(hub, device, config))
 
-    async_add_entities(entities)
+    return entities
 
 
 class DisplayToggleSwitch(UnifiConnectEntity, SwitchEntity):
     """On/Off switch for SE 21 controls."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict, config: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice, config: dict):
         super().__init__(hub, device, config["name_suffix"], config["unique_suffix"])
         self._shadow_key = config["shadow_key"]
+        self._watch(SHADOW_KEY_PREFIX + self._shadow_key)
         self._action_on = config["action_on"]
         self._action_off = config["action_off"]
         self._action_name_on = config["action_name_on"]
         self._action_name_off = config["action_name_off"]
 
-    @property
-    def is_on(self):
-        return bool(self._get_shadow().get(self._shadow_key))
+    def _update_state(self) -> None:
+        self._attr_is_on = bool(self._get_shadow().get(self._shadow_key))
 
     async def async_turn_on(self, **kwargs):
-        await self._hub.api.perform_action(
-            self._device_id, self._action_on, self._action_name_on
+        await self._async_perform_action(
+            self._action_on, self._action_name_on, optimistic={"_attr_is_on": True}
         )
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):
-        await self._hub.api.perform_action(
-            self._device_id, self._action_off, self._action_name_off
+        await self._async_perform_action(
+            self._action_off, self._action_name_off, optimistic={"_attr_is_on": False}
         )
-        await self.coordinator.async_request_refresh()
 
 
 class EVToggleSwitch(UnifiConnectEntity, SwitchEntity):
@@ -173,46 +172,44 @@ class EVToggleSwitch(UnifiConnectEntity, SwitchEntity):
     firmware updates that change UUIDs.
     """
 
-    def __init__(self, hub: UnifiConnectHub, device: dict, config: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice, config: dict):
         super().__init__(hub, device, config["name_suffix"], config["unique_suffix"])
         self._shadow_key = config["shadow_key"]
         self._action_name_on = config["action_name_on"]
         self._action_name_off = config["action_name_off"]
         self._attr_icon = config.get("icon")
         self._source = config.get("source", "shadow")
+        if self._source == "relayShadow":
+            self._watch("relayShadow")
+        else:
+            self._watch(SHADOW_KEY_PREFIX + self._shadow_key)
 
-        # Dynamically resolve action IDs
-        self._action_on = resolve_action_id(
-            device, config["action_name_on"], config.get("fallback_action_on")
-        )
-        self._action_off = resolve_action_id(
-            device, config["action_name_off"], config.get("fallback_action_off")
-        )
-
-        _LOGGER.debug(
-            "EV switch '%s': on_id=%s, off_id=%s",
-            config["name_suffix"],
-            self._action_on,
-            self._action_off,
-        )
+        # Action IDs are resolved from the action table on each press
+        self._fallback_action_on = config.get("fallback_action_on")
+        self._fallback_action_off = config.get("fallback_action_off")
 
-    @property
-    def is_on(self):
+    def _update_state(self) -> None:
         if self._source == "relayShadow":
             device = self._get_device()
             if device:
-                return bool(device.get("relayShadow", {}).get(self._shadow_key))
-            return None
-        return bool(self._get_shadow().get(self._shadow_key))
+                self._attr_is_on = bool(
+                    device.relay_shadow.get(self._shadow_key)
+                )
+            else:
+                self._attr_is_on = None
+            return
+        self._attr_is_on = bool(self._get_shadow().get(self._shadow_key))
 
     async def async_turn_on(self, **kwargs):
-        await self._hub.api.perform_action(
-            self._device_id, self._action_on, self._action_name_on
+        await self._async_perform_action(
+            self._actions().action_id(self._action_name_on, self._fallback_action_on),
+            self._action_name_on,
+            optimistic={"_attr_is_on": True},
         )
-        await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs):
-        await self._hub.api.perform_action(
-            self._device_id, self._action_off, self._action_name_off
+        await self._async_perform_action(
+            self._actions().action_id(self._action_name_off, self._fallback_action_off),
+            self._action_name_off,
+            optimistic={"_attr_is_on": False},
         )
-        await self.coordinator.async_request_refresh()
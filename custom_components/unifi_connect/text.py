@@ -6,12 +6,12 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
-    DOMAIN, DEVICE_PLATFORM_SE21, ACTION_LOAD_WEBSITE,
+    DOMAIN, SHADOW_KEY_PREFIX, ACTION_LOAD_WEBSITE,
     EV_ACTION_SET_DISPLAY_LABEL, EV_ACTION_SET_ADMIN_MESSAGE,
 )
-from .coordinator import _is_ev_device
-from .entity import UnifiConnectEntity
+from .entity import UnifiConnectEntity, async_setup_device_entities
 from .hub import UnifiConnectHub
+from .model import UnifiDevice
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,54 +45,56 @@ async def async_setup_entry(
 ) -> None:
     """Set up UniFi Connect text entities from config entry."""
     hub: UnifiConnectHub = hass.data[DOMAIN][entry.entry_id]
-    entities: list[TextEntity] = []
+    async_setup_device_entities(hub, async_add_entities, _device_entities)
+
 
-    for device in hub.coordinator.data or []:
-        platform = device.get("type", {}).get("platform")
+def _device_entities(hub: UnifiConnectHub, device: UnifiDevice) -> list[TextEntity]:
+    """Build the text entities for one device."""
+    entities: list[TextEntity] = []
 
-        # SE21 Display text entities
-        if platform == DEVICE_PLATFORM_SE21:
-            if device.get("shadow", {}).get("currentHomePage") is not None:
-                entities.append(DisplayWebUrlText(hub, device))
+    # SE21 Display text entities
+    if device.is_display:
+        if device.shadow.get("currentHomePage") is not None:
+            entities.append(DisplayWebUrlText(hub, device))
 
-        # EV Station text entities
-        if _is_ev_device(device):
-            shadow = device.get("shadow", {})
-            for config in EV_TEXT_ENTITIES:
-                if config["shadow_key"] in shadow:
-                    entities.append(EVText(hub, device, config))
+    # EV Station text entities
+    if device.is_ev:
+        shadow = device.shadow
+        for config in EV_TEXT_ENTITIES:
+            if config["shadow_key"] in shadow:
+                entities.append(EVText(hub, device, config))
 
-    async_add_entities(entities)
+    return entities
 
 
 class DisplayWebUrlText(UnifiConnectEntity, TextEntity):
     """Web URL field for SE 21."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice):
         super().__init__(hub, device, "Web URL", "web_url")
+        self._watch(SHADOW_KEY_PREFIX + "currentHomePage")
         self._attr_native_min = 0
         self._attr_native_max = 512
 
-    @property
-    def native_value(self):
-        return self._get_shadow().get("currentHomePage", "")
+    def _update_state(self) -> None:
+        self._attr_native_value = self._get_shadow().get("currentHomePage", "")
 
     async def async_set_value(self, value: str) -> None:
-        await self._hub.api.perform_action(
-            self._device_id,
+        await self._async_perform_action(
             ACTION_LOAD_WEBSITE,
             "load_website",
             {"url": value},
+            optimistic={"_attr_native_value": value},
         )
-        await self.coordinator.async_request_refresh()
 
 
 class EVText(UnifiConnectEntity, TextEntity):
     """Text input for EV Station settings using perform_action."""
 
-    def __init__(self, hub: UnifiConnectHub, device: dict, config: dict):
+    def __init__(self, hub: UnifiConnectHub, device: UnifiDevice, config: dict):
         super().__init__(hub, device, config["name_suffix"], config["unique_suffix"])
         self._shadow_key = config["shadow_key"]
+        self._watch(SHADOW_KEY_PREFIX + self._shadow_key)
         self._action_id = config["action_id"]
         self._action_name = config["action_name"]
         self._attr_icon = config.get("icon")
@@ -100,17 +102,15 @@ class EVText(UnifiConnectEntity, TextEntity):
         self._attr_native_max = config.get("max_length", 256)
         self._args_builder = config.get("args_builder")
 
-    @property
-    def native_value(self):
+    def _update_state(self) -> None:
         value = self._get_shadow().get(self._shadow_key)
-        return str(value) if value is not None else ""
+        self._attr_native_value = str(value) if value is not None else ""
 
     async def async_set_value(self, value: str) -> None:
         args = self._args_builder(value) if self._args_builder else {"value": value}
-        await self._hub.api.perform_action(
-            self._device_id,
+        await self._async_perform_action(
             self._action_id,
             self._action_name,
             args,
+            optimistic={"_attr_native_value": value},
         )
-        await self.coordinator.async_request_refresh()
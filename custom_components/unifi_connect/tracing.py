@@ -0,0 +1,187 @@
+"""Lightweight trace spans for locating latency within a refresh cycle.
+
+A refresh opens a root span whose trace ID is the cycle ID; requests,
+history pages, power stats nudges, coordinator phases and the listener
+fan-out made while it runs become its children through a context
+variable, so spans follow the awaits of the task that opened them.
+Finished traces are handed to a pluggable ``SpanExporter``.  With no
+exporter set, ``Tracer.span`` only checks one attribute.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# The JSON-lines file is rotated to <path>.1 beyond this size
+TRACE_FILE_MAX_BYTES = 10 * 1024 * 1024
+
+_current_span: ContextVar[Span | None] = ContextVar("unifi_connect_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start",
+        "duration",
+        "attributes",
+        "error",
+        "_started",
+    )
+
+    def __init__(
+        self, name: str, trace_id: str, parent_id: str | None, attributes: dict[str, Any]
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(4)
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.duration: float | None = None
+        self.attributes = attributes
+        self.error: str | None = None
+        self._started = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round((self.duration or 0.0) * 1000, 2),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class SpanExporter:
+    """Receives finished traces.
+
+    ``export`` is called in the executor with the spans of one trace,
+    children before their parents; it may block.
+    """
+
+    def export(self, spans: list[Span]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release resources once the tracer stops."""
+
+
+class JsonLinesExporter(SpanExporter):
+    """Append spans to a JSON-lines file, one span per line."""
+
+    def __init__(self, path: str, max_bytes: int = TRACE_FILE_MAX_BYTES) -> None:
+        self.path = path
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        lines = "".join(
+            json.dumps(span.as_dict(), separators=(",", ":"), default=str) + "\n"
+            for span in spans
+        )
+        with self._lock:
+            try:
+                if os.path.getsize(self.path) > self._max_bytes:
+                    os.replace(self.path, f"{self.path}.1")
+            except FileNotFoundError:
+                pass
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(lines)
+
+
+class Tracer:
+    """Creates spans and exports each trace once its root span ends."""
+
+    def __init__(self) -> None:
+        self._hass: HomeAssistant | None = None
+        self._exporter: SpanExporter | None = None
+        # trace ID -> finished spans, until the root span ends
+        self._traces: dict[str, list[Span]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._exporter is not None
+
+    def start(self, hass: HomeAssistant, exporter: SpanExporter) -> None:
+        self._hass = hass
+        self._exporter = exporter
+
+    def stop(self) -> None:
+        if self._exporter is not None:
+            self._exporter.close()
+        self._exporter = None
+        self._traces.clear()
+
+    @contextmanager
+    def span(
+        self, name: str, *, start_trace: bool = True, **attributes: Any
+    ) -> Iterator[Span | None]:
+        """Time the enclosed code as a child of the current span.
+
+        Outside any span a new trace is started, unless *start_trace* is
+        False, in which case nothing is recorded.  Yields the span (None
+        when not recording) so attributes can be added along the way.
+        """
+        if self._exporter is None:
+            yield None
+            return
+        parent = _current_span.get()
+        if parent is None:
+            if not start_trace:
+                yield None
+                return
+            span = Span(name, secrets.token_hex(8), None, attributes)
+            self._traces[span.trace_id] = []
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as err:
+            span.error = f"{type(err).__name__}: {err}"[:200]
+            raise
+        finally:
+            span.duration = time.monotonic() - span._started
+            _current_span.reset(token)
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        if span.parent_id is None:
+            spans = self._traces.pop(span.trace_id, [])
+            spans.append(span)
+        elif (trace := self._traces.get(span.trace_id)) is not None:
+            trace.append(span)
+            return
+        else:
+            # The root already ended, e.g. a task spawned from the cycle
+            spans = [span]
+        if self._exporter is not None and self._hass is not None:
+            self._hass.async_add_executor_job(self._export, self._exporter, spans)
+
+    @staticmethod
+    def _export(exporter: SpanExporter, spans: list[Span]) -> None:
+        try:
+            exporter.export(spans)
+        except Exception:
+            _LOGGER.exception("Failed to export %d trace spans", len(spans))
@@ -0,0 +1,78 @@
+"""Dedicated HTTP transport for one UniFi console."""
+
+from __future__ import annotations
+
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from homeassistant.util.ssl import client_context_no_verify
+
+from .const import DEFAULT_REFRESH_INTERVAL, MAX_CONCURRENT_REQUESTS
+
+# Scheduler slots, plus the WebSocket and a re-login made while holding a slot
+CONNECTION_LIMIT = MAX_CONCURRENT_REQUESTS + 2
+# Idle connections outlive the poll interval so each poll reuses one
+KEEPALIVE_TIMEOUT = DEFAULT_REFRESH_INTERVAL + 15
+DNS_CACHE_TTL = 300
+
+
+class ConsoleTransport:
+    """Pooled connections to one console, shared by REST and WebSocket.
+
+    The connector is bounded to what the request scheduler can use,
+    keeps connections open across polls, caches DNS and carries the
+    (cached, non-verifying) TLS context, so requests need neither
+    ``ssl=False`` nor explicit cookies.  The cookie jar accepts cookies
+    from bare IP addresses, which most consoles are reached by.
+    """
+
+    def __init__(self) -> None:
+        # connections_created, connections_reused, dns_cache_hits,
+        # dns_cache_misses
+        self.counters: Counter[str] = Counter()
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(self._count("connections_created"))
+        trace.on_connection_reuseconn.append(self._count("connections_reused"))
+        trace.on_dns_cache_hit.append(self._count("dns_cache_hits"))
+        trace.on_dns_cache_miss.append(self._count("dns_cache_misses"))
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                limit_per_host=CONNECTION_LIMIT,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                ssl=client_context_no_verify(),
+            ),
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            trace_configs=[trace],
+        )
+
+    def _count(self, counter: str):
+        async def _on_signal(
+            session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+        ) -> None:
+            self.counters[counter] += 1
+
+        return _on_signal
+
+    @property
+    def reuse_rate(self) -> float | None:
+        """Share of requests that got an already open connection."""
+        created = self.counters["connections_created"]
+        reused = self.counters["connections_reused"]
+        return reused / (created + reused) if created + reused else None
+
+    async def async_close(self) -> None:
+        await self.session.close()
+
+    def as_dict(self) -> dict[str, Any]:
+        reuse_rate = self.reuse_rate
+        return {
+            **self.counters,
+            "reuse_rate": round(reuse_rate, 3) if reuse_rate is not None else None,
+            "pool_limit": CONNECTION_LIMIT,
+            "keepalive_s": KEEPALIVE_TIMEOUT,
+        }
@@ -22,11 +22,15 @@ import json
 import logging
 import struct
 import time
+from collections import Counter
 from typing import Any, Callable
 
 import aiohttp
 
+from .breaker import CircuitBreaker
 from .const import CONTROLLER_UDMP
+from .metrics import RateWindow
+from .profiling import ProfileCapture
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,9 +40,11 @@ RECONNECT_DELAY = 5
 MAX_RECONNECT_DELAY = 60
 
 
-def parse_binary_frame(data: bytes) -> list[dict[str, Any]]:
+def parse_binary_frame(data: bytes) -> tuple[list[dict[str, Any]], int]:
     """Parse the binary-framed WebSocket message into JSON payloads.
 
+    Returns the payloads and the number of parts that failed to parse.
+
     Each part has an 8-byte header:
       byte 0: part number (1-based)
       byte 1: type/flags
@@ -49,6 +55,7 @@ def parse_binary_frame(data: bytes) -> list[dict[str, Any]]:
     big-endian value at bytes 6-7 (observed with larger MULTI messages).
     """
     parts: list[dict[str, Any]] = []
+    failures = 0
     offset = 0
     while offset + 8 <= len(data):
         # Read 8-byte header
@@ -73,13 +80,14 @@ def parse_binary_frame(data: bytes) -> list[dict[str, Any]]:
             payload_json = json.loads(payload_str)
             parts.append(payload_json)
         except (UnicodeDecodeError, json.JSONDecodeError) as err:
+            failures += 1
             _LOGGER.debug(
                 "Failed to parse WS frame part at offset %d: %s", offset, err
             )
 
         offset = payload_end
 
-    return parts
+    return parts, failures
 
 
 class UnifiConnectWebSocket:
@@ -90,23 +98,38 @@ class UnifiConnectWebSocket:
         host: str,
         session: aiohttp.ClientSession,
         controller_type: str = CONTROLLER_UDMP,
-        on_power_stats: Callable[[dict[str, Any]], None] | None = None,
-        get_cookies: Callable[[], Any] | None = None,
+        on_power_stats: Callable[[str, dict[str, Any]], None] | None = None,
+        on_device_updated: Callable[[str], None] | None = None,
+        breaker: CircuitBreaker | None = None,
     ):
         self._host = host
         self._session = session
         self._controller_type = controller_type
         self._on_power_stats = on_power_stats
-        self._get_cookies = get_cookies
+        self._on_device_updated = on_device_updated
+        self._breaker = breaker
 
         self._ws: aiohttp.ClientWebSocketResponse | None = None
         self._task: asyncio.Task | None = None
         self._running = False
         self._reconnect_delay = RECONNECT_DELAY
 
+        # time.monotonic() of the first successful connect (startup timing)
+        self.first_connected_at: float | None = None
+
+        # connects, messages, bytes, power_stats, device_updated,
+        # parse_failures
+        self.counters: Counter[str] = Counter()
+        self.rate = RateWindow()
+        # time.monotonic() of the latest power stats message
+        self.last_power_at: float | None = None
+
         # Latest power data per device ID
         self.power_data: dict[str, dict[str, Any]] = {}
 
+        # Set by the profile service while messages are profiled
+        self.profile: ProfileCapture | None = None
+
     @property
     def connected(self) -> bool:
         """Return True if WebSocket is connected."""
@@ -157,57 +180,33 @@ class UnifiConnectWebSocket:
             if not self._running:
                 break
 
-            await asyncio.sleep(self._reconnect_delay)
+            # Don't add reconnect load while the REST breaker is open
+            delay = self._reconnect_delay
+            if self._breaker:
+                delay = max(delay, self._breaker.retry_after())
+            await asyncio.sleep(delay)
             # Exponential backoff
             self._reconnect_delay = min(
                 self._reconnect_delay * 2, MAX_RECONNECT_DELAY
             )
 
-    def _build_cookie_header(self) -> dict[str, str] | None:
-        """Build a Cookie header from the API's stored cookies.
-
-        aiohttp's default CookieJar (unsafe=False) silently drops
-        cookies for bare IP addresses per RFC 2109.  The REST API works
-        because it passes cookies explicitly on every request, but
-        ws_connect relies on the jar — so we must inject them manually.
-        """
-        if not self._get_cookies:
-            return None
-        cookies = self._get_cookies()
-        if not cookies:
-            return None
-        try:
-            cookie_str = "; ".join(
-                f"{k}={v.value}" for k, v in cookies.items()
-            )
-            _LOGGER.debug(
-                "Injecting %d cookie(s) into WebSocket headers", len(cookies)
-            )
-            return {"Cookie": cookie_str}
-        except Exception as err:
-            _LOGGER.warning("Failed to build cookie header: %s", err)
-            return None
-
     async def _connect_and_listen(self) -> None:
         """Connect to WebSocket and process messages."""
         url = self._get_ws_url()
         _LOGGER.debug("Connecting to UniFi Connect WebSocket: %s", url)
 
-        headers = self._build_cookie_header() or {}
-
         try:
-            self._ws = await self._session.ws_connect(
-                url,
-                ssl=False,
-                heartbeat=30,
-                headers=headers,
-            )
+            # TLS and the session cookie come from the shared console transport
+            self._ws = await self._session.ws_connect(url, heartbeat=30)
         except Exception as err:
             _LOGGER.warning("WebSocket connection failed: %s", err)
             raise
 
         _LOGGER.info("UniFi Connect WebSocket connected")
+        self.counters["connects"] += 1
         self._reconnect_delay = RECONNECT_DELAY  # Reset backoff on success
+        if self.first_connected_at is None:
+            self.first_connected_at = time.monotonic()
 
         # Send the handshake message
         handshake = json.dumps(
@@ -224,9 +223,17 @@ class UnifiConnectWebSocket:
         try:
             async for msg in self._ws:
                 if msg.type == aiohttp.WSMsgType.BINARY:
-                    self._process_binary_message(msg.data)
+                    self._count_message(len(msg.data))
+                    if self.profile is None:
+                        self._process_binary_message(msg.data)
+                    else:
+                        self._process_profiled(self._process_binary_message, msg.data)
                 elif msg.type == aiohttp.WSMsgType.TEXT:
-                    self._process_text_message(msg.data)
+                    self._count_message(len(msg.data))
+                    if self.profile is None:
+                        self._process_text_message(msg.data)
+                    else:
+                        self._process_profiled(self._process_text_message, msg.data)
                 elif msg.type == aiohttp.WSMsgType.ERROR:
                     _LOGGER.warning(
                         "WebSocket error: %s", self._ws.exception()
@@ -247,15 +254,35 @@ class UnifiConnectWebSocket:
         if self._ws and not self._ws.closed:
             await self._ws.close()
 
+    def _count_message(self, size: int) -> None:
+        self.counters["messages"] += 1
+        self.counters["bytes"] += size
+        self.rate.add(size)
+
+    def _process_profiled(self, handler: Callable[[Any], None], data: Any) -> None:
+        """Handle a message under the profiler until its window closes."""
+        profile = self.profile
+        if not profile.websocket_active:
+            self.profile = None
+            handler(data)
+            return
+        with profile.capture():
+            handler(data)
+        profile.messages_profiled += 1
+
     def _process_binary_message(self, data: bytes) -> None:
         """Parse a binary WebSocket message and extract power data."""
-        parts = parse_binary_frame(data)
-        if len(parts) < 2:
+        parts, failures = parse_binary_frame(data)
+        if failures:
+            self.counters["parse_failures"] += failures
+        if not parts or not isinstance(parts[0], dict):
             return
 
         envelope = parts[0]
-        payload = parts[1]
+        payload = parts[1] if len(parts) > 1 else None
         event_name = envelope.get("name", "")
+        if payload is None and event_name != "DEVICE_UPDATED":
+            return
 
         if event_name == "EV_POWER_STATS":
             self._handle_power_stats(payload)
@@ -266,7 +293,13 @@ class UnifiConnectWebSocket:
             elif isinstance(payload, dict):
                 self._handle_power_stats(payload)
         elif event_name == "DEVICE_UPDATED":
-            _LOGGER.debug("Device updated event: %s", envelope.get("id"))
+            self.counters["device_updated"] += 1
+            device_id = envelope.get("id")
+            if not device_id and isinstance(payload, dict):
+                device_id = payload.get("id")
+            _LOGGER.debug("Device updated event: %s", device_id)
+            if device_id and self._on_device_updated:
+                self._on_device_updated(device_id)
 
     def _process_text_message(self, data: str) -> None:
         """Handle a text WebSocket message (rarely used)."""
@@ -274,6 +307,7 @@ class UnifiConnectWebSocket:
             msg = json.loads(data)
             _LOGGER.debug("WebSocket text message: %s", msg.get("type"))
         except json.JSONDecodeError:
+            self.counters["parse_failures"] += 1
             _LOGGER.debug("WebSocket non-JSON text: %s", data[:100])
 
     def _handle_power_stats(self, stats: dict[str, Any]) -> None:
@@ -281,6 +315,8 @@ class UnifiConnectWebSocket:
         device_id = stats.get("id")
         if not device_id:
             return
+        self.counters["power_stats"] += 1
+        self.last_power_at = time.monotonic()
 
         self.power_data[device_id] = {
             "instantKW": stats.get("instantKW"),
@@ -294,4 +330,4 @@ class UnifiConnectWebSocket:
         }
 
         if self._on_power_stats:
-            self._on_power_stats(self.power_data[device_id])
+            self._on_power_stats(device_id, self.power_data[device_id])
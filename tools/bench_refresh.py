@@ -0,0 +1,341 @@
+"""Coordinator refresh benchmark against the console simulator.
+
+Measures a cold start (login, first refresh and the deferred history
+sync) and steady-state refresh cycles for each fleet size and charge
+history size.  Every phase reports:
+
+  wall_ms            elapsed time
+  requests           REST requests the console answered
+  bytes_in/out       response / request body bytes at the console
+  peak_kib           peak Python memory allocated during the phase
+  retained_kib       memory still allocated after the phase
+  loop_max_block_ms  longest event loop stall
+  loop_blocked_ms    total time the loop was stalled > 10 ms
+
+The simulator runs in a separate process so its work doesn't count.
+Memory is measured in a second pass with tracemalloc on, since tracing
+slows the timed pass down.  Results are written as JSON; pass an older
+results file as --baseline to flag regressions.
+
+    python tools/bench_refresh.py --output bench_refresh.json
+    python tools/bench_refresh.py --baseline bench_refresh.json
+
+Requires Home Assistant and aiohttp (the coordinator is a
+DataUpdateCoordinator), plus the ``openssl`` CLI for the simulator.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+SIMULATOR = Path(__file__).resolve().parent / "console_simulator.py"
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.const import __version__ as HA_VERSION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import frame  # noqa: E402
+
+from custom_components.unifi_connect.api import UnifiConnectAPI  # noqa: E402
+from custom_components.unifi_connect.coordinator import (  # noqa: E402
+    UnifiConnectCoordinator,
+)
+from custom_components.unifi_connect.transport import ConsoleTransport  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_STATIONS = (1, 10, 50)
+DEFAULT_SESSIONS = (100, 5000, 50000)
+# Relative increase of these metrics that counts as a regression
+REGRESSION_METRICS = ("wall_ms", "requests", "bytes_in", "peak_kib", "loop_max_block_ms")
+LAG_INTERVAL = 0.005
+LAG_THRESHOLD = 0.010
+
+
+class LoopLagMonitor:
+    """Measure event loop stalls by timing a short repeating sleep."""
+
+    def __init__(self) -> None:
+        self.max_lag = 0.0
+        self.blocked = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LAG_INTERVAL)
+            lag = time.perf_counter() - started - LAG_INTERVAL
+            self.max_lag = max(self.max_lag, lag)
+            if lag > LAG_THRESHOLD:
+                self.blocked += lag
+
+    async def __aenter__(self) -> LoopLagMonitor:
+        self._task = asyncio.create_task(self._run())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+@asynccontextmanager
+async def simulator(stations: int, sessions: int) -> AsyncIterator[tuple[str, str]]:
+    """Run the simulator in a subprocess; yield (host, base URL)."""
+    per_station = max(1, sessions // stations)
+    process = subprocess.Popen(
+        [
+            sys.executable, str(SIMULATOR), "--port", "0",
+            "--ev-stations", str(stations), "--displays", "0",
+            "--history", str(per_station), "--power-interval", "0",
+            "--seed", "1",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        line = await asyncio.get_running_loop().run_in_executor(
+            None, process.stdout.readline
+        )
+        match = re.search(r"at (https?)://(\S+)", line)
+        if not match:
+            raise RuntimeError(f"Simulator failed to start: {line!r}")
+        yield match.group(2), f"{match.group(1)}://{match.group(2)}"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def _console_stats(session: aiohttp.ClientSession, base_url: str) -> dict:
+    async with session.get(f"{base_url}/sim/stats", ssl=False) as resp:
+        return await resp.json()
+
+
+async def measure(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    work: Callable[[], Awaitable[None]],
+    trace_memory: bool,
+) -> dict[str, float]:
+    """Run *work* once and return its metrics."""
+    async with session.post(f"{base_url}/sim/reset", ssl=False):
+        pass
+    result: dict[str, float] = {}
+    if trace_memory:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await work()
+        current, peak = tracemalloc.get_traced_memory()
+        result["peak_kib"] = round((peak - before) / 1024, 1)
+        result["retained_kib"] = round((current - before) / 1024, 1)
+        return result
+
+    async with LoopLagMonitor() as monitor:
+        started = time.perf_counter()
+        await work()
+        result["wall_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    stats = await _console_stats(session, base_url)
+    result["requests"] = stats.get("requests", 0)
+    result["bytes_in"] = stats.get("bytes_sent", 0)
+    result["bytes_out"] = stats.get("bytes_received", 0)
+    result["loop_max_block_ms"] = round(monitor.max_lag * 1000, 1)
+    result["loop_blocked_ms"] = round(monitor.blocked * 1000, 1)
+    return result
+
+
+async def run_pass(
+    hass: HomeAssistant, host: str, base_url: str, cycles: int, trace_memory: bool
+) -> tuple[dict[str, float], list[dict[str, float]]]:
+    """One cold start followed by *cycles* steady-state refreshes."""
+    transport = ConsoleTransport()
+    async with aiohttp.ClientSession() as session:
+        api = UnifiConnectAPI(host, "admin", "simulator", session=transport.session)
+        coordinator = UnifiConnectCoordinator(hass, api)
+
+        async def cold_start() -> None:
+            if not await api.login():
+                raise RuntimeError("Login to simulator failed")
+            await coordinator.async_refresh()
+            await coordinator.async_sync_history()
+
+        async def refresh() -> None:
+            await coordinator.async_refresh()
+
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            cold = await measure(session, base_url, cold_start, trace_memory)
+            if not coordinator.last_update_success:
+                raise RuntimeError("Cold start refresh failed")
+            steady = [
+                await measure(session, base_url, refresh, trace_memory)
+                for _ in range(cycles)
+            ]
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+            await transport.async_close()
+        return cold, steady
+
+
+def _median(samples: list[dict[str, float]]) -> dict[str, float]:
+    return {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+
+async def run_scenario(
+    hass: HomeAssistant, stations: int, sessions: int, cycles: int
+) -> dict[str, Any]:
+    async with simulator(stations, sessions) as (host, base_url):
+        cold, steady = await run_pass(hass, host, base_url, cycles, False)
+        cold_mem, steady_mem = await run_pass(hass, host, base_url, 1, True)
+    cold.update(cold_mem)
+    steady_summary = _median(steady)
+    steady_summary.update(steady_mem[0])
+    return {
+        "stations": stations,
+        "sessions": max(1, sessions // stations) * stations,
+        "cold": cold,
+        "steady": steady_summary,
+        "steady_wall_ms_samples": [s["wall_ms"] for s in steady],
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a line per metric that grew more than *threshold* (a fraction)."""
+    previous = {(s["stations"], s["sessions"]): s for s in baseline.get("scenarios", [])}
+    regressions = []
+    for scenario in results["scenarios"]:
+        old = previous.get((scenario["stations"], scenario["sessions"]))
+        if old is None:
+            continue
+        for phase in ("cold", "steady"):
+            for metric in REGRESSION_METRICS:
+                new_value = scenario[phase].get(metric)
+                old_value = old.get(phase, {}).get(metric)
+                if not old_value or new_value is None:
+                    continue
+                change = (new_value - old_value) / old_value
+                if change > threshold:
+                    regressions.append(
+                        f"{scenario['stations']} stations / {scenario['sessions']} "
+                        f"sessions {phase} {metric}: {old_value} -> {new_value} "
+                        f"(+{change:.0%})"
+                    )
+    return regressions
+
+
+def _print_table(results: dict) -> None:
+    header = (
+        f"{'stations':>8} {'sessions':>8} {'phase':>6} {'wall_ms':>9} {'requests':>8} "
+        f"{'bytes_in':>10} {'peak_kib':>9} {'max_block':>9}"
+    )
+    print(header)
+    for scenario in results["scenarios"]:
+        for phase in ("cold", "steady"):
+            m = scenario[phase]
+            print(
+                f"{scenario['stations']:>8} {scenario['sessions']:>8} {phase:>6} "
+                f"{m['wall_ms']:>9.1f} {m['requests']:>8.0f} {m['bytes_in']:>10.0f} "
+                f"{m['peak_kib']:>9.1f} {m['loop_max_block_ms']:>9.1f}"
+            )
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+async def async_main(args: argparse.Namespace) -> dict[str, Any]:
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="unifi-bench-"))
+    frame.async_setup(hass)
+    scenarios = []
+    try:
+        for stations in args.stations:
+            for sessions in args.sessions:
+                _LOGGER.warning("Running %d stations / %d sessions", stations, sessions)
+                scenarios.append(
+                    await run_scenario(hass, stations, sessions, args.cycles)
+                )
+    finally:
+        await hass.async_stop(force=True)
+    manifest = json.loads(
+        (ROOT / "custom_components" / "unifi_connect" / "manifest.json").read_text()
+    )
+    return {
+        "benchmark": "coordinator_refresh",
+        "version": manifest.get("version"),
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "homeassistant": HA_VERSION,
+        "cycles": args.cycles,
+        "scenarios": scenarios,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--stations", type=_int_list, default=list(DEFAULT_STATIONS))
+    parser.add_argument("--sessions", type=_int_list, default=list(DEFAULT_SESSIONS))
+    parser.add_argument("--cycles", type=int, default=3, help="steady-state refreshes")
+    parser.add_argument("--output", default="bench_refresh.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="regression threshold (fraction)"
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s %(name)s %(message)s",
+    )
+    if not args.verbose:
+        logging.getLogger("custom_components.unifi_connect").setLevel(logging.ERROR)
+
+    results = asyncio.run(async_main(args))
+    Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    _print_table(results)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""Entity state-write and recorder-load benchmark.
+
+Runs the integration in a test Home Assistant instance against the
+console simulator for a number of simulated hours.  The simulator
+pushes power stats every few simulated seconds and the coordinator
+polls every refresh interval, with charge sessions starting and
+finishing along the way.  Simulated time only drives those pushes and
+polls; other timers follow the wall clock and barely fire.
+
+Per entity it reports:
+
+  writes             state writes the entities made
+  changes            writes that changed something (one ``states`` row each)
+  attr_bytes         serialized attributes per change, as recorded
+  attribute_rows     distinct attribute blobs (``state_attributes`` rows)
+
+Recorder rows are counted from a real recorder writing to a SQLite
+file in a temporary config directory.  Statistics are compiled every
+five minutes of wall time, so the short and long term statistics rows
+a full run would add are estimated from the number of sensors with a
+state class.
+
+    python tools/bench_states.py --hours 6 --stations 4
+    python tools/bench_states.py --all-entities --output bench_states.json
+
+Requires Home Assistant and pytest-homeassistant-custom-component (for
+the test instance), plus the ``openssl`` CLI for the simulator.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from homeassistant import loader  # noqa: E402
+from homeassistant.components import recorder  # noqa: E402
+from homeassistant.components.recorder.db_schema import (  # noqa: E402
+    States,
+    StateAttributes,
+    Statistics,
+    StatisticsMeta,
+    StatisticsShortTerm,
+)
+from homeassistant.components.recorder.util import session_scope  # noqa: E402
+from homeassistant.const import (  # noqa: E402
+    EVENT_STATE_CHANGED,
+    __version__ as HA_VERSION,
+)
+from homeassistant.core import Event, HomeAssistant  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    aiohttp_client,
+    entity_registry as er,
+    frame,
+    recorder as recorder_helper,
+)
+from homeassistant.helpers.entity import Entity  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+from pytest_homeassistant_custom_component.components.recorder.common import (  # noqa: E402
+    async_wait_recording_done,
+)
+
+from console_simulator import ConsoleSimulator, SimulatorConfig  # noqa: E402
+from custom_components.unifi_connect.const import (  # noqa: E402
+    DEFAULT_REFRESH_INTERVAL,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+POWER_INTERVAL = 3
+# Statistics the recorder compiles per sensor with a state class, per hour
+SHORT_TERM_PER_HOUR = 12
+LONG_TERM_PER_HOUR = 1
+
+
+class StateWriteCounter:
+    """Count state writes and recorded changes for a set of entities."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.entity_ids: set[str] = set()
+        self.writes: Counter[str] = Counter()
+        self.changes: Counter[str] = Counter()
+        self.attr_bytes: Counter[str] = Counter()
+        self.max_attr_bytes: Counter[str] = Counter()
+        self.oversized: Counter[str] = Counter()
+        self.attribute_hashes: dict[str, set[int]] = defaultdict(set)
+        self.all_attribute_hashes: set[int] = set()
+        self.state_classes: dict[str, str] = {}
+        self._unsub: Callable[[], None] | None = None
+        self._original_write: Callable[[Entity], None] | None = None
+
+    def start(self, entity_ids: set[str]) -> None:
+        self.entity_ids = entity_ids
+        self._original_write = original = Entity._async_write_ha_state
+        writes = self.writes
+
+        def counting_write(entity: Entity) -> None:
+            if entity.entity_id in entity_ids:
+                writes[entity.entity_id] += 1
+            original(entity)
+
+        Entity._async_write_ha_state = counting_write
+        self._unsub = self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._on_change)
+
+    def stop(self) -> None:
+        if self._unsub:
+            self._unsub()
+        if self._original_write:
+            Entity._async_write_ha_state = self._original_write
+        for entity_id in self.entity_ids:
+            state = self.hass.states.get(entity_id)
+            if state and (state_class := state.attributes.get("state_class")):
+                self.state_classes[entity_id] = state_class
+
+    def _on_change(self, event: Event) -> None:
+        entity_id = event.data["entity_id"]
+        if entity_id not in self.entity_ids or event.data["new_state"] is None:
+            return
+        self.changes[entity_id] += 1
+        shared = StateAttributes.shared_attrs_bytes_from_event(event, None)
+        if shared == b"{}" and event.data["new_state"].attributes:
+            self.oversized[entity_id] += 1
+        self.attr_bytes[entity_id] += len(shared)
+        self.max_attr_bytes[entity_id] = max(self.max_attr_bytes[entity_id], len(shared))
+        attrs_hash = StateAttributes.hash_shared_attrs_bytes(shared)
+        self.attribute_hashes[entity_id].add(attrs_hash)
+        # The recorder shares identical attribute rows between entities
+        self.all_attribute_hashes.add(attrs_hash)
+
+
+async def _wait_until(predicate: Callable[[], bool], timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise RuntimeError("Timed out waiting for the integration")
+        await asyncio.sleep(0.001)
+
+
+def _count_rows(hass: HomeAssistant) -> dict[str, int]:
+    with session_scope(hass=hass, read_only=True) as session:
+        return {
+            "states": session.query(States).count(),
+            "state_attributes": session.query(StateAttributes).count(),
+            "statistics_meta": session.query(StatisticsMeta).count(),
+            "statistics": session.query(Statistics).count(),
+            "statistics_short_term": session.query(StatisticsShortTerm).count(),
+        }
+
+
+async def _recorder_rows(hass: HomeAssistant) -> dict[str, int]:
+    await async_wait_recording_done(hass)
+    instance = recorder.get_instance(hass)
+    return await instance.async_add_executor_job(_count_rows, hass)
+
+
+async def _setup_entry(
+    hass: HomeAssistant, sim: ConsoleSimulator, all_entities: bool
+) -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title=sim.host,
+        data={
+            "host": sim.host,
+            "username": sim.username,
+            "password": sim.password,
+            "controller_type": "udmp",
+        },
+    )
+    entry.add_to_hass(hass)
+    if not await hass.config_entries.async_setup(entry.entry_id):
+        raise RuntimeError("Config entry setup failed")
+    await hass.async_block_till_done(wait_background_tasks=True)
+    if all_entities:
+        registry = er.async_get(hass)
+        for entity in er.async_entries_for_config_entry(registry, entry.entry_id):
+            if entity.disabled_by is not None:
+                registry.async_update_entity(entity.entity_id, disabled_by=None)
+        await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+    return entry
+
+
+async def simulate(
+    hass: HomeAssistant, sim: ConsoleSimulator, hub: Any, hours: float
+) -> None:
+    """Advance simulated time, pushing power and polling like a console would."""
+    coordinator = hub.coordinator
+    websocket = hub.websocket
+    started = time.time()
+    steps = int(hours * 3600 / POWER_INTERVAL)
+    poll_every = max(1, DEFAULT_REFRESH_INTERVAL // POWER_INTERVAL)
+    for step in range(1, steps + 1):
+        now = started + step * POWER_INTERVAL
+        if step % poll_every == 0:
+            sim.tick(DEFAULT_REFRESH_INTERVAL, now)
+            await coordinator.async_refresh()
+        payloads = await sim.push_power(now)
+        await _wait_until(
+            lambda payloads=payloads: all(
+                websocket.power_data.get(p["id"], {}).get("duration") == p["duration"]
+                for p in payloads
+            )
+        )
+        await hass.async_block_till_done()
+        if step % (3600 // POWER_INTERVAL) == 0:
+            _LOGGER.warning("Simulated %d of %g hours", step * POWER_INTERVAL // 3600, hours)
+
+
+def _report(
+    counter: StateWriteCounter, rows: dict[str, int], hours: float
+) -> dict[str, Any]:
+    entities = []
+    for entity_id in sorted(counter.entity_ids):
+        changes = counter.changes[entity_id]
+        entities.append(
+            {
+                "entity_id": entity_id,
+                "writes": counter.writes[entity_id],
+                "writes_per_hour": round(counter.writes[entity_id] / hours, 1),
+                "changes": changes,
+                "attr_bytes_total": counter.attr_bytes[entity_id],
+                "attr_bytes_per_change": (
+                    round(counter.attr_bytes[entity_id] / changes, 1) if changes else 0
+                ),
+                "attr_bytes_max": counter.max_attr_bytes[entity_id],
+                "attribute_rows": len(counter.attribute_hashes[entity_id]),
+                "oversized": counter.oversized[entity_id],
+                "state_class": counter.state_classes.get(entity_id),
+            }
+        )
+    entities.sort(key=lambda e: e["attr_bytes_total"], reverse=True)
+    statistic_sensors = len(counter.state_classes)
+    return {
+        "entities": entities,
+        "totals": {
+            "entities": len(entities),
+            "writes": sum(counter.writes.values()),
+            "changes": sum(counter.changes.values()),
+            "attr_bytes": sum(counter.attr_bytes.values()),
+            "attribute_rows": len(counter.all_attribute_hashes),
+            "statistic_sensors": statistic_sensors,
+        },
+        "recorder_rows": rows,
+        "statistics_rows_estimated": {
+            "statistics_short_term": round(statistic_sensors * SHORT_TERM_PER_HOUR * hours),
+            "statistics": round(statistic_sensors * LONG_TERM_PER_HOUR * hours),
+        },
+    }
+
+
+async def async_main(args: argparse.Namespace) -> dict[str, Any]:
+    config_dir = tempfile.mkdtemp(prefix="unifi-bench-states-")
+    os.symlink(ROOT / "custom_components", Path(config_dir) / "custom_components")
+    sim_config = SimulatorConfig(
+        ev_stations=args.stations,
+        displays=args.displays,
+        sessions_per_station=args.history,
+        power_interval=0,
+        seed=args.seed,
+    )
+    async with (
+        async_test_home_assistant(config_dir=config_dir) as hass,
+        ConsoleSimulator(sim_config) as sim,
+    ):
+        # Use the integration from this checkout, not a mocked loader
+        hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+        frame.async_setup(hass)
+        # The default resolver needs zeroconf; the simulator is an IP address
+        hass.data[aiohttp_client.DATA_RESOLVER] = aiohttp.ThreadedResolver()
+        # The WebSocket API needs the HTTP server; nothing here calls it
+        hass.config.components.update({"http", "websocket_api"})
+        # Bootstrap does this before any integration is set up
+        recorder_helper.async_initialize_recorder(hass)
+        if not await async_setup_component(hass, "recorder", {"recorder": {}}):
+            raise RuntimeError("Recorder setup failed")
+        entry = await _setup_entry(hass, sim, args.all_entities)
+        hub = hass.data[DOMAIN][entry.entry_id]
+        await _wait_until(lambda: hub.websocket.connected)
+
+        entity_ids = {
+            e.entity_id
+            for e in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+            if e.disabled_by is None
+        }
+        baseline = await _recorder_rows(hass)
+        counter = StateWriteCounter(hass)
+        counter.start(entity_ids)
+        started = time.perf_counter()
+        try:
+            await simulate(hass, sim, hub, args.hours)
+        finally:
+            counter.stop()
+        wall = time.perf_counter() - started
+        rows = await _recorder_rows(hass)
+        # The test instance doesn't stop itself (or the recorder thread)
+        await hass.async_stop(force=True)
+
+    report = _report(
+        counter, {table: rows[table] - baseline[table] for table in rows}, args.hours
+    )
+    manifest = json.loads(
+        (ROOT / "custom_components" / "unifi_connect" / "manifest.json").read_text()
+    )
+    return {
+        "benchmark": "entity_states",
+        "version": manifest.get("version"),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "homeassistant": HA_VERSION,
+        "hours": args.hours,
+        "stations": args.stations,
+        "displays": args.displays,
+        "all_entities": args.all_entities,
+        "wall_s": round(wall, 1),
+        **report,
+    }
+
+
+def _print_table(results: dict, limit: int) -> None:
+    print(
+        f"{'entity':<58} {'writes/h':>9} {'changes':>8} {'bytes/chg':>9} "
+        f"{'attr_rows':>9}"
+    )
+    for e in results["entities"][:limit]:
+        print(
+            f"{e['entity_id']:<58} {e['writes_per_hour']:>9.1f} {e['changes']:>8} "
+            f"{e['attr_bytes_per_change']:>9.1f} {e['attribute_rows']:>9}"
+        )
+    totals = results["totals"]
+    hours = results["hours"]
+    print(
+        f"\n{totals['entities']} entities over {hours:g} simulated hours: "
+        f"{totals['writes']} writes, {totals['changes']} changes, "
+        f"{totals['attr_bytes'] / 1024:.1f} KiB of attributes"
+    )
+    print(f"Recorder rows: {results['recorder_rows']}")
+    print(f"Statistics rows (estimated): {results['statistics_rows_estimated']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hours", type=float, default=6, help="simulated hours")
+    parser.add_argument("--stations", type=int, default=4)
+    parser.add_argument("--displays", type=int, default=1)
+    parser.add_argument("--history", type=int, default=50, help="sessions per station")
+    parser.add_argument(
+        "--all-entities", action="store_true", help="enable disabled-by-default entities"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--top", type=int, default=20, help="entities to print")
+    parser.add_argument("--output", default="bench_states.json")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s %(name)s %(message)s",
+    )
+    if not args.verbose:
+        logging.getLogger("custom_components.unifi_connect").setLevel(logging.ERROR)
+
+    results = asyncio.run(async_main(args))
+    Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    _print_table(results, args.top)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,759 @@
+"""Stand-in UniFi Connect console for benchmarks and regression runs.
+
+Serves the endpoints the integration uses, with a generated fleet:
+
+  POST  /api/auth/login (and /api/login)         cookie + x-csrf-token
+  GET   /proxy/connect/api/v2/devices?shadow=true
+  GET   /proxy/connect/api/v2/devices/{id}?shadow=true
+  PATCH /proxy/connect/api/v2/devices/{id}/status  perform an action
+  GET   /proxy/connect/api/v2/stats/evs/chargingHistory?offset=&limit=
+  WS    /proxy/connect/                           binary-framed pushes
+
+The REST routes are also served without the ``/proxy/connect`` prefix
+for the non-UDMP controller layout.  Fleet size, history size, response
+latency, injected error rate and the power-stream interval are all
+configurable, and every request is counted in ``ConsoleSimulator.stats``
+(also served at ``GET /sim/stats``; ``POST /sim/reset`` clears it).
+
+Run standalone (TLS with a throwaway self-signed certificate):
+
+    python tools/console_simulator.py --ev-stations 20 --port 8443
+
+then add the integration with host ``127.0.0.1:8443`` and the printed
+credentials.  Benchmarks use it in-process instead:
+
+    async with ConsoleSimulator(SimulatorConfig(ev_stations=50)) as sim:
+        ...  # sim.host, sim.username, sim.password
+
+Only aiohttp is required; the ``openssl`` CLI is used to create the
+certificate when none is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import secrets
+import ssl
+import struct
+import subprocess
+import tempfile
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+_LOGGER = logging.getLogger(__name__)
+
+PLATFORM_EV = "EVS"
+PLATFORM_DISPLAY = "UC-Display-SE-21"
+FIRMWARE_VERSION = "1.6.4"
+SESSION_COOKIE = "TOKEN"
+# Mean charge session and idle durations used by tick(), in seconds
+SESSION_LENGTH = 2 * 3600
+IDLE_LENGTH = 4 * 3600
+
+# Action name -> shadow effect.  "value" is the fixed value an action
+# writes; without it the first argument value is written.  "section"
+# selects a device section other than the shadow.
+EV_ACTIONS = [
+    {"name": "switch_ev_station_mode", "key": "evStationMode", "arg": "evStationMode"},
+    {"name": "set_max_output_amp", "key": "maxOutput", "arg": "maxOutput"},
+    {"name": "set_fallback_security", "key": "fallbackSecurity", "arg": "evStationMode"},
+    {"name": "set_breaker_amp", "key": "breakerAm", "arg": "breakerAm", "section": "extraInfo"},
+    {"name": "enable_status_light", "key": "statusLightEnabled", "value": True},
+    {"name": "disable_status_light", "key": "statusLightEnabled", "value": False},
+    {"name": "enable_charging", "key": "enabledCharging", "value": True},
+    {"name": "disable_charging", "key": "enabledCharging", "value": False},
+    {"name": "start_locating", "key": "locating", "value": True, "section": "relayShadow"},
+    {"name": "stop_locating", "key": "locating", "value": False, "section": "relayShadow"},
+    {"name": "brightness", "key": "brightness", "arg": "value"},
+    {"name": "set_display_label", "key": "displayLabel", "arg": "value"},
+    {"name": "set_admin_message", "key": "adminMessage", "arg": "value"},
+    {"name": "enable_admin_message", "key": "adminMessageEnabled", "value": True},
+    {"name": "disable_admin_message", "key": "adminMessageEnabled", "value": False},
+    {"name": "reboot"},
+    {"name": "power_stats_single"},
+]
+
+DISPLAY_ACTIONS = [
+    {"name": "display_on", "key": "display", "value": True},
+    {"name": "display_off", "key": "display", "value": False},
+    {"name": "enable_auto_rotate", "key": "autoRotate", "value": True},
+    {"name": "disable_auto_rotate", "key": "autoRotate", "value": False},
+    {"name": "enable_auto_reload", "key": "autoReload", "value": True},
+    {"name": "disable_auto_reload", "key": "autoReload", "value": False},
+    {"name": "enable_sleep", "key": "sleepMode", "value": True},
+    {"name": "disable_sleep", "key": "sleepMode", "value": False},
+    {"name": "enable_auto_sleep", "key": "autoSleep", "value": True},
+    {"name": "disable_auto_sleep", "key": "autoSleep", "value": False},
+    {"name": "brightness", "key": "brightness", "arg": "value"},
+    {"name": "volume", "key": "volume", "arg": "value"},
+    {"name": "mode_switch", "key": "mode", "arg": "value"},
+    {"name": "launch_app", "key": "selectedApp", "arg": "value"},
+    {"name": "load_website", "key": "currentHomePage", "arg": "url"},
+    {"name": "refresh_website"},
+]
+
+EV_MODES = ["Standalone", "Access", "Always On"]
+DISPLAY_MODES = ["web", "app", "signage"]
+DISPLAY_APPS = ["com.ui.connect", "com.android.chrome"]
+
+
+@dataclass
+class SimulatorConfig:
+    """Fleet shape and fault injection for a simulator run."""
+
+    ev_stations: int = 4
+    displays: int = 1
+    # Charge sessions generated per EV Station
+    sessions_per_station: int = 200
+    # Added to every REST response (seconds), plus up to latency_jitter
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # Fraction of REST requests (login excluded) answered with a 500
+    error_rate: float = 0.0
+    # Seconds between power pushes on each WebSocket (0 disables them)
+    power_interval: float = 3.0
+    # Fraction of EV Stations with an active charging session
+    charging_ratio: float = 0.5
+    # Send one MULTI_EV_POWER_STATS message instead of one per station
+    multi_power_stats: bool = True
+    # Sessions expire after this many seconds (0 = never), forcing re-login
+    session_ttl: float = 0.0
+    username: str = "admin"
+    password: str = "simulator"
+    seed: int | None = None
+
+
+def build_frame(*parts: Any) -> bytes:
+    """Encode JSON parts in the console's binary WebSocket framing.
+
+    Each part gets an 8-byte header: part number, type, four reserved
+    bytes and a big-endian 16-bit payload length (the client reads the
+    last byte alone when the high byte is zero).
+    """
+    frame = bytearray()
+    for number, part in enumerate(parts, start=1):
+        payload = json.dumps(part, separators=(",", ":")).encode()
+        if len(payload) > 0xFFFF:
+            raise ValueError("frame part too large")
+        frame += bytes((number, 1, 0, 0, 0, 0)) + struct.pack(">H", len(payload))
+        frame += payload
+    return bytes(frame)
+
+
+def _action_id(platform: str, name: str) -> str:
+    """Stable per-platform/firmware action UUID, like the console's."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{platform}/{FIRMWARE_VERSION}/{name}"))
+
+
+def _supported_actions(platform: str, definitions: list[dict]) -> list[dict]:
+    actions = []
+    for definition in definitions:
+        action: dict[str, Any] = {
+            "id": _action_id(platform, definition["name"]),
+            "name": definition["name"],
+        }
+        if "arg" in definition:
+            action["args"] = {
+                "type": "object",
+                "properties": {definition["arg"]: {}},
+                "required": [definition["arg"]],
+            }
+        actions.append(action)
+    return actions
+
+
+class ConsoleSimulator:
+    """In-process UniFi Connect console backed by an aiohttp server."""
+
+    def __init__(
+        self,
+        config: SimulatorConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        tls: bool = True,
+        certfile: str | None = None,
+        keyfile: str | None = None,
+    ) -> None:
+        self.config = config or SimulatorConfig()
+        self.username = self.config.username
+        self.password = self.config.password
+        self._bind_host = host
+        self._port = port
+        self._tls = tls
+        self._certfile = certfile
+        self._keyfile = keyfile
+        self._random = random.Random(self.config.seed)
+
+        self.devices: dict[str, dict[str, Any]] = {}
+        self.history: list[dict[str, Any]] = []
+        self.stats: Counter[str] = Counter()
+        # Station ID -> start of its current charge session
+        self._session_started: dict[str, float] = {}
+        # Session token -> (csrf token, issued at)
+        self._sessions: dict[str, tuple[str, float]] = {}
+        self._clients: set[web.WebSocketResponse] = set()
+        self._runner: web.AppRunner | None = None
+        self._power_task: asyncio.Task | None = None
+        self._send_tasks: set[asyncio.Task] = set()
+        self._tempdir: tempfile.TemporaryDirectory | None = None
+
+        for _ in range(self.config.ev_stations):
+            self.add_device(PLATFORM_EV)
+        for _ in range(self.config.displays):
+            self.add_device(PLATFORM_DISPLAY)
+        self._generate_history()
+
+    # ── Fleet ──
+
+    def add_device(self, platform: str = PLATFORM_EV) -> dict[str, Any]:
+        """Add a device to the fleet (seen by clients on their next poll)."""
+        index = len(self.devices) + 1
+        octets = (0x74, 0xAC, 0xB9, 0, index >> 8, index & 0xFF)
+        mac = ":".join(f"{b:02X}" for b in octets)
+        device: dict[str, Any] = {
+            "id": secrets.token_hex(12),
+            "mac": mac,
+            "ip": f"10.0.{index >> 8}.{index & 0xFF}",
+            "firmwareVersion": FIRMWARE_VERSION,
+            "lastBootTimestamp": int(time.time()) - self._random.randint(3600, 864000),
+            "relayShadow": {},
+            "extraInfo": {},
+        }
+        if platform == PLATFORM_DISPLAY:
+            device["name"] = f"Display {index}"
+            device["type"] = {
+                "platform": PLATFORM_DISPLAY,
+                "fullName": "UniFi Connect Display SE 21",
+                "category": {
+                    "supportedActions": _supported_actions(platform, DISPLAY_ACTIONS)
+                },
+            }
+            device["shadow"] = {
+                "display": True,
+                "autoRotate": False,
+                "autoReload": True,
+                "sleepMode": False,
+                "autoSleep": False,
+                "brightness": 80,
+                "volume": 30,
+                "mode": DISPLAY_MODES[0],
+                "selectedApp": DISPLAY_APPS[0],
+                "currentHomePage": "https://example.com",
+            }
+            device["featureFlags"] = {
+                "brightness": {"min": 0, "max": 100},
+                "volume": {"min": 0, "max": 100},
+                "mode": {"enum": DISPLAY_MODES},
+                "app": {"enum": DISPLAY_APPS},
+            }
+        else:
+            charging = self._random.random() < self.config.charging_ratio
+            device["name"] = f"EV Station {index}"
+            device["type"] = {
+                "platform": platform,
+                "fullName": "UniFi EV Station",
+                "category": {
+                    "supportedActions": _supported_actions(platform, EV_ACTIONS)
+                },
+            }
+            device["shadow"] = {
+                "chargingStatus": "Charging" if charging else "Available",
+                "evStationMode": EV_MODES[0],
+                "fallbackSecurity": EV_MODES[0],
+                "maxOutput": 32,
+                "maxCurrent": 40,
+                "derating": False,
+                "errorInfo": "",
+                "statusLightEnabled": True,
+                "enabledCharging": True,
+                "brightness": 70,
+                "displayLabel": device["name"],
+                "adminMessage": "",
+            }
+            device["relayShadow"] = {"locating": False}
+            device["extraInfo"] = {
+                "linkQuality": "Excellent",
+                "connectionType": "Ethernet",
+                "breakerAm": 40,
+            }
+            device["featureFlags"] = {
+                "maxOutput": {"min": 6, "max": 40},
+                "brightness": {"min": 0, "max": 100},
+                "evStationMode": {"enum": EV_MODES},
+                "fallbackSecurity": {"enum": EV_MODES},
+                "breakerLoadLimits": [16, 20, 32, 40],
+            }
+            device["chargingSession"] = (
+                {"id": secrets.token_hex(8), "source": "Standalone"} if charging else None
+            )
+            if charging:
+                self._session_started[device["id"]] = time.time() - 1800
+        self.devices[device["id"]] = device
+        return device
+
+    def remove_device(self, device_id: str) -> None:
+        """Drop a device from the fleet (its history stays)."""
+        self.devices.pop(device_id, None)
+        self._session_started.pop(device_id, None)
+
+    def tick(self, elapsed: float, now: float | None = None) -> list[str]:
+        """Start and finish charge sessions as if *elapsed* seconds passed.
+
+        Sessions last two hours and stations sit idle for four on
+        average.  Finished sessions are added to the history and every
+        change is pushed as DEVICE_UPDATED.  Returns the changed IDs.
+        """
+        now = time.time() if now is None else now
+        changed = []
+        for device in self._ev_devices():
+            shadow = device["shadow"]
+            if shadow.get("chargingStatus") == "Charging":
+                if self._random.random() >= elapsed / SESSION_LENGTH:
+                    continue
+                started = self._session_started.pop(device["id"], now - 1800)
+                total_time = max(1, int(now - started))
+                self.history.insert(
+                    0,
+                    {
+                        "id": secrets.token_hex(12),
+                        "mac": device["mac"],
+                        "deviceName": device["name"],
+                        "date": int(started),
+                        "totalTime": total_time,
+                        "chargingTime": total_time,
+                        "powerUsage": round(total_time / 3600 * 7.4, 3),
+                        "usageMode": "Standalone",
+                    },
+                )
+                shadow["chargingStatus"] = "Available"
+                device["chargingSession"] = None
+            else:
+                if self._random.random() >= elapsed / IDLE_LENGTH:
+                    continue
+                self._session_started[device["id"]] = now
+                shadow["chargingStatus"] = "Charging"
+                device["chargingSession"] = {
+                    "id": secrets.token_hex(8),
+                    "source": "Standalone",
+                }
+            changed.append(device["id"])
+            self._broadcast(build_frame({"name": "DEVICE_UPDATED", "id": device["id"]}))
+        return changed
+
+    def _generate_history(self) -> None:
+        """Create charge sessions for every EV Station, newest first."""
+        now = int(time.time())
+        sessions: list[dict[str, Any]] = []
+        for device in self._ev_devices():
+            start = now
+            for _ in range(self.config.sessions_per_station):
+                start -= self._random.randint(3600, 86400)
+                total_time = self._random.randint(600, 4 * 3600)
+                kw = self._random.uniform(3, 11)
+                sessions.append(
+                    {
+                        "id": secrets.token_hex(12),
+                        "mac": device["mac"],
+                        "deviceName": device["name"],
+                        "date": start,
+                        "totalTime": total_time,
+                        "chargingTime": total_time - self._random.randint(0, 300),
+                        "powerUsage": round(total_time / 3600 * kw, 3),
+                        "usageMode": "Standalone",
+                    }
+                )
+        sessions.sort(key=lambda s: s["date"], reverse=True)
+        self.history = sessions
+
+    def _ev_devices(self) -> list[dict[str, Any]]:
+        return [
+            d for d in self.devices.values()
+            if d["type"]["platform"] != PLATFORM_DISPLAY
+        ]
+
+    # ── Server lifecycle ──
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    @property
+    def host(self) -> str:
+        """Host string to configure the integration (or API client) with."""
+        return f"{self._bind_host}:{self._port}"
+
+    @property
+    def base_url(self) -> str:
+        scheme = "https" if self._tls else "http"
+        return f"{scheme}://{self.host}"
+
+    async def start(self) -> None:
+        app = web.Application(middlewares=[self._fault_middleware])
+        for prefix in ("/proxy/connect", ""):
+            app.router.add_get(f"{prefix}/api/v2/devices", self._handle_devices)
+            app.router.add_get(
+                f"{prefix}/api/v2/devices/{{device_id}}", self._handle_device
+            )
+            app.router.add_patch(
+                f"{prefix}/api/v2/devices/{{device_id}}/status", self._handle_action
+            )
+            app.router.add_get(
+                f"{prefix}/api/v2/stats/evs/chargingHistory", self._handle_history
+            )
+        app.router.add_post("/api/auth/login", self._handle_login)
+        app.router.add_post("/api/login", self._handle_login)
+        app.router.add_get("/proxy/connect/", self._handle_websocket)
+        app.router.add_get("/sim/stats", self._handle_sim_stats)
+        app.router.add_post("/sim/reset", self._handle_sim_reset)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(
+            self._runner, self._bind_host, self._port, ssl_context=self._ssl_context()
+        )
+        await site.start()
+        self._port = self._runner.addresses[0][1]
+        if self.config.power_interval > 0:
+            self._power_task = asyncio.create_task(self._power_loop())
+        _LOGGER.info(
+            "Simulator on %s: %d devices, %d sessions",
+            self.base_url,
+            len(self.devices),
+            len(self.history),
+        )
+
+    async def stop(self) -> None:
+        if self._power_task:
+            self._power_task.cancel()
+            try:
+                await self._power_task
+            except asyncio.CancelledError:
+                pass
+            self._power_task = None
+        for ws in list(self._clients):
+            await ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._tempdir:
+            self._tempdir.cleanup()
+            self._tempdir = None
+
+    async def __aenter__(self) -> ConsoleSimulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    def _ssl_context(self) -> ssl.SSLContext | None:
+        if not self._tls:
+            return None
+        certfile, keyfile = self._certfile, self._keyfile
+        if not certfile:
+            self._tempdir = tempfile.TemporaryDirectory(prefix="unifi-sim-")
+            certfile = str(Path(self._tempdir.name, "cert.pem"))
+            keyfile = str(Path(self._tempdir.name, "key.pem"))
+            subprocess.run(
+                [
+                    "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                    "-keyout", keyfile, "-out", certfile, "-days", "1",
+                    "-subj", "/CN=localhost",
+                ],
+                check=True,
+                capture_output=True,
+            )
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(certfile, keyfile)
+        return context
+
+    # ── REST ──
+
+    @web.middleware
+    async def _fault_middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        """Apply configured latency and error injection to REST requests."""
+        if request.path == "/proxy/connect/" or request.path.startswith("/sim/"):
+            return await handler(request)
+        self.stats["requests"] += 1
+        self.stats["bytes_received"] += request.content_length or 0
+        delay = self.config.latency + self._random.uniform(0, self.config.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        is_login = request.path in ("/api/auth/login", "/api/login")
+        if not is_login and self._random.random() < self.config.error_rate:
+            self.stats["injected_errors"] += 1
+            return web.json_response({"err": "simulated failure"}, status=500)
+        response = await handler(request)
+        if isinstance(response, web.Response) and response.body is not None:
+            self.stats["bytes_sent"] += len(response.body)
+        return response
+
+    async def _handle_sim_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))
+
+    async def _handle_sim_reset(self, request: web.Request) -> web.Response:
+        self.stats.clear()
+        return web.json_response({})
+
+    def _authorized(self, request: web.Request, write: bool = False) -> bool:
+        token = request.cookies.get(SESSION_COOKIE)
+        session = self._sessions.get(token) if token else None
+        if session is None:
+            return False
+        csrf, issued_at = session
+        ttl = self.config.session_ttl
+        if ttl and time.monotonic() - issued_at > ttl:
+            del self._sessions[token]
+            self.stats["expired_sessions"] += 1
+            return False
+        return not write or request.headers.get("x-csrf-token") == csrf
+
+    def _unauthorized(self) -> web.Response:
+        self.stats["unauthorized"] += 1
+        return web.json_response({"err": "unauthorized"}, status=401)
+
+    async def _handle_login(self, request: web.Request) -> web.Response:
+        self.stats["logins"] += 1
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            body = {}
+        if (
+            body.get("username") != self.config.username
+            or body.get("password") != self.config.password
+        ):
+            return self._unauthorized()
+        token, csrf = secrets.token_hex(16), secrets.token_hex(16)
+        self._sessions[token] = (csrf, time.monotonic())
+        response = web.json_response({"username": self.config.username})
+        response.headers["x-csrf-token"] = csrf
+        response.set_cookie(SESSION_COOKIE, token, httponly=True, secure=self._tls)
+        return response
+
+    async def _handle_devices(self, request: web.Request) -> web.Response:
+        self.stats["devices"] += 1
+        if not self._authorized(request):
+            return self._unauthorized()
+        return web.json_response(
+            {"err": None, "type": "collection", "data": list(self.devices.values())}
+        )
+
+    async def _handle_device(self, request: web.Request) -> web.Response:
+        self.stats["device"] += 1
+        if not self._authorized(request):
+            return self._unauthorized()
+        device = self.devices.get(request.match_info["device_id"])
+        if device is None:
+            return web.json_response({"err": "not found"}, status=404)
+        return web.json_response({"err": None, "type": "single", "data": device})
+
+    async def _handle_action(self, request: web.Request) -> web.Response:
+        self.stats["actions"] += 1
+        if not self._authorized(request, write=True):
+            return self._unauthorized()
+        device = self.devices.get(request.match_info["device_id"])
+        if device is None:
+            return web.json_response({"err": "not found"}, status=404)
+        body = await request.json()
+        name = body.get("name")
+        advertised = {
+            a["name"]: a["id"] for a in device["type"]["category"]["supportedActions"]
+        }
+        if name not in advertised:
+            return web.json_response({"err": f"unsupported action {name}"}, status=400)
+        if body.get("id") != advertised[name]:
+            # Clients may still send a hardcoded ID from older firmware
+            self.stats["stale_action_ids"] += 1
+        self.stats[f"action.{name}"] += 1
+
+        definitions = (
+            DISPLAY_ACTIONS
+            if device["type"]["platform"] == PLATFORM_DISPLAY
+            else EV_ACTIONS
+        )
+        definition = next(d for d in definitions if d["name"] == name)
+        if name == "reboot":
+            device["lastBootTimestamp"] = int(time.time())
+        elif "key" in definition:
+            if "value" in definition:
+                value = definition["value"]
+            else:
+                args = body.get("args") or {}
+                if not args:
+                    return web.json_response({"err": "missing args"}, status=400)
+                value = next(iter(args.values()))
+            section = device.setdefault(definition.get("section", "shadow"), {})
+            section[definition["key"]] = value
+        if name != "power_stats_single":
+            self._broadcast(build_frame({"name": "DEVICE_UPDATED", "id": device["id"]}))
+        return web.json_response({"err": None, "data": {}})
+
+    async def _handle_history(self, request: web.Request) -> web.Response:
+        self.stats["history_pages"] += 1
+        if not self._authorized(request):
+            return self._unauthorized()
+        try:
+            offset = max(0, int(request.query.get("offset", 0)))
+            limit = max(1, min(int(request.query.get("limit", 50)), 1000))
+        except ValueError:
+            return web.json_response({"err": "bad paging"}, status=400)
+        return web.json_response(
+            {
+                "err": None,
+                "offset": offset,
+                "limit": limit,
+                "total": len(self.history),
+                "data": self.history[offset : offset + limit],
+            }
+        )
+
+    # ── WebSocket ──
+
+    async def _handle_websocket(self, request: web.Request) -> web.StreamResponse:
+        if not self._authorized(request):
+            return self._unauthorized()
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        self.stats["ws_connections"] += 1
+        self._clients.add(ws)
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    self.stats["ws_received"] += 1
+        finally:
+            self._clients.discard(ws)
+        return ws
+
+    def _broadcast(self, frame: bytes) -> None:
+        for ws in list(self._clients):
+            if ws.closed:
+                continue
+            self.stats["ws_messages"] += 1
+            self.stats["ws_bytes"] += len(frame)
+            task = asyncio.create_task(ws.send_bytes(frame))
+            self._send_tasks.add(task)
+            task.add_done_callback(self._send_tasks.discard)
+
+    def _power_payload(self, device: dict[str, Any], now: float) -> dict[str, Any]:
+        amps = min(device["shadow"]["maxOutput"], 32) * self._random.uniform(0.9, 1.0)
+        started = int(self._session_started.get(device["id"], now - 1800))
+        return {
+            "id": device["id"],
+            "mac": device["mac"],
+            "instantA": round(amps, 1),
+            "instantV": 240.0,
+            "instantKW": round(amps * 0.24, 2),
+            "meter": round((now - started) / 3600 * amps * 0.24, 3),
+            "duration": int(now) - started,
+            "startedAt": started,
+            "streaming": True,
+        }
+
+    async def push_power(self, now: float | None = None) -> list[dict[str, Any]]:
+        """Send one round of power stats and wait until it is written.
+
+        Returns the payloads sent, one per charging station.
+        """
+        now = time.time() if now is None else now
+        charging = [
+            self._power_payload(d, now)
+            for d in self._ev_devices()
+            if d["shadow"].get("chargingStatus") == "Charging"
+            and d["shadow"].get("enabledCharging", True)
+        ]
+        if not charging or not self._clients:
+            return []
+        if self.config.multi_power_stats:
+            # Keep each frame part under the 16-bit length limit
+            envelope = {"name": "MULTI_EV_POWER_STATS"}
+            for i in range(0, len(charging), 200):
+                self._broadcast(build_frame(envelope, charging[i : i + 200]))
+        else:
+            for payload in charging:
+                self._broadcast(build_frame({"name": "EV_POWER_STATS"}, payload))
+        if self._send_tasks:
+            await asyncio.gather(*self._send_tasks, return_exceptions=True)
+        return charging
+
+    async def _power_loop(self) -> None:
+        """Push power stats for charging stations to every WebSocket client."""
+        while True:
+            await asyncio.sleep(self.config.power_interval)
+            await self.push_power()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--bind", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--ev-stations", type=int, default=4)
+    parser.add_argument("--displays", type=int, default=1)
+    parser.add_argument("--history", type=int, default=200, help="sessions per station")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--power-interval", type=float, default=3.0)
+    parser.add_argument("--charging-ratio", type=float, default=0.5)
+    parser.add_argument("--single-power-stats", action="store_true")
+    parser.add_argument("--session-ttl", type=float, default=0.0)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="simulator")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--no-tls", action="store_true")
+    parser.add_argument("--certfile")
+    parser.add_argument("--keyfile")
+    args = parser.parse_args()
+
+    config = SimulatorConfig(
+        ev_stations=args.ev_stations,
+        displays=args.displays,
+        sessions_per_station=args.history,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        error_rate=args.error_rate,
+        power_interval=args.power_interval,
+        charging_ratio=args.charging_ratio,
+        multi_power_stats=not args.single_power_stats,
+        session_ttl=args.session_ttl,
+        username=args.username,
+        password=args.password,
+        seed=args.seed,
+    )
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    async def run() -> None:
+        simulator = ConsoleSimulator(
+            config,
+            host=args.bind,
+            port=args.port,
+            tls=not args.no_tls,
+            certfile=args.certfile,
+            keyfile=args.keyfile,
+        )
+        async with simulator:
+            print(
+                f"UniFi Connect simulator at {simulator.base_url} "
+                f"(user {simulator.username!r}, password {simulator.password!r})",
+                flush=True,
+            )
+            await asyncio.Event().wait()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()